@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConfluenceSignal:
     """Combined Wyckoff + SMC signal with confluence scoring"""
     signal_type: str  # 'BUY', 'SELL'
@@ -16,4 +16,4 @@ class ConfluenceSignal:
     smc_patterns: List[str]
     supporting_indicators: List[str]
     timestamp: datetime
-    reasoning: str
\ No newline at end of file
+    reasoning: str
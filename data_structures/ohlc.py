@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Dict, Any
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class OHLCData:
     """OHLC data structure"""
     symbol: str
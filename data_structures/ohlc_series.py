@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd  # only from_frame's annotation needs it
+
+from data_structures.ohlc import OHLCData
+
+
+def candle_columns(candles: List[OHLCData], *fields: str, series: Optional['OHLCSeries'] = None,
+                   start: int = 0) -> Tuple[np.ndarray, ...]:
+    """Float64 arrays of just the named candle fields from start on, as views of series when one is shared"""
+    if series is not None:
+        return tuple(getattr(series, field)[start:] for field in fields)
+    if start:
+        candles = candles[start:]
+    count = len(candles)
+    return tuple(np.fromiter((getattr(c, field) for c in candles), dtype=np.float64, count=count) for field in fields)
+
+
+@dataclass
+class OHLCSeries:
+    """Column-oriented copy of a candle list: one contiguous float array (float64 unless asked otherwise) per price field"""
+    timestamps: List[datetime]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    
+    @classmethod
+    def from_candles(cls, candles: List[OHLCData], dtype: np.dtype = np.float64) -> 'OHLCSeries':
+        """Columns of a candle list; dtype=np.float32 halves their size for the scans at single precision"""
+        count = len(candles)
+        return cls(
+            timestamps=[c.timestamp for c in candles],
+            open=np.fromiter((c.open for c in candles), dtype=dtype, count=count),
+            high=np.fromiter((c.high for c in candles), dtype=dtype, count=count),
+            low=np.fromiter((c.low for c in candles), dtype=dtype, count=count),
+            close=np.fromiter((c.close for c in candles), dtype=dtype, count=count),
+            volume=np.fromiter((c.volume for c in candles), dtype=dtype, count=count)
+        )
+    
+    @classmethod
+    def from_frame(cls, frame: 'pd.DataFrame') -> 'OHLCSeries':
+        """Column views of a frame with timestamp, open, high, low, close and volume columns"""
+        return cls(
+            timestamps=list(frame['timestamp']),
+            open=frame['open'].to_numpy(dtype=np.float64),
+            high=frame['high'].to_numpy(dtype=np.float64),
+            low=frame['low'].to_numpy(dtype=np.float64),
+            close=frame['close'].to_numpy(dtype=np.float64),
+            volume=frame['volume'].to_numpy(dtype=np.float64)
+        )
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from data_structures.pattern_performance import PatternPerformance
+from data_structures.performance_metrics import PerformanceMetrics
+from data_structures.trade_results import TradeResult
+
+
+@dataclass
+class ReportContext:
+    """Derived state shared by the sections of a single report"""
+    metrics: Optional[PerformanceMetrics]
+    closed_trades: List[TradeResult]
+    pattern_performances: List[PatternPerformance]
+    now_str: str  # report timestamp, formatted once per render
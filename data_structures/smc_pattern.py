@@ -1,8 +1,15 @@
 from dataclasses import dataclass
 from datetime import datetime
 
+# Pattern types and directions shared by the SMC detectors and their consumers
+ORDER_BLOCK = 'ORDER_BLOCK'
+FVG = 'FVG'
+LIQUIDITY_SWEEP = 'LIQUIDITY_SWEEP'
+BULLISH = 'BULLISH'
+BEARISH = 'BEARISH'
 
-@dataclass
+
+@dataclass(slots=True)
 class SMCPattern:
     """Smart Money Concepts pattern"""
     pattern_type: str  # 'ORDER_BLOCK', 'FVG', 'LIQUIDITY_SWEEP', 'BOS', 'CHOCH'
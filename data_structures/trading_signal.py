@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+BUY = 'BUY'
+SELL = 'SELL'
+
+
+@dataclass(slots=True)
+class TradingSignal:
+    """Trade idea emitted by the technical analysis tool"""
+    signal_type: str  # 'BUY', 'SELL'
+    source: str  # 'RSI', 'WYCKOFF_SPRING', 'SMC_ORDER_BLOCK', ...
+    strength: float  # 0-100
+    price: float
+    reason: str
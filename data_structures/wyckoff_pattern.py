@@ -2,8 +2,13 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+# Pattern types emitted by the tools/analyzers Wyckoff detectors
+ACCUMULATION = 'ACCUMULATION'
+DISTRIBUTION = 'DISTRIBUTION'
+SPRING = 'SPRING'
 
-@dataclass
+
+@dataclass(slots=True)
 class WyckoffPattern:
     """Wyckoff pattern detection result"""
     pattern_type: str  # 'ACCUMULATION', 'DISTRIBUTION', 'MARKUP', 'MARKDOWN'
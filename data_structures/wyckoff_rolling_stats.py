@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass
+class WyckoffRollingStats:
+    """Rolling window statistics shared by the Wyckoff phase detectors"""
+    # 40-bar range windows data[i-20:i+20], indexed by centre i (NaN where incomplete)
+    range_mean: np.ndarray
+    range_std: np.ndarray
+    range_max_high: np.ndarray
+    range_min_low: np.ndarray
+    # 30-bar trend windows data[i-30:i], indexed by i-30
+    first_half_mean: np.ndarray
+    second_half_mean: np.ndarray
+    higher_highs: np.ndarray
+    higher_lows: np.ndarray
+    lower_highs: np.ndarray
+    lower_lows: np.ndarray
@@ -0,0 +1,65 @@
+"""
+Focused tests for the LearningEngine confluence effectiveness tables
+"""
+
+import math
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from data_structures.trade_results import TradeResult
+from tools.performance_calculator.supporting_class.learning_engine import LearningEngine
+
+
+def _trades(n: int, seed: int = 3) -> list:
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    trades = []
+    for i in range(n):
+        # Scores cover every band, including the band edges and an unscored (NaN) trade
+        score = [65.0, 70.0, 79.9, 80.0, math.nan][i % 5] if i < 10 else float(rng.uniform(50, 100))
+        pnl = float(rng.normal(10, 50))
+        trades.append(TradeResult(
+            trade_id=f"T{i:03d}", symbol='EURUSD', timeframe='1H',
+            entry_time=start + timedelta(hours=i), exit_time=start + timedelta(hours=i + 1),
+            entry_price=1.1, exit_price=1.1, position_size=1.0,
+            trade_type='BUY', status='CLOSED', pnl=pnl, pnl_percent=pnl / 100,
+            stop_loss=1.09, take_profit=1.12,
+            patterns_detected=['double_bottom'] if rng.random() < 0.3 else [],
+            confluence_score=score,
+            wyckoff_signals=['spring'] if rng.random() < 0.5 else [],
+            smc_signals=['order_block'] if rng.random() < 0.5 else [],
+            technical_indicators={}, risk_reward_ratio=2.0, hold_time_hours=1.0,
+            max_favorable_excursion=None, max_adverse_excursion=None, trade_notes=''
+        ))
+    return trades
+
+
+def test_observed_tables_match_batch_tables():
+    trades = _trades(60)
+    engine = LearningEngine()
+    for trade in trades:
+        engine.observe(trade)
+
+    counts, wins = LearningEngine._build_tables(trades)
+    np.testing.assert_array_equal(engine._counts, counts)
+    np.testing.assert_array_equal(engine._wins, wins)
+    assert int(counts.sum()) == len(trades)
+    assert int(counts[3].sum()) == 2  # the two NaN-scored trades
+
+
+def test_running_tables_give_same_weights_as_explicit_trades():
+    trades = _trades(60)
+    streamed, batch = LearningEngine(), LearningEngine()
+    for trade in trades:
+        streamed.observe(trade)
+
+    assert streamed.analyze_confluence_effectiveness() == batch.analyze_confluence_effectiveness(trades)
+    assert abs(sum(streamed.confluence_weights.values()) - 1.0) < 1e-9
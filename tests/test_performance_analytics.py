@@ -0,0 +1,86 @@
+"""
+Focused tests for the Performance Analytics Tool
+Covers background recalibration of the confluence weights
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from tools.performance_calculator.performance_analytics_tool import PerformanceAnalyticsTool
+
+
+def _closed_trade(i: int, win: bool, wyckoff: bool) -> str:
+    entry_time = datetime(2024, 1, 1) + timedelta(hours=4 * i)
+    return json.dumps({
+        'trade_id': f"T{i:03d}",
+        'symbol': 'EURUSD',
+        'entry_time': entry_time.isoformat(),
+        'exit_time': (entry_time + timedelta(hours=2)).isoformat(),
+        'entry_price': 1.1000,
+        'exit_price': 1.1050 if win else 1.0950,
+        'position_size': 1.0,
+        'status': 'CLOSED',
+        'pnl': 50.0 if win else -50.0,
+        'confluence_score': 85.0 if win else 65.0,
+        'wyckoff_signals': ['spring'] if wyckoff else [],
+        'smc_signals': [] if wyckoff else ['order_block'],
+    })
+
+
+def test_background_recalibration_updates_weights():
+    tool = PerformanceAnalyticsTool()
+    try:
+        default_weights = dict(tool.learning_engine.confluence_weights)
+
+        # Wyckoff trades win and SMC trades lose; 10 closed trades trigger two recalibrations
+        for i in range(10):
+            win = i % 2 == 0
+            assert tool._run('add_trade', _closed_trade(i, win, wyckoff=win)).startswith("✅")
+
+        tool.wait_for_recalibration(timeout=30)
+
+        weights = tool.learning_engine.confluence_weights
+        assert weights != default_weights
+        assert weights['wyckoff_weight'] > weights['smc_weight']
+        assert abs(sum(weights.values()) - 1.0) < 1e-9
+        assert tool.learning_engine.optimization_history[-1]['total_trades_analyzed'] == 10
+    finally:
+        tool.close()
+
+
+def test_closed_trade_without_confluence_score_is_accepted():
+    tool = PerformanceAnalyticsTool()
+    try:
+        trade = json.loads(_closed_trade(0, win=True, wyckoff=True))
+        trade['confluence_score'] = None
+        assert tool._run('add_trade', json.dumps(trade)).startswith("✅")
+
+        # The running aggregates and effectiveness tables stay in step with the database
+        assert len(tool.trades_database) == 1
+        assert tool._running['closed'] == 1
+        assert tool._asset_totals == {'EURUSD': [50.0, 0.0]}
+        assert int(tool.learning_engine._counts[3].sum()) == 1
+    finally:
+        tool.close()
+
+
+def test_metrics_memo_follows_trade_generation():
+    tool = PerformanceAnalyticsTool()
+    try:
+        tool._run('add_trade', _closed_trade(0, win=True, wyckoff=True))
+        first = tool._calculate_metrics()
+        assert tool._calculate_metrics() is first
+
+        tool._run('add_trade', _closed_trade(1, win=False, wyckoff=False))
+        second = tool._calculate_metrics()
+        assert second is not first
+        assert second.total_trades == 2
+    finally:
+        tool.close()
@@ -0,0 +1,64 @@
+"""
+Focused tests for the PerformanceCalculator metrics cache
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from data_structures.trade_results import TradeResult
+from tools.performance_calculator.supporting_class.performance_calculator import PerformanceCalculator
+
+
+def _trade(i: int, pnl: float) -> TradeResult:
+    entry_time = datetime(2024, 1, 1) + timedelta(hours=4 * i)
+    return TradeResult(
+        trade_id=f"T{i:03d}", symbol='EURUSD', timeframe='1H',
+        entry_time=entry_time, exit_time=entry_time + timedelta(hours=2),
+        entry_price=1.1, exit_price=1.1 + pnl / 10000, position_size=1.0,
+        trade_type='BUY', status='CLOSED', pnl=pnl, pnl_percent=pnl / 100,
+        stop_loss=1.09, take_profit=1.12, patterns_detected=[], confluence_score=75.0,
+        wyckoff_signals=[], smc_signals=[], technical_indicators={},
+        risk_reward_ratio=2.0, hold_time_hours=2.0,
+        max_favorable_excursion=None, max_adverse_excursion=None, trade_notes=''
+    )
+
+
+def test_metrics_cache_hits_for_same_generation():
+    calculator = PerformanceCalculator()
+    trades = [_trade(i, 50.0 if i % 3 else -40.0) for i in range(12)]
+
+    first = calculator.calculate_basic_metrics(trades, generation=1)
+    assert calculator.calculate_basic_metrics(trades, generation=1) is first
+    assert calculator.calculate_basic_metrics(trades) is not first
+
+
+def test_metrics_cache_recomputes_on_new_generation_or_invalidate():
+    calculator = PerformanceCalculator()
+    trades = [_trade(i, 50.0 if i % 3 else -40.0) for i in range(12)]
+
+    before = calculator.calculate_basic_metrics(trades, generation=1)
+    trades[4].pnl = -500.0
+    calculator.invalidate_cache()
+    after = calculator.calculate_basic_metrics(trades, generation=1)
+
+    assert after.total_pnl == before.total_pnl - 550.0
+    assert after == PerformanceCalculator._compute_basic_metrics(trades, None)
+
+    trades.append(_trade(12, 30.0))
+    assert calculator.calculate_basic_metrics(trades, generation=2).total_trades == 13
+
+
+def test_metrics_cache_is_per_instance():
+    trades = [_trade(i, 25.0) for i in range(5)]
+    first, second = PerformanceCalculator(), PerformanceCalculator()
+
+    first.calculate_basic_metrics(trades, generation=1)
+    assert first._metrics_memo is not None
+    assert second._metrics_memo is None
+
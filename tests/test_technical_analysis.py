@@ -0,0 +1,162 @@
+"""
+Focused tests for the Technical Analysis Tool and its indicators
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from data_structures.ohlc import OHLCData
+from tools.technical_analysis.supporting_classes.indicator_state import BBandsState, IndicatorState
+from tools.technical_analysis.supporting_classes.technical_indicator import TechnicalIndicators
+from tools.technical_analysis.technical_analysis_tool import TechnicalAnalysisTool
+
+
+def _candles(n: int, seed: int = 7) -> list:
+    rng = np.random.default_rng(seed)
+    closes = 1.10 + np.cumsum(rng.normal(0, 0.001, n))
+    start = datetime(2024, 1, 1)
+    return [
+        OHLCData(
+            symbol='EURUSD', timeframe='1H', timestamp=start + timedelta(hours=i),
+            open=float(c - 0.0002), high=float(c + 0.0010), low=float(c - 0.0010), close=float(c),
+            volume=float(rng.integers(1000, 5000))
+        )
+        for i, c in enumerate(closes)
+    ]
+
+
+def _split_time(report: str):
+    lines = report.splitlines()
+    time_lines = [line for line in lines if line.startswith("Analysis Time:")]
+    return time_lines, [line for line in lines if not line.startswith("Analysis Time:")]
+
+
+def test_result_cache_renders_fresh_analysis_time():
+    tool = TechnicalAnalysisTool()
+    candles = _candles(120)
+
+    first = tool._run(candles, 'smc')
+    time.sleep(0.01)
+    second = tool._run(candles, 'smc')
+
+    first_time, first_body = _split_time(first)
+    second_time, second_body = _split_time(second)
+    assert first_body[0].startswith("📊 TECHNICAL ANALYSIS - EURUSD")
+    assert len(tool._result_cache) == 1
+    assert first_body == second_body
+    assert len(first_time) == len(second_time) == 1
+    assert first_time != second_time
+
+
+def test_result_cache_misses_on_new_candle():
+    tool = TechnicalAnalysisTool()
+    candles = _candles(121)
+
+    tool._run(candles[:-1], 'smc')
+    tool._run(candles, 'smc')
+    assert len(tool._result_cache) == 2
+
+
+def test_result_cache_misses_on_edited_middle_bars():
+    candles = _candles(120)
+    tool = TechnicalAnalysisTool()
+    tool._run(candles, 'smc')
+
+    # Widen a run of middle bars; first/last bars and the latest close are unchanged
+    for candle in candles[40:80]:
+        candle.high += 0.01
+        candle.low -= 0.01
+    cached = tool._run(candles, 'smc')
+
+    assert len(tool._result_cache) == 2
+    assert _split_time(cached)[1] == _split_time(TechnicalAnalysisTool()._run(candles, 'smc'))[1]
+
+
+def test_result_cache_is_keyed_on_scan_dtype():
+    candles = _candles(120)
+    tool = TechnicalAnalysisTool()
+    tool._run(candles, 'smc')
+    tool.scan_dtype = 'float32'
+    tool._run(candles, 'smc')
+    assert len(tool._result_cache) == 2
+
+
+def test_run_batch_matches_run_and_honours_scan_dtype():
+    batch = [_candles(120, seed=1), _candles(90, seed=2)]
+    for scan_dtype in ('float64', 'float32'):
+        tool = TechnicalAnalysisTool(scan_dtype=scan_dtype)
+        try:
+            reports = tool.run_batch(batch, 'smc')
+        finally:
+            tool.close()
+        assert tool._batch_executor is None
+        expected = [TechnicalAnalysisTool(scan_dtype=scan_dtype)._run(candles, 'smc') for candles in batch]
+        assert [_split_time(report)[1] for report in reports] == [_split_time(report)[1] for report in expected]
+
+
+def _assert_same_values(actual: dict, expected: dict):
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        np.testing.assert_allclose(actual[key], expected[key], rtol=1e-9, atol=1e-12, equal_nan=True, err_msg=key)
+
+
+def test_bollinger_rolling_std_matches_per_window_std():
+    closes = [c.close for c in _candles(80)]
+    values = np.array(closes)
+    for ddof in (0, 1):
+        bands = TechnicalIndicators.bollinger_bands(closes, ddof=ddof)
+        expected_upper = [values[i - 19:i + 1].mean() + 2 * values[i - 19:i + 1].std(ddof=ddof) for i in range(19, 80)]
+        assert np.isnan(bands['upper'][:19]).all()
+        np.testing.assert_allclose(bands['upper'][19:], expected_upper, rtol=1e-9)
+
+
+def test_bollinger_bands_default_to_population_std():
+    closes = [c.close for c in _candles(60)]
+    window = np.array(closes[-20:])
+
+    population = TechnicalIndicators.bollinger_bands(closes)
+    sample = TechnicalIndicators.bollinger_bands(closes, ddof=1)
+
+    np.testing.assert_allclose(population['upper'][-1], window.mean() + 2 * window.std(ddof=0), rtol=1e-9)
+    np.testing.assert_allclose(sample['upper'][-1], window.mean() + 2 * window.std(ddof=1), rtol=1e-9)
+    np.testing.assert_allclose(sample['lower'][-1], window.mean() - 2 * window.std(ddof=1), rtol=1e-9)
+
+
+def test_bollinger_state_matches_batch_bands():
+    closes = [c.close for c in _candles(60)]
+    for ddof in (0, 1):
+        state = BBandsState(20, 2.0, ddof=ddof)
+        for close in closes:
+            latest = state.update(close)
+        batch = TechnicalIndicators.bollinger_bands(closes, ddof=ddof)
+        _assert_same_values(latest, {key: batch[key][-1] for key in ('upper', 'middle', 'lower')})
+
+
+def test_streamed_indicators_match_snapshot():
+    closes = np.array([c.close for c in _candles(150)])
+    state = IndicatorState()
+
+    # Feed the closes in uneven chunks, checking against a full recomputation after each one
+    for end in (10, 35, 36, 80, 150):
+        latest = state.extend(closes[state.count:end].tolist())
+        assert state.count == end
+        _assert_same_values(latest, TechnicalIndicators.snapshot(closes[:end]))
+
+
+def test_tool_streams_indicators_on_growing_history():
+    candles = _candles(150)
+    streamed = TechnicalAnalysisTool()
+    for end in (100, 101, 130, 150):
+        latest = streamed._current_indicators(candles[:end], np.array([c.close for c in candles[:end]]))
+
+    cold = TechnicalAnalysisTool()._current_indicators(candles, np.array([c.close for c in candles]))
+    _assert_same_values(latest, cold)
@@ -0,0 +1,58 @@
+"""
+Focused tests for the WyckoffSMCTradingSystem analysis cache
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from data_structures.ohlc import OHLCData
+from wyckoff_smc_analyzer_test import WyckoffSMCTradingSystem, _synthesize_ohlc
+
+TECH_INDICATORS = {'rsi': {'value': 25.5}, 'macd': {'histogram': 0.001}}
+
+
+def _sample_data(n: int = 150, seed: int = 12345) -> list:
+    opens, highs, lows, closes, volumes = _synthesize_ohlc(n, np.random.default_rng(seed))
+    start = datetime(2024, 1, 1)
+    return [
+        OHLCData(symbol="EURUSD", timeframe="1H", timestamp=start + timedelta(hours=i),
+                 open=o, high=h, low=l, close=c, volume=v)
+        for i, (o, h, l, c, v) in enumerate(zip(opens.tolist(), highs.tolist(), lows.tolist(),
+                                                closes.tolist(), volumes.tolist()))
+    ]
+
+
+def test_cache_hit_returns_read_only_recommendation():
+    system = WyckoffSMCTradingSystem()
+    data = _sample_data()
+
+    first = system.analyze_trading_opportunity(data, TECH_INDICATORS)
+    second = system.analyze_trading_opportunity(data, TECH_INDICATORS)
+
+    assert len(system._analysis_cache) == 1
+    assert second['trading_recommendation'] is first['trading_recommendation']
+    with pytest.raises(TypeError):
+        first['trading_recommendation']['action'] = 'SELL'
+    with pytest.raises(TypeError):
+        first['wyckoff_analysis']['schematic'] = None
+
+
+@pytest.mark.parametrize('field', ['high', 'low', 'volume', 'close'])
+def test_cache_misses_when_an_early_bar_changes(field):
+    system = WyckoffSMCTradingSystem()
+    data = _sample_data()
+    system.analyze_trading_opportunity(data, TECH_INDICATORS)
+
+    setattr(data[10], field, getattr(data[10], field) * 1.01)
+    system.analyze_trading_opportunity(data, TECH_INDICATORS)
+
+    assert len(system._analysis_cache) == 2
@@ -1,19 +1,25 @@
 """
 Tools package for the trading system
+
+The tool classes are imported on first access (PEP 562), so importing a light submodule
+such as tools.analyzers or tools.utilities does not pull in crewai.
 """
 
-try:
-    from .market_data_tool import MarketDataTool
-    from .technical_analysis.technical_analysis_tool import TechnicalAnalysisTool
-    from .pattern_recognition.pattern_recognition_tool import PatternRecognitionTool
-    from .performance_calculator.performance_analytics_tool import PerformanceAnalyticsTool
-    
-    __all__ = [
-        'MarketDataTool',
-        'TechnicalAnalysisTool',
-        'PatternRecognitionTool',
-        'PerformanceAnalyticsTool'
-    ]
-except ImportError as e:
-    print(f"Warning: Could not import all tools: {e}")
-    __all__ = []
+from importlib import import_module
+
+_TOOL_MODULES = {
+    'MarketDataTool': '.market_data_tool',
+    'TechnicalAnalysisTool': '.technical_analysis.technical_analysis_tool',
+    'PatternRecognitionTool': '.pattern_recognition.pattern_recognition_tool',
+    'PerformanceAnalyticsTool': '.performance_calculator.performance_analytics_tool'
+}
+
+__all__ = list(_TOOL_MODULES)
+
+
+def __getattr__(name):
+    if name not in _TOOL_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    tool = getattr(import_module(_TOOL_MODULES[name], __name__), name)
+    globals()[name] = tool
+    return tool
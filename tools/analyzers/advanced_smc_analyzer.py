@@ -1,39 +1,37 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 import numpy as np
 
+from data_structures.ohlc_series import OHLCSeries, candle_columns
+
 
 class AdvancedSMCAnalyzer:
     """Advanced Smart Money Concepts analysis"""
     
     @staticmethod
-    def detect_market_structure_shift(ohlc_data: List) -> Dict:
+    def detect_market_structure_shift(ohlc_data: List, series: Optional[OHLCSeries] = None) -> Dict:
         """Detect Break of Structure (BOS) and Change of Character (CHOCH)"""
         if len(ohlc_data) < 20:
             return {'detected': False}
         
-        highs = [c.high for c in ohlc_data]
-        lows = [c.low for c in ohlc_data]
-        closes = [c.close for c in ohlc_data]
-        
-        # Find recent swing highs and lows
-        swing_highs = []
-        swing_lows = []
+        highs, lows, closes = candle_columns(ohlc_data, 'high', 'low', 'close', series=series)
         
-        for i in range(5, len(ohlc_data) - 5):
-            # Swing high detection
-            if all(highs[i] >= highs[j] for j in range(i-5, i+6) if j != i):
-                swing_highs.append({'index': i, 'price': highs[i], 'timestamp': ohlc_data[i].timestamp})
-            
-            # Swing low detection
-            if all(lows[i] <= lows[j] for j in range(i-5, i+6) if j != i):
-                swing_lows.append({'index': i, 'price': lows[i], 'timestamp': ohlc_data[i].timestamp})
+        # Find recent swing highs and lows: the extreme of the 11 candles centred on them
+        windows = np.lib.stride_tricks.sliding_window_view
+        swing_highs = [
+            {'index': i, 'price': ohlc_data[i].high, 'timestamp': ohlc_data[i].timestamp}
+            for i in (5 + np.flatnonzero(highs[5:-5] >= windows(highs, 11).max(axis=1))).tolist()
+        ]
+        swing_lows = [
+            {'index': i, 'price': ohlc_data[i].low, 'timestamp': ohlc_data[i].timestamp}
+            for i in (5 + np.flatnonzero(lows[5:-5] <= windows(lows, 11).min(axis=1))).tolist()
+        ]
         
         if len(swing_highs) < 2 or len(swing_lows) < 2:
             return {'detected': False}
         
         # Check for BOS/CHOCH
         structure_shifts = []
-        current_price = closes[-1]
+        current_price = float(closes[-1])
         
         # Recent swing points
         recent_high = swing_highs[-1] if swing_highs else None
@@ -69,16 +67,15 @@ class AdvancedSMCAnalyzer:
         }
     
     @staticmethod
-    def detect_institutional_order_flow(ohlc_data: List) -> Dict:
+    def detect_institutional_order_flow(ohlc_data: List, series: Optional[OHLCSeries] = None) -> Dict:
         """Detect institutional order flow patterns"""
         if len(ohlc_data) < 30:
             return {'detected': False}
         
-        volumes = [c.volume for c in ohlc_data if c.volume > 0]
-        closes = [c.close for c in ohlc_data]
-        opens = [c.open for c in ohlc_data]
+        volumes, = candle_columns(ohlc_data, 'volume', series=series)
+        volumes = volumes[volumes > 0]
         
-        if not volumes:
+        if not len(volumes):
             return {'detected': False}
         
         order_flow_signals = []
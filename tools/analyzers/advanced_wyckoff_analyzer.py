@@ -1,22 +1,23 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 import numpy as np
 
+from data_structures.ohlc_series import OHLCSeries, candle_columns
+
 
 class AdvancedWyckoffAnalyzer:
     """Advanced Wyckoff analysis with institutional footprint detection"""
     
     @staticmethod
-    def detect_composite_operator_activity(ohlc_data: List, volume_threshold: float = 1.5) -> Dict:
+    def detect_composite_operator_activity(ohlc_data: List, volume_threshold: float = 1.5,
+                                           series: Optional[OHLCSeries] = None) -> Dict:
         """Detect composite operator (institutional) activity"""
         if len(ohlc_data) < 20:
             return {'detected': False}
         
-        closes = [c.close for c in ohlc_data]
-        volumes = [c.volume for c in ohlc_data if c.volume > 0]
-        highs = [c.high for c in ohlc_data]
-        lows = [c.low for c in ohlc_data]
+        all_volumes, = candle_columns(ohlc_data, 'volume', series=series)
+        volumes = all_volumes[all_volumes > 0]
         
-        if not volumes:
+        if not len(volumes):
             return {'detected': False}
         
         avg_volume = np.mean(volumes[-20:])
@@ -24,43 +25,41 @@ class AdvancedWyckoffAnalyzer:
         # Look for volume spikes with price action
         institutional_activity = []
         
-        for i in range(10, len(ohlc_data)):
+        for i in (10 + np.flatnonzero(all_volumes[10:] > avg_volume * volume_threshold)).tolist():
             current = ohlc_data[i]
             
-            if current.volume > avg_volume * volume_threshold:
-                # High volume detected, analyze price action
-                price_change = abs(current.close - current.open) / current.open
+            price_change = abs(current.close - current.open) / current.open
+            
+            # Check for effort vs result analysis
+            if price_change < 0.005:  # Less than 0.5% move on high volume
+                # Potential absorption (institutional accumulation/distribution)
+                if current.close > current.open:
+                    activity_type = "ACCUMULATION_ABSORPTION"
+                else:
+                    activity_type = "DISTRIBUTION_ABSORPTION"
                 
-                # Check for effort vs result analysis
-                if price_change < 0.005:  # Less than 0.5% move on high volume
-                    # Potential absorption (institutional accumulation/distribution)
-                    if current.close > current.open:
-                        activity_type = "ACCUMULATION_ABSORPTION"
-                    else:
-                        activity_type = "DISTRIBUTION_ABSORPTION"
-                    
-                    institutional_activity.append({
-                        'type': activity_type,
-                        'timestamp': current.timestamp,
-                        'volume_ratio': current.volume / avg_volume,
-                        'price_change': price_change,
-                        'price': current.close
-                    })
+                institutional_activity.append({
+                    'type': activity_type,
+                    'timestamp': current.timestamp,
+                    'volume_ratio': current.volume / avg_volume,
+                    'price_change': price_change,
+                    'price': current.close
+                })
+            
+            elif price_change > 0.01:  # Greater than 1% move
+                # Potential institutional move
+                if current.close > current.open:
+                    activity_type = "INSTITUTIONAL_BUYING"
+                else:
+                    activity_type = "INSTITUTIONAL_SELLING"
                 
-                elif price_change > 0.01:  # Greater than 1% move
-                    # Potential institutional move
-                    if current.close > current.open:
-                        activity_type = "INSTITUTIONAL_BUYING"
-                    else:
-                        activity_type = "INSTITUTIONAL_SELLING"
-                    
-                    institutional_activity.append({
-                        'type': activity_type,
-                        'timestamp': current.timestamp,
-                        'volume_ratio': current.volume / avg_volume,
-                        'price_change': price_change,
-                        'price': current.close
-                    })
+                institutional_activity.append({
+                    'type': activity_type,
+                    'timestamp': current.timestamp,
+                    'volume_ratio': current.volume / avg_volume,
+                    'price_change': price_change,
+                    'price': current.close
+                })
         
         return {
             'detected': len(institutional_activity) > 0,
@@ -70,21 +69,20 @@ class AdvancedWyckoffAnalyzer:
         }
     
     @staticmethod
-    def detect_wyckoff_schematic(ohlc_data: List) -> Dict:
+    def detect_wyckoff_schematic(ohlc_data: List, series: Optional[OHLCSeries] = None) -> Dict:
         """Detect complete Wyckoff accumulation/distribution schematic"""
         if len(ohlc_data) < 100:
             return {'phase': 'INSUFFICIENT_DATA'}
         
-        closes = [c.close for c in ohlc_data]
-        volumes = [c.volume for c in ohlc_data if c.volume > 0]
-        highs = [c.high for c in ohlc_data]
-        lows = [c.low for c in ohlc_data]
+        closes, volumes = candle_columns(ohlc_data, 'close', 'volume', series=series)
+        volumes = volumes[volumes > 0]
         
         # Calculate price and volume characteristics
-        price_range = max(closes) - min(closes)
+        lowest_close = float(closes.min())
+        price_range = float(closes.max()) - lowest_close
         price_volatility = np.std(closes[-50:]) / np.mean(closes[-50:])
         
-        if not volumes:
+        if not len(volumes):
             volume_pattern = "NO_VOLUME_DATA"
         else:
             recent_vol_avg = np.mean(volumes[-20:])
@@ -92,8 +90,8 @@ class AdvancedWyckoffAnalyzer:
             volume_pattern = "INCREASING" if recent_vol_avg > early_vol_avg * 1.2 else "DECREASING" if recent_vol_avg < early_vol_avg * 0.8 else "STABLE"
         
         # Determine current Wyckoff phase
-        current_price = closes[-1]
-        price_position = (current_price - min(closes)) / price_range
+        current_price = float(closes[-1])
+        price_position = (current_price - lowest_close) / price_range
         
         # Phase determination logic
         if price_volatility < 0.02 and volume_pattern in ["STABLE", "DECREASING"]:
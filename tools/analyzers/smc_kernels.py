@@ -0,0 +1,68 @@
+"""
+Per-candle scan kernels for the SMC detectors.
+
+Written in the Numba-compatible subset of Python; smc_analyzer JIT-compiles them (plain loops without Numba).
+Each kernel only flags candles and records the numbers the detector needs; pattern objects are built in Python.
+"""
+import numpy as np
+from tools.utilities.jit import prange
+
+
+def order_block_scan(opens: np.ndarray, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, kinds: np.ndarray) -> None:
+    """Mark candles 10..n-6 as bullish (1) or bearish (-1) order blocks"""
+    for i in prange(10, closes.shape[0] - 5):
+        kind = 0
+        if closes[i] > opens[i] * 1.01:
+            # Next five candles must stay entirely above the block's high
+            kind = 1
+            for j in range(i + 1, i + 6):
+                if lows[j] <= highs[i]:
+                    kind = 0
+                    break
+        elif closes[i] < opens[i] * 0.99:
+            kind = -1
+            for j in range(i + 1, i + 6):
+                if highs[j] >= lows[i]:
+                    kind = 0
+                    break
+        kinds[i] = kind
+
+
+def fair_value_gap_scan(opens: np.ndarray, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray,
+                        kinds: np.ndarray, gap_percentages: np.ndarray) -> None:
+    """Mark candles whose neighbours leave a gap of more than 0.1% as bullish (1) or bearish (-1) FVGs"""
+    for i in range(1, closes.shape[0] - 1):
+        if highs[i - 1] < lows[i + 1] and closes[i] > opens[i]:
+            gap_percentage = (lows[i + 1] - highs[i - 1]) / highs[i - 1] * 100
+            if gap_percentage > 0.1:
+                kinds[i] = 1
+                gap_percentages[i] = gap_percentage
+        elif lows[i - 1] > highs[i + 1] and closes[i] < opens[i]:
+            gap_percentage = (lows[i - 1] - highs[i + 1]) / highs[i + 1] * 100
+            if gap_percentage > 0.1:
+                kinds[i] = -1
+                gap_percentages[i] = gap_percentage
+
+
+def liquidity_sweep_scan(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, bearish: np.ndarray, bullish: np.ndarray,
+                         recent_highs: np.ndarray, recent_lows: np.ndarray) -> None:
+    """Flag candles 10..n-6 that break the prior 10-candle extreme by 0.1% and are closed back through it within 3 candles"""
+    for i in range(10, closes.shape[0] - 5):
+        recent_high = highs[i - 10]
+        recent_low = lows[i - 10]
+        for j in range(i - 9, i):
+            recent_high = max(recent_high, highs[j])
+            recent_low = min(recent_low, lows[j])
+        recent_highs[i] = recent_high
+        recent_lows[i] = recent_low
+        
+        if highs[i] > recent_high * 1.001:
+            for j in range(i + 1, i + 4):
+                if closes[j] < recent_high:
+                    bearish[i] = True
+                    break
+        if lows[i] < recent_low * 0.999:
+            for j in range(i + 1, i + 4):
+                if closes[j] > recent_low:
+                    bullish[i] = True
+                    break
@@ -1,59 +1,74 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from data_structures.ohlc import OHLCData
-from data_structures.wyckoff_pattern import WyckoffPattern
+from data_structures.ohlc_series import OHLCSeries, candle_columns
+from data_structures.wyckoff_pattern import ACCUMULATION, DISTRIBUTION, SPRING, WyckoffPattern
 import numpy as np
 
 class WyckoffAnalyzer:
     """Wyckoff Method pattern recognition"""
     
     @staticmethod
-    def detect_accumulation_phase(ohlc_data: List[OHLCData]) -> Optional[WyckoffPattern]:
+    def detect_accumulation_phase(ohlc_data: List[OHLCData], series: Optional[OHLCSeries] = None) -> Optional[WyckoffPattern]:
         """Detect Wyckoff accumulation phase"""
         if len(ohlc_data) < 50:
             return None
         
-        closes = [candle.close for candle in ohlc_data]
-        highs = [candle.high for candle in ohlc_data]
-        lows = [candle.low for candle in ohlc_data]
-        volumes = [candle.volume for candle in ohlc_data]
+        closes, volumes, high_volume = WyckoffAnalyzer._climax_inputs(ohlc_data, series)
+        return WyckoffAnalyzer._accumulation(ohlc_data, volumes, high_volume & (closes[20:] < closes[19:-1] * 0.98))
+    
+    @staticmethod
+    def detect_distribution_phase(ohlc_data: List[OHLCData], series: Optional[OHLCSeries] = None) -> Optional[WyckoffPattern]:
+        """Detect Wyckoff distribution phase"""
+        if len(ohlc_data) < 50:
+            return None
         
-        # Look for selling climax (high volume, price drop)
+        closes, volumes, high_volume = WyckoffAnalyzer._climax_inputs(ohlc_data, series)
+        return WyckoffAnalyzer._distribution(ohlc_data, volumes, high_volume & (closes[20:] > closes[19:-1] * 1.02))
+    
+    @staticmethod
+    def detect_all(ohlc_data: List[OHLCData], series: Optional[OHLCSeries] = None) -> Dict[str, Optional[WyckoffPattern]]:
+        """Accumulation, distribution and spring in one call, extracting columns and climax volume once"""
+        detected = {'accumulation': None, 'distribution': None, 'spring': WyckoffAnalyzer.detect_spring(ohlc_data, series)}
+        if len(ohlc_data) >= 50:
+            closes, volumes, high_volume = WyckoffAnalyzer._climax_inputs(ohlc_data, series)
+            current, previous = closes[20:], closes[19:-1]
+            detected['accumulation'] = WyckoffAnalyzer._accumulation(ohlc_data, volumes, high_volume & (current < previous * 0.98))
+            detected['distribution'] = WyckoffAnalyzer._distribution(ohlc_data, volumes, high_volume & (current > previous * 1.02))
+        return detected
+    
+    @staticmethod
+    def _climax_inputs(ohlc_data: List[OHLCData], series: Optional[OHLCSeries]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Closes, volumes, and which candles from 20 on trade above 1.5x the last-20 average volume"""
+        closes, volumes = candle_columns(ohlc_data, 'close', 'volume', series=series)
         volume_avg = np.mean(volumes[-20:]) if volumes[-1] > 0 else 1
-        recent_lows = []
-        selling_climax_candidates = []
-        
-        for i in range(20, len(ohlc_data)):
-            # High volume condition
-            if volumes[i] > volume_avg * 1.5:
-                # Price drop condition
-                if closes[i] < closes[i-1] * 0.98:  # 2% drop
-                    selling_climax_candidates.append(i)
-                    recent_lows.append(lows[i])
+        return closes, volumes, volumes[20:] > volume_avg * 1.5
+    
+    @staticmethod
+    def _accumulation(ohlc_data: List[OHLCData], volumes: np.ndarray, climax: np.ndarray) -> Optional[WyckoffPattern]:
+        """Accumulation from the selling-climax mask (high volume, 2% price drop) over candles 20 on"""
+        selling_climax_candidates = 20 + np.flatnonzero(climax)
         
         if len(selling_climax_candidates) < 3:
             return None
         
-        # Check for at least 3 tests of the low
-        lowest_point = min(recent_lows)
-        test_count = 0
-        
-        for low in recent_lows:
-            if abs(low - lowest_point) / lowest_point < 0.02:  # Within 2%
-                test_count += 1
+        # Check for at least 3 tests of the low (within 2%)
+        recent_lows = np.array([ohlc_data[i].low for i in selling_climax_candidates.tolist()])
+        lowest_point = float(recent_lows.min())
+        test_count = int(np.count_nonzero(np.abs(recent_lows - lowest_point) / lowest_point < 0.02))
         
         if test_count >= 3:
             confidence = min(95, 60 + (test_count * 10))
             
             return WyckoffPattern(
-                pattern_type="ACCUMULATION",
+                pattern_type=ACCUMULATION,
                 phase="SELLING_CLIMAX_TESTED",
                 confidence=confidence,
-                start_time=ohlc_data[selling_climax_candidates[0]].timestamp,
+                start_time=ohlc_data[int(selling_climax_candidates[0])].timestamp,
                 end_time=ohlc_data[-1].timestamp,
                 key_levels={
                     "support": lowest_point,
                     "resistance": max([candle.high for candle in ohlc_data[-20:]]),
-                    "volume_climax": max(volumes[-20:])
+                    "volume_climax": float(volumes[-20:].max())
                 },
                 description=f"Accumulation pattern detected with {test_count} tests of support at {lowest_point:.4f}"
             )
@@ -61,52 +76,31 @@ class WyckoffAnalyzer:
         return None
     
     @staticmethod
-    def detect_distribution_phase(ohlc_data: List[OHLCData]) -> Optional[WyckoffPattern]:
-        """Detect Wyckoff distribution phase"""
-        if len(ohlc_data) < 50:
-            return None
-        
-        closes = [candle.close for candle in ohlc_data]
-        highs = [candle.high for candle in ohlc_data]
-        lows = [candle.low for candle in ohlc_data]
-        volumes = [candle.volume for candle in ohlc_data]
-        
-        volume_avg = np.mean(volumes[-20:]) if volumes[-1] > 0 else 1
-        recent_highs = []
-        buying_climax_candidates = []
-        
-        for i in range(20, len(ohlc_data)):
-            # High volume condition
-            if volumes[i] > volume_avg * 1.5:
-                # Price rise condition
-                if closes[i] > closes[i-1] * 1.02:  # 2% rise
-                    buying_climax_candidates.append(i)
-                    recent_highs.append(highs[i])
+    def _distribution(ohlc_data: List[OHLCData], volumes: np.ndarray, climax: np.ndarray) -> Optional[WyckoffPattern]:
+        """Distribution from the buying-climax mask (high volume, 2% price rise) over candles 20 on"""
+        buying_climax_candidates = 20 + np.flatnonzero(climax)
         
         if len(buying_climax_candidates) < 3:
             return None
         
-        # Check for at least 3 tests of the high
-        highest_point = max(recent_highs)
-        test_count = 0
-        
-        for high in recent_highs:
-            if abs(high - highest_point) / highest_point < 0.02:  # Within 2%
-                test_count += 1
+        # Check for at least 3 tests of the high (within 2%)
+        recent_highs = np.array([ohlc_data[i].high for i in buying_climax_candidates.tolist()])
+        highest_point = float(recent_highs.max())
+        test_count = int(np.count_nonzero(np.abs(recent_highs - highest_point) / highest_point < 0.02))
         
         if test_count >= 3:
             confidence = min(95, 60 + (test_count * 10))
             
             return WyckoffPattern(
-                pattern_type="DISTRIBUTION",
+                pattern_type=DISTRIBUTION,
                 phase="BUYING_CLIMAX_TESTED",
                 confidence=confidence,
-                start_time=ohlc_data[buying_climax_candidates[0]].timestamp,
+                start_time=ohlc_data[int(buying_climax_candidates[0])].timestamp,
                 end_time=ohlc_data[-1].timestamp,
                 key_levels={
                     "resistance": highest_point,
                     "support": min([candle.low for candle in ohlc_data[-20:]]),
-                    "volume_climax": max(volumes[-20:])
+                    "volume_climax": float(volumes[-20:].max())
                 },
                 description=f"Distribution pattern detected with {test_count} tests of resistance at {highest_point:.4f}"
             )
@@ -114,48 +108,42 @@ class WyckoffAnalyzer:
         return None
     
     @staticmethod
-    def detect_spring(ohlc_data: List[OHLCData]) -> Optional[WyckoffPattern]:
+    def detect_spring(ohlc_data: List[OHLCData], series: Optional[OHLCSeries] = None) -> Optional[WyckoffPattern]:
         """Detect Wyckoff spring pattern"""
         if len(ohlc_data) < 30:
             return None
         
-        lows = [candle.low for candle in ohlc_data]
-        closes = [candle.close for candle in ohlc_data]
-        volumes = [candle.volume for candle in ohlc_data]
+        # Support and the spring search both live in the last 20 candles
+        offset = len(ohlc_data) - 20
+        lows, closes, volumes = candle_columns(ohlc_data, 'low', 'close', 'volume', series=series, start=offset)
         
         # Find recent support level
-        support_level = min(lows[-20:])
-        support_index = None
-        
-        for i in range(len(ohlc_data)-20, len(ohlc_data)):
-            if lows[i] == support_level:
-                support_index = i
-                break
-        
-        if support_index is None:
+        support_level = float(lows.min())
+        support_matches = np.flatnonzero(lows == support_level)
+        if len(support_matches) == 0:
             return None
+        first = int(support_matches[0])
         
-        # Look for spring (break below support then quick recovery)
-        for i in range(support_index + 1, len(ohlc_data)):
-            if lows[i] < support_level * 0.995:  # Break below by 0.5%
-                # Check for quick recovery
-                if closes[i] > support_level:
-                    confidence = 75
-                    if volumes[i] < np.mean(volumes[-10:]):  # Low volume spring
-                        confidence += 10
-                    
-                    return WyckoffPattern(
-                        pattern_type="SPRING",
-                        phase="SPRING_DETECTED",
-                        confidence=confidence,
-                        start_time=ohlc_data[support_index].timestamp,
-                        end_time=ohlc_data[i].timestamp,
-                        key_levels={
-                            "support": support_level,
-                            "spring_low": lows[i],
-                            "entry_level": closes[i]
-                        },
-                        description=f"Spring detected: Break to {lows[i]:.4f}, recovery to {closes[i]:.4f}"
-                    )
+        # Look for spring (break below support by 0.5%, then quick recovery above it)
+        springs = first + 1 + np.flatnonzero((lows[first + 1:] < support_level * 0.995) & (closes[first + 1:] > support_level))
+        if len(springs) == 0:
+            return None
         
-        return None
\ No newline at end of file
+        k = int(springs[0])
+        confidence = 75
+        if volumes[k] < np.mean(volumes[-10:]):  # Low volume spring
+            confidence += 10
+        
+        return WyckoffPattern(
+            pattern_type=SPRING,
+            phase="SPRING_DETECTED",
+            confidence=confidence,
+            start_time=ohlc_data[offset + first].timestamp,
+            end_time=ohlc_data[offset + k].timestamp,
+            key_levels={
+                "support": support_level,
+                "spring_low": float(lows[k]),
+                "entry_level": float(closes[k])
+            },
+            description=f"Spring detected: Break to {lows[k]:.4f}, recovery to {closes[k]:.4f}"
+        )
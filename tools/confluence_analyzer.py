@@ -1,6 +1,8 @@
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
+import io
 from data_structures.confluence_signal import ConfluenceSignal
+from data_structures.ohlc_series import OHLCSeries
 from tools.analyzers.advanced_smc_analyzer import AdvancedSMCAnalyzer
 from tools.analyzers.advanced_wyckoff_analyzer import AdvancedWyckoffAnalyzer
 
@@ -14,8 +16,9 @@ class ConfluenceAnalyzer:
         self.wyckoff_analyzer = AdvancedWyckoffAnalyzer()
         self.smc_analyzer = AdvancedSMCAnalyzer()
     
-    def analyze_confluence(self, ohlc_data: List, technical_indicators: Dict = {}) -> ConfluenceSignal:
-        """Analyze confluence between all methodologies"""
+    def analyze_confluence(self, ohlc_data: List, technical_indicators: Dict = {},
+                           series: Optional[OHLCSeries] = None) -> ConfluenceSignal:
+        """Analyze confluence between all methodologies; series, when given, is the column view of ohlc_data"""
         if len(ohlc_data) < 20:
             return ConfluenceSignal(
                 signal_type="NEUTRAL",
@@ -34,12 +37,12 @@ class ConfluenceAnalyzer:
         current_price = ohlc_data[-1].close
         
         # Wyckoff analysis
-        wyckoff_schematic = self.wyckoff_analyzer.detect_wyckoff_schematic(ohlc_data)
-        composite_operator = self.wyckoff_analyzer.detect_composite_operator_activity(ohlc_data)
+        wyckoff_schematic = self.wyckoff_analyzer.detect_wyckoff_schematic(ohlc_data, series=series)
+        composite_operator = self.wyckoff_analyzer.detect_composite_operator_activity(ohlc_data, series=series)
         
         # SMC analysis
-        market_structure = self.smc_analyzer.detect_market_structure_shift(ohlc_data)
-        order_flow = self.smc_analyzer.detect_institutional_order_flow(ohlc_data)
+        market_structure = self.smc_analyzer.detect_market_structure_shift(ohlc_data, series=series)
+        order_flow = self.smc_analyzer.detect_institutional_order_flow(ohlc_data, series=series)
         
         # Score confluence
         confluence_score = 0
@@ -183,41 +186,53 @@ class ConfluenceAnalyzer:
         
         return float(np.mean(true_ranges)) if true_ranges else 0.01
     
-    def get_confluence_summary(self, confluence_signal: ConfluenceSignal) -> str:
-        """Format confluence analysis into readable summary"""
+    @staticmethod
+    def get_confluence_summary(confluence_signal: ConfluenceSignal, max_len: Optional[int] = None) -> str:
+        """Format confluence analysis into readable summary; past max_len characters it is cut off with '...'"""
         if not confluence_signal:
             return "No confluence analysis available"
         
-        summary = []
-        summary.append(f"🎯 CONFLUENCE ANALYSIS")
-        summary.append("=" * 40)
-        summary.append(f"Signal: {confluence_signal.signal_type}")
-        summary.append(f"Confluence Score: {confluence_signal.confluence_score:.1f}%")
-        summary.append(f"Entry Price: {confluence_signal.entry_price:.5f}")
-        summary.append(f"Stop Loss: {confluence_signal.stop_loss:.5f}")
-        summary.append(f"Take Profit: {confluence_signal.take_profit:.5f}")
-        summary.append(f"Risk:Reward Ratio: 1:{confluence_signal.risk_reward_ratio:.1f}")
-        summary.append("")
+        # Lines are formatted lazily, so a capped summary stops formatting once it is long enough
+        buf = io.StringIO()
+        for i, line in enumerate(ConfluenceAnalyzer._summary_lines(confluence_signal)):
+            if i:
+                buf.write("\n")
+            buf.write(line)
+            if max_len is not None and buf.tell() > max_len:
+                return buf.getvalue()[:max_len] + "..."
+        
+        return buf.getvalue()
+    
+    @staticmethod
+    def _summary_lines(confluence_signal: ConfluenceSignal) -> Iterator[str]:
+        """Lines of the confluence summary, in order"""
+        yield f"🎯 CONFLUENCE ANALYSIS"
+        yield "=" * 40
+        yield f"Signal: {confluence_signal.signal_type}"
+        yield f"Confluence Score: {confluence_signal.confluence_score:.1f}%"
+        yield f"Entry Price: {confluence_signal.entry_price:.5f}"
+        yield f"Stop Loss: {confluence_signal.stop_loss:.5f}"
+        yield f"Take Profit: {confluence_signal.take_profit:.5f}"
+        yield f"Risk:Reward Ratio: 1:{confluence_signal.risk_reward_ratio:.1f}"
+        yield ""
         
         if confluence_signal.wyckoff_patterns:
-            summary.append("🏛️ Wyckoff Patterns:")
+            yield "🏛️ Wyckoff Patterns:"
             for pattern in confluence_signal.wyckoff_patterns:
-                summary.append(f"  • {pattern}")
-            summary.append("")
+                yield f"  • {pattern}"
+            yield ""
         
         if confluence_signal.smc_patterns:
-            summary.append("💰 SMC Patterns:")
+            yield "💰 SMC Patterns:"
             for pattern in confluence_signal.smc_patterns:
-                summary.append(f"  • {pattern}")
-            summary.append("")
+                yield f"  • {pattern}"
+            yield ""
         
         if confluence_signal.supporting_indicators:
-            summary.append("📈 Supporting Indicators:")
+            yield "📈 Supporting Indicators:"
             for indicator in confluence_signal.supporting_indicators:
-                summary.append(f"  • {indicator}")
-            summary.append("")
-        
-        summary.append("💡 Analysis Reasoning:")
-        summary.append(f"  {confluence_signal.reasoning}")
+                yield f"  • {indicator}"
+            yield ""
         
-        return "\n".join(summary)
\ No newline at end of file
+        yield "💡 Analysis Reasoning:"
+        yield f"  {confluence_signal.reasoning}"
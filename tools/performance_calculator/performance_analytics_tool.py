@@ -1,17 +1,98 @@
+from collections import deque
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+import heapq
 import json
-import statistics
-from typing import Dict, List
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, List, Optional
 from crewai.tools import BaseTool
+import numpy as np
 
 from data_structures.performance_metrics import PerformanceMetrics
+from data_structures.report_context import ReportContext
 from tools.performance_calculator.supporting_class.learning_engine import TradeResult as LearningEngineTradeResult, LearningEngine
 from data_structures.trade_results import TradeResult
 from tools.analyzers.pattern_analyzer import PatternAnalyzer
 from tools.performance_calculator.supporting_class.performance_calculator import PerformanceCalculator
+from tools.performance_calculator.supporting_class.trade_columns import TradeColumns, WYCKOFF_BIT, SMC_BIT, PATTERN_BIT
+
+try:
+    # orjson parses in a single C call; fall back to the stdlib parser when it is not installed
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Report section rules
+_SEP50 = "=" * 50
+_SEP25 = "-" * 25
+_SEP30 = "-" * 30
+_SEP35 = "-" * 35
+
+# Invariant defaults shared by every tool instance; read-only so no instance can leak changes into another
+_DEFAULT_ALERTS_CONFIG = MappingProxyType({
+    'max_drawdown': MappingProxyType({'threshold': 15.0, 'enabled': True}),
+    'consecutive_losses': MappingProxyType({'threshold': 5, 'enabled': True}),
+    'win_rate_drop': MappingProxyType({'threshold': 40.0, 'enabled': True}),
+    'profit_factor_drop': MappingProxyType({'threshold': 1.2, 'enabled': True}),
+    'daily_loss_limit': MappingProxyType({'threshold': -500.0, 'enabled': True})
+})
+
+# Confluence score bands as (label, np.digitize code over _CONFLUENCE_BAND_EDGES), highest band first
+_CONFLUENCE_BAND_EDGES = np.array([40.0, 60.0, 80.0])
+_CONFLUENCE_BANDS = (
+    ('High (80-100%)', 3),
+    ('Medium (60-79%)', 2),
+    ('Low (40-59%)', 1),
+    ('Very Low (<40%)', 0)
+)
+
+# Health score breakpoints: win rate and profit factor score at or above each edge, drawdown at or below
+_WIN_RATE_EDGES = (40, 50, 60, 70)
+_WIN_RATE_SCORES = (0, 10, 15, 20, 25)
+_PROFIT_FACTOR_EDGES = (1.0, 1.2, 1.5, 2.0)
+_PROFIT_FACTOR_SCORES = (0, 10, 15, 20, 25)
+_DRAWDOWN_EDGES = (5, 10, 15, 25)
+_DRAWDOWN_SCORES = (25, 20, 15, 10, 0)
+
+# Real-time monitor snapshots are kept in a fixed-size ring of packed records
+_PERFORMANCE_HISTORY_SIZE = 10_000
+_PERFORMANCE_SNAPSHOT_DTYPE = np.dtype([
+    ('ts', 'i8'), ('win_rate', 'f4'), ('profit_factor', 'f4'), ('drawdown_percent', 'f4'), ('health_score', 'f4')
+])
+
+_DEFAULT_MONITORING_THRESHOLDS = MappingProxyType({
+    'max_drawdown_percent': 15.0,
+    'min_win_rate': 40.0,
+    'min_profit_factor': 1.2,
+    'max_consecutive_losses': 5,
+    'min_sharpe_ratio': 0.5
+})
+
+@lru_cache(maxsize=65536)
+def _parse_iso(timestamp: str) -> datetime:
+    """Parse an ISO timestamp; bulk replays repeat the same strings, and datetimes are immutable"""
+    return datetime.fromisoformat(timestamp)
+
+@lru_cache(maxsize=1)
+def _format_second(second: int) -> str:
+    """Report timestamp for a whole epoch second; reports rendered in the same second share the string"""
+    return datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S')
+
+def _now_str() -> str:
+    """Current local time in report format"""
+    return _format_second(int(time.time()))
 
 class PerformanceAnalyticsTool(BaseTool):
-    """Enhanced Performance Analytics Tool with advanced monitoring and ML capabilities"""
+    """Enhanced Performance Analytics Tool with advanced monitoring and ML capabilities
+    
+    Recalibration triggered by add_trade runs on a background worker, so the confluence
+    weights update shortly after add_trade returns; call wait_for_recalibration() to block
+    until they are current, and close() to stop the worker.
+    """
     
     name: str = "enhanced_performance_analytics"
     description: str = "Advanced performance tracking, real-time monitoring, and AI-powered trade analysis with predictive capabilities"
@@ -20,135 +101,145 @@ class PerformanceAnalyticsTool(BaseTool):
         super().__init__(**kwargs)
         # Core components
         object.__setattr__(self, '_trades_database', [])
+        object.__setattr__(self, '_trades_generation', 0)  # Bumped on every insert; keys the memoized metrics
+        object.__setattr__(self, '_asset_totals', {})  # symbol -> [gross_win, gross_loss] of closed trades
+        # Running aggregates over closed trades so the real-time monitor never rescans the database
+        object.__setattr__(self, '_running', PerformanceCalculator.new_running_metrics())
+        object.__setattr__(self, '_recent_closed_pnl', deque(maxlen=10))
+        
+        # Columnar mirror of the trade database for the array-based analytics
+        object.__setattr__(self, '_trade_columns', TradeColumns())
         object.__setattr__(self, '_calculator', PerformanceCalculator())
         object.__setattr__(self, '_pattern_analyzer', PatternAnalyzer())
         object.__setattr__(self, '_learning_engine', LearningEngine())
         object.__setattr__(self, '_last_recalibration', datetime.now())
         object.__setattr__(self, '_recalibration_frequency', 5)  # Every 5 trades
         
+        # Recalibration runs on a single background worker; pending requests are coalesced
+        object.__setattr__(self, '_recalibration_executor', ThreadPoolExecutor(max_workers=1, thread_name_prefix='recalibration'))
+        object.__setattr__(self, '_recalibration_lock', threading.Lock())
+        object.__setattr__(self, '_recalibration_pending', False)
+        object.__setattr__(self, '_recalibration_future', None)
+        object.__setattr__(self, '_optimization_lock', threading.RLock())
+        
         # Enhanced features
-        object.__setattr__(self, '_performance_history', [])
-        object.__setattr__(self, '_alerts_config', self._default_alerts_config())
+        object.__setattr__(self, '_performance_history', np.zeros(_PERFORMANCE_HISTORY_SIZE, dtype=_PERFORMANCE_SNAPSHOT_DTYPE))
+        object.__setattr__(self, '_performance_history_count', 0)
+        object.__setattr__(self, '_alerts_config', _DEFAULT_ALERTS_CONFIG)
         object.__setattr__(self, '_real_time_metrics', {})
         object.__setattr__(self, '_predictions', {})
         object.__setattr__(self, '_last_health_check', datetime.now())
         
         # Monitoring thresholds
-        object.__setattr__(self, '_monitoring_thresholds', {
-            'max_drawdown_percent': 15.0,
-            'min_win_rate': 40.0,
-            'min_profit_factor': 1.2,
-            'max_consecutive_losses': 5,
-            'min_sharpe_ratio': 0.5
+        object.__setattr__(self, '_monitoring_thresholds', _DEFAULT_MONITORING_THRESHOLDS)
+        
+        # Action dispatch table: action -> (handler, takes parsed JSON data)
+        object.__setattr__(self, '_actions', {
+            # Original actions
+            'analyze': (self._analyze_performance, False),
+            'add_trade': (self._add_trade_result, True),
+            'optimize': (self._optimize_system, False),
+            'report': (lambda params: self._generate_report(params.get('type', 'comprehensive')), True),
+            'patterns': (self._analyze_patterns, False),
+            # Enhanced actions
+            'real_time_monitor': (self._real_time_monitoring, False),
+            'health_check': (self._system_health_check, False),
+            'predict_performance': (self._predict_performance, False),
+            'risk_analysis': (self._risk_analysis, False),
+            'confluence_effectiveness': (self._analyze_confluence_effectiveness, False),
+            'set_alerts': (self._configure_alerts, True),
+            'benchmark': (self._benchmark_analysis, True),
         })
     
+    # __init__ always sets the backing attributes, so the properties read them directly
     @property
     def trades_database(self) -> List[TradeResult]:
-        return getattr(self, '_trades_database', [])
+        return self._trades_database
     
     @property
     def calculator(self) -> PerformanceCalculator:
-        return getattr(self, '_calculator', PerformanceCalculator())
+        return self._calculator
     
     @property
     def pattern_analyzer(self) -> PatternAnalyzer:
-        return getattr(self, '_pattern_analyzer', PatternAnalyzer())
+        return self._pattern_analyzer
     
     @property
     def learning_engine(self) -> LearningEngine:
-        return getattr(self, '_learning_engine', LearningEngine())
+        return self._learning_engine
     
     @property
     def recalibration_frequency(self) -> int:
-        return object.__getattribute__(self, '_recalibration_frequency') if hasattr(self, '_recalibration_frequency') else 5
+        return self._recalibration_frequency
     
     @property
     def last_recalibration(self) -> datetime:
-        return object.__getattribute__(self, '_last_recalibration') if hasattr(self, '_last_recalibration') else datetime.now()
+        return self._last_recalibration
     
     def _run(self, action: str, data: str = "") -> str:
         """Enhanced performance analytics with additional actions"""
         try:
-            # Original actions
-            if action == "analyze":
-                return self._analyze_performance()
-            elif action == "add_trade":
-                trade_data = json.loads(data) if data else {}
-                return self._add_trade_result(trade_data)
-            elif action == "optimize":
-                return self._optimize_system()
-            elif action == "report":
-                report_type = json.loads(data).get('type', 'comprehensive') if data else 'comprehensive'
-                return self._generate_report(report_type)
-            elif action == "patterns":
-                return self._analyze_patterns()
-            
-            # Enhanced actions
-            elif action == "real_time_monitor":
-                return self._real_time_monitoring()
-            elif action == "health_check":
-                return self._system_health_check()
-            elif action == "predict_performance":
-                return self._predict_performance()
-            elif action == "risk_analysis":
-                return self._risk_analysis()
-            elif action == "confluence_effectiveness":
-                return self._analyze_confluence_effectiveness()
-            elif action == "set_alerts":
-                alert_config = json.loads(data) if data else {}
-                return self._configure_alerts(alert_config)
-            elif action == "benchmark":
-                benchmark_data = json.loads(data) if data else {}
-                return self._benchmark_analysis(benchmark_data)
-            
-            else:
+            handler, needs_data = self._actions.get(action, (None, False))
+            if handler is None:
                 return f"Unknown action: {action}. Available actions: {self._get_available_actions()}"
+            if needs_data:
+                return handler(_json_loads(data) if data else {})
+            return handler()
         
         except Exception as e:
             return f"Error in enhanced performance analytics: {str(e)}"
     
-    def _analyze_performance(self) -> str:
+    def _analyze_performance(self, ctx: Optional[ReportContext] = None) -> str:
         """Analyze current performance metrics"""
         if not self.trades_database:
             return "No trade data available for analysis"
         
-        metrics = self.calculator.calculate_basic_metrics(self.trades_database)
+        metrics = ctx.metrics if ctx is not None else self._calculate_metrics()
+        now_str = ctx.now_str if ctx is not None else _now_str()
         
-        output = []
-        output.append("📊 PERFORMANCE ANALYSIS")
-        output.append("=" * 50)
-        output.append(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output.append(f"Total Trades: {metrics.total_trades}")
-        output.append("")
+        output = [
+            "📊 PERFORMANCE ANALYSIS",
+            _SEP50,
+            f"Analysis Date: {now_str}",
+            f"Total Trades: {metrics.total_trades}",
+            ""
+        ]
         
         # Basic metrics
-        output.append("📈 BASIC METRICS")
-        output.append("-" * 25)
-        output.append(f"Win Rate: {metrics.win_rate:.1f}%")
-        output.append(f"Profit Factor: {metrics.profit_factor:.2f}")
-        output.append(f"Total P&L: ${metrics.total_pnl:.2f}")
-        output.append(f"Total P&L %: {metrics.total_pnl_percent:.2f}%")
-        output.append(f"Average Win: ${metrics.avg_win:.2f}")
-        output.append(f"Average Loss: ${metrics.avg_loss:.2f}")
-        output.append(f"Expectancy: ${metrics.expectancy:.2f}")
-        output.append("")
+        output.extend([
+            "📈 BASIC METRICS",
+            _SEP25,
+            f"Win Rate: {metrics.win_rate:.1f}%",
+            f"Profit Factor: {metrics.profit_factor:.2f}",
+            f"Total P&L: ${metrics.total_pnl:.2f}",
+            f"Total P&L %: {metrics.total_pnl_percent:.2f}%",
+            f"Average Win: ${metrics.avg_win:.2f}",
+            f"Average Loss: ${metrics.avg_loss:.2f}",
+            f"Expectancy: ${metrics.expectancy:.2f}",
+            ""
+        ])
         
         # Risk metrics
-        output.append("⚠️ RISK METRICS")
-        output.append("-" * 25)
-        output.append(f"Max Drawdown: ${metrics.max_drawdown:.2f} ({metrics.max_drawdown_percent:.1f}%)")
-        output.append(f"Max Consecutive Losses: {metrics.max_consecutive_losses}")
-        output.append(f"Sharpe Ratio: {metrics.sharpe_ratio:.2f}")
-        output.append(f"Sortino Ratio: {metrics.sortino_ratio:.2f}")
-        output.append(f"Recovery Factor: {metrics.recovery_factor:.2f}")
-        output.append("")
-        
-        # Asset performance
+        output.extend([
+            "⚠️ RISK METRICS",
+            _SEP25,
+            f"Max Drawdown: ${metrics.max_drawdown:.2f} ({metrics.max_drawdown_percent:.1f}%)",
+            f"Max Consecutive Losses: {metrics.max_consecutive_losses}",
+            f"Sharpe Ratio: {metrics.sharpe_ratio:.2f}",
+            f"Sortino Ratio: {metrics.sortino_ratio:.2f}",
+            f"Recovery Factor: {metrics.recovery_factor:.2f}",
+            ""
+        ])
+        
+        # Asset performance (top 20 by profit factor once the universe grows past that)
         if metrics.profit_factor_by_asset:
-            output.append("💱 ASSET PERFORMANCE")
-            output.append("-" * 25)
-            for asset, pf in sorted(metrics.profit_factor_by_asset.items(), 
-                                  key=lambda x: x[1], reverse=True):
+            output.extend(("💱 ASSET PERFORMANCE", _SEP25))
+            asset_items = metrics.profit_factor_by_asset.items()
+            if len(asset_items) > 20:
+                ranked_assets = heapq.nlargest(20, asset_items, key=lambda x: x[1])
+            else:
+                ranked_assets = sorted(asset_items, key=lambda x: x[1], reverse=True)
+            for asset, pf in ranked_assets:
                 output.append(f"{asset}: {pf:.2f}")
             output.append("")
         
@@ -158,6 +249,13 @@ class PerformanceAnalyticsTool(BaseTool):
         
         return "\n".join(output)
     
+    def _calculate_metrics(self) -> PerformanceMetrics:
+        """Calculate metrics for the full trade database using the running per-asset totals"""
+        return self.calculator.calculate_basic_metrics(
+            self.trades_database, self.calculator.profit_factors_from_totals(self._asset_totals),
+            generation=self._trades_generation
+        )
+    
     def _add_trade_result(self, trade_data: Dict) -> str:
         """Add a new trade result to the database"""
         try:
@@ -165,8 +263,8 @@ class PerformanceAnalyticsTool(BaseTool):
                 trade_id=trade_data.get('trade_id', f"trade_{len(self.trades_database) + 1}"),
                 symbol=trade_data.get('symbol', 'UNKNOWN'),
                 timeframe=trade_data.get('timeframe', '1H'),
-                entry_time=datetime.fromisoformat(trade_data.get('entry_time', datetime.now().isoformat())),
-                exit_time=datetime.fromisoformat(trade_data['exit_time']) if trade_data.get('exit_time') else None,
+                entry_time=_parse_iso(trade_data['entry_time']) if 'entry_time' in trade_data else datetime.now(),
+                exit_time=_parse_iso(trade_data['exit_time']) if trade_data.get('exit_time') else None,
                 entry_price=trade_data.get('entry_price', 0.0),
                 exit_price=trade_data.get('exit_price'),
                 position_size=trade_data.get('position_size', 0.0),
@@ -188,30 +286,42 @@ class PerformanceAnalyticsTool(BaseTool):
                 trade_notes=trade_data.get('trade_notes', '')
             )
             
-            # Add to database
-            current_trades = list(self.trades_database)
-            current_trades.append(trade)
-            object.__setattr__(self, '_trades_database', current_trades)
+            # Add to database (the list is owned by this tool, so append in place)
+            trades_database = self.trades_database
+            trades_database.append(trade)
+            object.__setattr__(self, '_trades_generation', self._trades_generation + 1)
+            self._trade_columns.append(trade)
+            if trade.status == 'CLOSED':
+                self._recent_closed_pnl.append(trade.pnl)
+                with self._optimization_lock:  # The recalibration worker reads these tables
+                    self.learning_engine.observe(trade)
+                if trade.pnl is not None:
+                    self.calculator.accumulate_asset_totals(self._asset_totals, trade)
+                    self.calculator.accumulate_running_metrics(self._running, trade)
             
             # Check if recalibration is needed
-            closed_trades = [t for t in current_trades if t.status == 'CLOSED']
-            if len(closed_trades) % self.recalibration_frequency == 0:
+            if self._trade_columns.closed_count % self.recalibration_frequency == 0:
                 self._trigger_recalibration()
             
-            return f"✅ Trade {trade.trade_id} added successfully. Total trades: {len(current_trades)}"
+            return f"✅ Trade {trade.trade_id} added successfully. Total trades: {len(trades_database)}"
         
         except Exception as e:
             return f"❌ Error adding trade: {str(e)}"
     
     def _optimize_system(self) -> str:
         """Optimize system parameters based on performance"""
+        # Serialize with background recalibration, which mutates the learning engine too
+        with self._optimization_lock:
+            return self._optimize_system_locked()
+    
+    def _optimize_system_locked(self) -> str:
         closed_trades = [t for t in self.trades_database if t.status == 'CLOSED']
         
         if len(closed_trades) < 10:
             return "❌ Insufficient trade data for optimization (minimum 10 closed trades required)"
         
-        # Optimize confluence weights
-        new_weights = self.learning_engine.analyze_confluence_effectiveness(closed_trades)
+        # Optimize confluence weights from the running tables fed on ingestion
+        new_weights = self.learning_engine.analyze_confluence_effectiveness()
         
         # Analyze pattern performance
         pattern_performances = self.pattern_analyzer.analyze_pattern_performance(closed_trades)
@@ -220,16 +330,16 @@ class PerformanceAnalyticsTool(BaseTool):
         # Generate insights
         insights = self.learning_engine.generate_optimization_insights()
         
-        output = []
-        output.append("🧠 SYSTEM OPTIMIZATION")
-        output.append("=" * 50)
-        output.append(f"Optimization Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output.append(f"Trades Analyzed: {len(closed_trades)}")
-        output.append("")
+        output = [
+            "🧠 SYSTEM OPTIMIZATION",
+            _SEP50,
+            f"Optimization Date: {_now_str()}",
+            f"Trades Analyzed: {len(closed_trades)}",
+            ""
+        ]
         
         # New weights
-        output.append("⚖️ UPDATED CONFLUENCE WEIGHTS")
-        output.append("-" * 35)
+        output.extend(("⚖️ UPDATED CONFLUENCE WEIGHTS", _SEP35))
         for weight_name, weight_value in new_weights.items():
             old_value = insights['weight_changes'][weight_name]['old']
             change = insights['weight_changes'][weight_name]['change_percent']
@@ -239,48 +349,52 @@ class PerformanceAnalyticsTool(BaseTool):
         
         # Top performing patterns
         if pattern_performances:
-            output.append("🎯 TOP PERFORMING PATTERNS")
-            output.append("-" * 35)
+            output.extend(("🎯 TOP PERFORMING PATTERNS", _SEP35))
             for pattern in pattern_performances[:5]:
                 output.append(f"{pattern.pattern_name}: {pattern.success_rate:.1f}% success rate")
         output.append("")
         
         # Recommendations
         if insights['recommendations']:
-            output.append("💡 OPTIMIZATION RECOMMENDATIONS")
-            output.append("-" * 35)
-            for rec in insights['recommendations']:
-                output.append(f"• {rec}")
+            output.extend(("💡 OPTIMIZATION RECOMMENDATIONS", _SEP35))
+            output.extend(f"• {rec}" for rec in insights['recommendations'])
         
         # Update last recalibration time
         object.__setattr__(self, '_last_recalibration', datetime.now())
         
         return "\n".join(output)
     
-    def _analyze_patterns(self) -> str:
+    def _analyze_patterns(self, ctx: Optional[ReportContext] = None) -> str:
         """Analyze pattern performance in detail"""
-        closed_trades = [t for t in self.trades_database if t.status == 'CLOSED']
+        closed_trades = ctx.closed_trades if ctx is not None else [t for t in self.trades_database if t.status == 'CLOSED']
         
         if not closed_trades:
             return "No closed trades available for pattern analysis"
         
-        pattern_performances = self.pattern_analyzer.analyze_pattern_performance(closed_trades)
+        if ctx is not None:
+            pattern_performances = ctx.pattern_performances
+        else:
+            pattern_performances = self.pattern_analyzer.analyze_pattern_performance(closed_trades)
+        now_str = ctx.now_str if ctx is not None else _now_str()
         
-        output = []
-        output.append("🎨 PATTERN PERFORMANCE ANALYSIS")
-        output.append("=" * 50)
-        output.append(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output.append(f"Patterns Analyzed: {len(pattern_performances)}")
-        output.append("")
+        output = [
+            "🎨 PATTERN PERFORMANCE ANALYSIS",
+            _SEP50,
+            f"Analysis Date: {now_str}",
+            f"Patterns Analyzed: {len(pattern_performances)}",
+            ""
+        ]
         
         for pattern in pattern_performances:
-            output.append(f"📊 {pattern.pattern_name}")
-            output.append(f"   Success Rate: {pattern.success_rate:.1f}%")
-            output.append(f"   Total Occurrences: {pattern.total_occurrences}")
-            output.append(f"   Avg P&L: ${pattern.avg_pnl:.2f}")
-            output.append(f"   Avg Confidence: {pattern.avg_confidence_when_detected:.1f}%")
-            output.append(f"   Reliability Score: {pattern.reliability_score:.1f}")
-            output.append("")
+            output.extend([
+                f"📊 {pattern.pattern_name}",
+                f"   Success Rate: {pattern.success_rate:.1f}%",
+                f"   Total Occurrences: {pattern.total_occurrences}",
+                f"   Avg P&L: ${pattern.avg_pnl:.2f}",
+                f"   Avg Confidence: {pattern.avg_confidence_when_detected:.1f}%",
+                f"   Reliability Score: {pattern.reliability_score:.1f}",
+                ""
+            ])
         
         return "\n".join(output)
     
@@ -295,11 +409,22 @@ class PerformanceAnalyticsTool(BaseTool):
         else:
             return f"Unknown report type: {report_type}"
         
+    def _build_context(self) -> ReportContext:
+        """Derive the metrics, closed trades and pattern results once for a multi-section report"""
+        closed_trades = [t for t in self.trades_database if t.status == 'CLOSED']
+        return ReportContext(
+            metrics=self._calculate_metrics() if self.trades_database else None,
+            closed_trades=closed_trades,
+            pattern_performances=self.pattern_analyzer.analyze_pattern_performance(closed_trades) if closed_trades else [],
+            now_str=_now_str()
+        )
+    
     def _generate_comprehensive_report(self) -> str:
         """Generate detailed comprehensive report"""
-        performance_analysis = self._analyze_performance()
-        pattern_analysis = self._analyze_patterns()
-        optimization_status = self._get_optimization_status()
+        ctx = self._build_context()
+        performance_analysis = self._analyze_performance(ctx)
+        pattern_analysis = self._analyze_patterns(ctx)
+        optimization_status = self._get_optimization_status(ctx)
         
         return f"{performance_analysis}\n\n{pattern_analysis}\n\n{optimization_status}"
     
@@ -308,7 +433,7 @@ class PerformanceAnalyticsTool(BaseTool):
         if not self.trades_database:
             return "No trade data available for summary"
         
-        metrics = self.calculator.calculate_basic_metrics(self.trades_database)
+        metrics = self._calculate_metrics()
         rating = self._calculate_performance_rating(metrics)
         
         return f"""
@@ -322,18 +447,22 @@ Max Drawdown: {metrics.max_drawdown_percent:.1f}%
 Overall Rating: {rating}
         """.strip()
     
-    def _get_optimization_status(self) -> str:
+    def _get_optimization_status(self, ctx: Optional[ReportContext] = None) -> str:
         """Get current optimization status"""
         time_since_last = datetime.now() - self.last_recalibration
-        closed_trades = len([t for t in self.trades_database if t.status == 'CLOSED'])
+        if ctx is not None:
+            closed_trades = len(ctx.closed_trades)
+        else:
+            closed_trades = self._trade_columns.closed_count
         
-        output = []
-        output.append("🔧 OPTIMIZATION STATUS")
-        output.append("=" * 50)
-        output.append(f"Last Recalibration: {self.last_recalibration.strftime('%Y-%m-%d %H:%M:%S')}")
-        output.append(f"Time Since Last: {time_since_last}")
-        output.append(f"Closed Trades: {closed_trades}")
-        output.append(f"Next Recalibration: Every {self.recalibration_frequency} trades")
+        output = [
+            "🔧 OPTIMIZATION STATUS",
+            _SEP50,
+            f"Last Recalibration: {self.last_recalibration.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Time Since Last: {time_since_last}",
+            f"Closed Trades: {closed_trades}",
+            f"Next Recalibration: Every {self.recalibration_frequency} trades"
+        ]
         
         trades_until_next = self.recalibration_frequency - (closed_trades % self.recalibration_frequency)
         output.append(f"Trades Until Next: {trades_until_next}")
@@ -341,9 +470,37 @@ Overall Rating: {rating}
         return "\n".join(output)
     
     def _trigger_recalibration(self):
-        """Trigger system recalibration"""
+        """Queue a system recalibration off the trade insertion path"""
+        with self._recalibration_lock:
+            if self._recalibration_pending:
+                return  # The queued run has not started yet and will see the new trades
+            object.__setattr__(self, '_recalibration_pending', True)
+            object.__setattr__(self, '_recalibration_future', self._recalibration_executor.submit(self._run_recalibration))
+    
+    def _run_recalibration(self):
+        """Background recalibration worker"""
+        with self._recalibration_lock:
+            # Clear first so trades added while optimizing queue a fresh run
+            object.__setattr__(self, '_recalibration_pending', False)
+        
         self._optimize_system()
     
+    def wait_for_recalibration(self, timeout: Optional[float] = None) -> None:
+        """Block until the most recently queued recalibration has finished"""
+        with self._recalibration_lock:
+            future = self._recalibration_future
+        if future is not None:
+            future.result(timeout)
+    
+    def close(self) -> None:
+        """Finish any queued recalibration and stop the background worker"""
+        self._recalibration_executor.shutdown(wait=True)
+    
+    def __del__(self):
+        executor = self.__dict__.get('_recalibration_executor')
+        if executor is not None:
+            executor.shutdown(wait=False)
+    
     def _calculate_performance_rating(self, metrics: PerformanceMetrics) -> str:
         """Calculate overall performance rating"""
         score = 0
@@ -405,86 +562,128 @@ Overall Rating: {rating}
         if not self.trades_database:
             return "No trade data available for real-time monitoring"
         
-        current_metrics = self.calculator.calculate_basic_metrics(self.trades_database)
+        current_metrics = self._fast_snapshot()
+        win_rate = current_metrics['win_rate']
+        profit_factor = current_metrics['profit_factor']
+        total_pnl = current_metrics['total_pnl']
+        drawdown_percent = current_metrics['max_drawdown_percent']
+        consecutive_losses = current_metrics['max_consecutive_losses']
         alerts = []
         
         # Check monitoring thresholds
         thresholds = getattr(self, '_monitoring_thresholds', {})
         
-        if current_metrics.max_drawdown_percent > thresholds.get('max_drawdown_percent', 15):
-            alerts.append(f"🚨 HIGH DRAWDOWN ALERT: {current_metrics.max_drawdown_percent:.1f}%")
+        if drawdown_percent > thresholds.get('max_drawdown_percent', 15):
+            alerts.append(f"🚨 HIGH DRAWDOWN ALERT: {drawdown_percent:.1f}%")
         
-        if current_metrics.win_rate < thresholds.get('min_win_rate', 40):
-            alerts.append(f"⚠️ LOW WIN RATE ALERT: {current_metrics.win_rate:.1f}%")
+        if win_rate < thresholds.get('min_win_rate', 40):
+            alerts.append(f"⚠️ LOW WIN RATE ALERT: {win_rate:.1f}%")
         
-        if current_metrics.profit_factor < thresholds.get('min_profit_factor', 1.2):
-            alerts.append(f"📉 LOW PROFIT FACTOR ALERT: {current_metrics.profit_factor:.2f}")
+        if profit_factor < thresholds.get('min_profit_factor', 1.2):
+            alerts.append(f"📉 LOW PROFIT FACTOR ALERT: {profit_factor:.2f}")
         
-        if current_metrics.max_consecutive_losses > thresholds.get('max_consecutive_losses', 5):
-            alerts.append(f"🔴 CONSECUTIVE LOSSES ALERT: {current_metrics.max_consecutive_losses}")
+        if consecutive_losses > thresholds.get('max_consecutive_losses', 5):
+            alerts.append(f"🔴 CONSECUTIVE LOSSES ALERT: {consecutive_losses}")
         
-        # Recent performance trend
-        recent_trades = [t for t in self.trades_database if t.status == 'CLOSED'][-10:]
-        if recent_trades:
-            recent_pnl = [t.pnl for t in recent_trades if t.pnl is not None]
+        # Recent performance trend (last 10 closed trades)
+        if self._recent_closed_pnl:
+            recent_pnl = [pnl for pnl in self._recent_closed_pnl if pnl is not None]
             recent_trend = "POSITIVE" if sum(recent_pnl) > 0 else "NEGATIVE"
         else:
             recent_trend = "NO_DATA"
         
         # Update real-time metrics
         current_time = datetime.now()
+        health_score = self._calculate_health_score(current_metrics)
         real_time_data = {
             'timestamp': current_time.isoformat(),
             'current_metrics': {
-                'win_rate': current_metrics.win_rate,
-                'profit_factor': current_metrics.profit_factor,
-                'total_pnl': current_metrics.total_pnl,
-                'drawdown_percent': current_metrics.max_drawdown_percent,
-                'consecutive_losses': current_metrics.max_consecutive_losses
+                'win_rate': win_rate,
+                'profit_factor': profit_factor,
+                'total_pnl': total_pnl,
+                'drawdown_percent': drawdown_percent,
+                'consecutive_losses': consecutive_losses
             },
             'alerts': alerts,
             'trend': recent_trend,
-            'health_score': self._calculate_health_score(current_metrics)
+            'health_score': health_score
         }
         
         object.__setattr__(self, '_real_time_metrics', real_time_data)
+        self._record_performance_snapshot(current_time, current_metrics, health_score)
         
         # Format output
-        output = []
-        output.append("📊 REAL-TIME PERFORMANCE MONITOR")
-        output.append("=" * 50)
-        output.append(f"Monitor Time: {current_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        output.append(f"Health Score: {real_time_data['health_score']:.1f}/100")
-        output.append(f"Recent Trend: {recent_trend}")
-        output.append("")
-        
-        output.append("📈 CURRENT METRICS")
-        output.append("-" * 25)
-        output.append(f"Win Rate: {current_metrics.win_rate:.1f}%")
-        output.append(f"Profit Factor: {current_metrics.profit_factor:.2f}")
-        output.append(f"Total P&L: ${current_metrics.total_pnl:.2f}")
-        output.append(f"Drawdown: {current_metrics.max_drawdown_percent:.1f}%")
-        output.append(f"Consecutive Losses: {current_metrics.max_consecutive_losses}")
-        output.append("")
+        output = [
+            "📊 REAL-TIME PERFORMANCE MONITOR",
+            _SEP50,
+            f"Monitor Time: {current_time.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Health Score: {health_score:.1f}/100",
+            f"Recent Trend: {recent_trend}",
+            ""
+        ]
+        
+        output.extend([
+            "📈 CURRENT METRICS",
+            _SEP25,
+            f"Win Rate: {win_rate:.1f}%",
+            f"Profit Factor: {profit_factor:.2f}",
+            f"Total P&L: ${total_pnl:.2f}",
+            f"Drawdown: {drawdown_percent:.1f}%",
+            f"Consecutive Losses: {consecutive_losses}",
+            ""
+        ])
         
         if alerts:
-            output.append("🚨 ACTIVE ALERTS")
-            output.append("-" * 25)
-            for alert in alerts:
-                output.append(f"{alert}")
+            output.extend(("🚨 ACTIVE ALERTS", _SEP25))
+            output.extend(alerts)
             output.append("")
         else:
-            output.append("✅ No active alerts - System operating within parameters")
-            output.append("")
+            output.extend([
+                "✅ No active alerts - System operating within parameters",
+                ""
+            ])
         
         return "\n".join(output)
     
+    def _record_performance_snapshot(self, timestamp: datetime, metrics: Dict, health_score: float):
+        """Write a monitor snapshot into the performance history ring, overwriting the oldest once full"""
+        count = self._performance_history_count
+        self._performance_history[count % _PERFORMANCE_HISTORY_SIZE] = (
+            int(timestamp.timestamp()), metrics['win_rate'], metrics['profit_factor'],
+            metrics['max_drawdown_percent'], health_score
+        )
+        object.__setattr__(self, '_performance_history_count', count + 1)
+    
+    def _recent_performance_history(self, n: int) -> np.ndarray:
+        """Return up to the last n monitor snapshots, oldest first"""
+        count = self._performance_history_count
+        n = min(n, count, _PERFORMANCE_HISTORY_SIZE)
+        return self._performance_history[np.arange(count - n, count) % _PERFORMANCE_HISTORY_SIZE]
+    
+    def _fast_snapshot(self) -> Dict:
+        """Headline metrics from the running aggregates in O(1); values match calculate_basic_metrics"""
+        r = self._running
+        closed = r['closed']
+        if not closed:
+            return {'win_rate': 0, 'profit_factor': 0, 'total_pnl': 0, 'max_drawdown_percent': 0,
+                    'max_consecutive_losses': 0, 'sharpe_ratio': 0, 'total_trades': len(self.trades_database)}
+        
+        return {
+            'win_rate': (r['wins'] / closed) * 100,
+            'profit_factor': r['gross_profit'] / r['gross_loss'] if r['gross_loss'] > 0 else float('inf'),
+            'total_pnl': r['total_pnl'],
+            'max_drawdown_percent': r['max_drawdown_percent'],
+            'max_consecutive_losses': r['max_consecutive_losses'],
+            'sharpe_ratio': self.calculator.sharpe_from_running(r),
+            'total_trades': closed
+        }
+    
     def _system_health_check(self) -> str:
         """Comprehensive system health analysis"""
         if not self.trades_database:
             return "No trade data available for health check"
         
-        current_metrics = self.calculator.calculate_basic_metrics(self.trades_database)
+        current_metrics = self._calculate_metrics()
         health_components = {}
         
         # Performance health (40% weight)
@@ -522,25 +721,12 @@ Overall Rating: {rating}
         health_components['risk_management'] = max(risk_score, 0)
         
         # Consistency health (20% weight)
-        closed_trades = [t for t in self.trades_database if t.status == 'CLOSED']
-        if len(closed_trades) >= 10:
-            # Calculate consistency metrics
-            daily_returns = []
-            trade_dates = {}
-            
-            for trade in closed_trades:
-                if trade.exit_time and trade.pnl_percent:
-                    date_key = trade.exit_time.date()
-                    if date_key not in trade_dates:
-                        trade_dates[date_key] = []
-                    trade_dates[date_key].append(trade.pnl_percent)
+        if self._trade_columns.closed_count >= 10:
+            # Calculate consistency metrics from daily return volatility
+            daily_returns = self._daily_returns()
             
-            # Daily return volatility
-            for date, returns in trade_dates.items():
-                daily_returns.append(sum(returns))
-            
-            if len(daily_returns) > 1:
-                volatility = statistics.stdev(daily_returns)
+            if daily_returns.size > 1:
+                volatility = float(daily_returns.std(ddof=1))
                 consistency_score = max(0, 20 - (volatility * 2))
             else:
                 consistency_score = 15
@@ -590,72 +776,82 @@ Overall Rating: {rating}
             recommendations.append("🔧 System needs optimization - Run parameter adjustment cycle")
         
         # Format output
-        output = []
-        output.append("🏥 SYSTEM HEALTH CHECK")
-        output.append("=" * 50)
-        output.append(f"Health Check Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output.append(f"Overall Health Score: {total_health_score:.1f}/100")
-        output.append(f"Health Status: {health_status}")
-        output.append("")
-        
-        output.append("📋 HEALTH COMPONENTS")
-        output.append("-" * 30)
-        output.append(f"Performance Health: {health_components['performance']:.1f}/40")
-        output.append(f"Risk Management: {health_components['risk_management']:.1f}/30")
-        output.append(f"Consistency: {health_components['consistency']:.1f}/20")
-        output.append(f"Optimization: {health_components['optimization']:.1f}/10")
-        output.append("")
+        output = [
+            "🏥 SYSTEM HEALTH CHECK",
+            _SEP50,
+            f"Health Check Time: {_now_str()}",
+            f"Overall Health Score: {total_health_score:.1f}/100",
+            f"Health Status: {health_status}",
+            ""
+        ]
+        
+        output.extend([
+            "📋 HEALTH COMPONENTS",
+            _SEP30,
+            f"Performance Health: {health_components['performance']:.1f}/40",
+            f"Risk Management: {health_components['risk_management']:.1f}/30",
+            f"Consistency: {health_components['consistency']:.1f}/20",
+            f"Optimization: {health_components['optimization']:.1f}/10",
+            ""
+        ])
         
         if recommendations:
-            output.append("💡 HEALTH RECOMMENDATIONS")
-            output.append("-" * 30)
-            for rec in recommendations:
-                output.append(f"• {rec}")
+            output.extend(("💡 HEALTH RECOMMENDATIONS", _SEP30))
+            output.extend(f"• {rec}" for rec in recommendations)
         
         # Update last health check time
         object.__setattr__(self, '_last_health_check', datetime.now())
         
         return "\n".join(output)
     
+    def _daily_returns(self) -> np.ndarray:
+        """Sum closed-trade pnl_percent per exit date in a single vectorized pass"""
+        cols = self._trade_columns
+        days = cols.closed('exit_day')
+        returns = cols.closed('pnl_percent')
+        dated = (days != 0) & (returns != 0)
+        if not dated.any():
+            return np.empty(0)
+        
+        _, day_index = np.unique(days[dated], return_inverse=True)
+        return np.bincount(day_index, weights=returns[dated])
+    
     def _predict_performance(self) -> str:
         """Predict future performance based on current trends"""
-        closed_trades = [t for t in self.trades_database if t.status == 'CLOSED']
+        cols = self._trade_columns
+        closed_count = cols.closed_count
         
-        if len(closed_trades) < 20:
+        if closed_count < 20:
             return "Insufficient trade history for performance prediction (minimum 20 trades required)"
         
-        # Analyze recent trends
-        recent_trades = closed_trades[-10:]
-        older_trades = closed_trades[-20:-10] if len(closed_trades) >= 20 else closed_trades[:-10]
-        
-        # Calculate trend metrics
-        recent_metrics = self.calculator.calculate_basic_metrics(recent_trades)
-        older_metrics = self.calculator.calculate_basic_metrics(older_trades) if older_trades else recent_metrics
+        # Analyze recent trends (older = trades -20..-10, recent = last 10)
+        older_metrics, recent_metrics = self.calculator.calculate_trend_metrics(cols.closed('pnl')[-20:], -10)
         
         # Trend analysis
-        win_rate_trend = recent_metrics.win_rate - older_metrics.win_rate
-        pf_trend = recent_metrics.profit_factor - older_metrics.profit_factor
+        win_rate_trend = recent_metrics['win_rate'] - older_metrics['win_rate']
+        pf_trend = recent_metrics['profit_factor'] - older_metrics['profit_factor']
         
         # Performance predictions for next 10 trades
-        predicted_win_rate = min(95, max(5, recent_metrics.win_rate + (win_rate_trend * 0.5)))
-        predicted_profit_factor = max(0.1, recent_metrics.profit_factor + (pf_trend * 0.3))
+        predicted_win_rate = min(95, max(5, recent_metrics['win_rate'] + (win_rate_trend * 0.5)))
+        predicted_profit_factor = max(0.1, recent_metrics['profit_factor'] + (pf_trend * 0.3))
         
         # Risk predictions
-        if recent_metrics.max_consecutive_losses > older_metrics.max_consecutive_losses:
+        if recent_metrics['max_consecutive_losses'] > older_metrics['max_consecutive_losses']:
             risk_level = "INCREASING"
-        elif recent_metrics.max_consecutive_losses < older_metrics.max_consecutive_losses:
+        elif recent_metrics['max_consecutive_losses'] < older_metrics['max_consecutive_losses']:
             risk_level = "DECREASING"
         else:
             risk_level = "STABLE"
         
         # Confidence in predictions based on data quality
-        data_quality = min(100, len(closed_trades) * 2)  # More trades = higher confidence
+        data_quality = min(100, closed_count * 2)  # More trades = higher confidence
         prediction_confidence = min(95, data_quality + (20 if abs(win_rate_trend) < 5 else 0))
         
         # Market regime analysis
-        recent_returns = [t.pnl_percent for t in recent_trades if t.pnl_percent]
-        if recent_returns:
-            volatility = statistics.stdev(recent_returns) if len(recent_returns) > 1 else 0
+        recent_returns = cols.closed('pnl_percent')[-10:]
+        recent_returns = recent_returns[recent_returns != 0]
+        if recent_returns.size:
+            volatility = float(recent_returns.std(ddof=1)) if recent_returns.size > 1 else 0
             if volatility > 5:
                 market_regime = "HIGH_VOLATILITY"
             elif volatility > 2:
@@ -682,29 +878,33 @@ Overall Rating: {rating}
         object.__setattr__(self, '_predictions', predictions)
         
         # Format output
-        output = []
-        output.append("🔮 PERFORMANCE PREDICTIONS")
-        output.append("=" * 50)
-        output.append(f"Prediction Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output.append(f"Prediction Confidence: {prediction_confidence:.1f}%")
-        output.append("")
-        
-        output.append("📊 NEXT 10 TRADES FORECAST")
-        output.append("-" * 30)
-        output.append(f"Predicted Win Rate: {predicted_win_rate:.1f}%")
-        output.append(f"Predicted Profit Factor: {predicted_profit_factor:.2f}")
-        output.append(f"Risk Level Trend: {risk_level}")
-        output.append(f"Market Regime: {market_regime}")
-        output.append("")
-        
-        output.append("📈 CURRENT TRENDS")
-        output.append("-" * 30)
+        output = [
+            "🔮 PERFORMANCE PREDICTIONS",
+            _SEP50,
+            f"Prediction Time: {_now_str()}",
+            f"Prediction Confidence: {prediction_confidence:.1f}%",
+            ""
+        ]
+        
+        output.extend([
+            "📊 NEXT 10 TRADES FORECAST",
+            _SEP30,
+            f"Predicted Win Rate: {predicted_win_rate:.1f}%",
+            f"Predicted Profit Factor: {predicted_profit_factor:.2f}",
+            f"Risk Level Trend: {risk_level}",
+            f"Market Regime: {market_regime}",
+            ""
+        ])
+        
+        output.extend(("📈 CURRENT TRENDS", _SEP30))
         trend_emoji = "📈" if win_rate_trend > 0 else "📉" if win_rate_trend < 0 else "➡️"
         output.append(f"Win Rate Trend: {trend_emoji} {win_rate_trend:+.1f}%")
         
         pf_emoji = "📈" if pf_trend > 0 else "📉" if pf_trend < 0 else "➡️"
-        output.append(f"Profit Factor Trend: {pf_emoji} {pf_trend:+.2f}")
-        output.append("")
+        output.extend([
+            f"Profit Factor Trend: {pf_emoji} {pf_trend:+.2f}",
+            ""
+        ])
         
         # Recommendations based on predictions
         recommendations = []
@@ -718,96 +918,95 @@ Overall Rating: {rating}
             recommendations.append("🌊 High volatility environment - Adjust strategies accordingly")
         
         if recommendations:
-            output.append("💡 PREDICTIVE RECOMMENDATIONS")
-            output.append("-" * 30)
-            for rec in recommendations:
-                output.append(f"• {rec}")
+            output.extend(("💡 PREDICTIVE RECOMMENDATIONS", _SEP30))
+            output.extend(f"• {rec}" for rec in recommendations)
         
         return "\n".join(output)
     
     def _analyze_confluence_effectiveness(self) -> str:
         """Detailed analysis of confluence factor effectiveness"""
-        closed_trades = [t for t in self.trades_database if t.status == 'CLOSED']
+        cols = self._trade_columns
+        total_closed = cols.closed_count
         
-        if len(closed_trades) < 10:
+        if total_closed < 10:
             return "Insufficient trade data for confluence analysis (minimum 10 trades required)"
         
-        # Group trades by confluence score ranges
-        score_ranges = {
-            'High (80-100%)': [t for t in closed_trades if t.confluence_score >= 80],
-            'Medium (60-79%)': [t for t in closed_trades if 60 <= t.confluence_score < 80],
-            'Low (40-59%)': [t for t in closed_trades if 40 <= t.confluence_score < 60],
-            'Very Low (<40%)': [t for t in closed_trades if t.confluence_score < 40]
-        }
+        scores = cols.closed('confluence_score')
+        pnl = np.nan_to_num(cols.closed('pnl'))  # Missing pnl counts as 0
+        is_win = pnl > 0
         
-        # Analyze signal effectiveness
-        wyckoff_trades = [t for t in closed_trades if t.wyckoff_signals]
-        smc_trades = [t for t in closed_trades if t.smc_signals]
-        pattern_trades = [t for t in closed_trades if t.patterns_detected]
+        # Group trades by confluence score ranges (NaN scores fall in no band)
+        in_band = ~np.isnan(scores)
+        band_codes = np.digitize(scores[in_band], _CONFLUENCE_BAND_EDGES)
+        band_counts = np.bincount(band_codes, minlength=4).tolist()
+        band_wins = np.bincount(band_codes, weights=is_win[in_band], minlength=4).tolist()
+        band_pnl = np.bincount(band_codes, weights=pnl[in_band], minlength=4).tolist()
         
         # Calculate success rates for each group
         range_analysis = {}
-        for range_name, trades in score_ranges.items():
-            if trades:
-                wins = len([t for t in trades if t.pnl and t.pnl > 0])
-                win_rate = (wins / len(trades)) * 100
-                avg_pnl = sum([t.pnl for t in trades if t.pnl]) / len(trades)
+        for range_name, code in _CONFLUENCE_BANDS:
+            count = band_counts[code]
+            if count:
                 range_analysis[range_name] = {
-                    'count': len(trades),
-                    'win_rate': win_rate,
-                    'avg_pnl': avg_pnl
+                    'count': count,
+                    'win_rate': (band_wins[code] / count) * 100,
+                    'avg_pnl': band_pnl[code] / count
                 }
         
         # Signal type analysis
+        sig_bits = cols.closed('sig_bits')
         signal_analysis = {}
-        for signal_type, trades in [
-            ('Wyckoff', wyckoff_trades),
-            ('SMC', smc_trades),
-            ('Patterns', pattern_trades)
+        for signal_type, bit in [
+            ('Wyckoff', WYCKOFF_BIT),
+            ('SMC', SMC_BIT),
+            ('Patterns', PATTERN_BIT)
         ]:
-            if trades:
-                wins = len([t for t in trades if t.pnl and t.pnl > 0])
-                win_rate = (wins / len(trades)) * 100
-                avg_pnl = sum([t.pnl for t in trades if t.pnl]) / len(trades)
+            mask = (sig_bits & bit).astype(bool)
+            count = int(np.count_nonzero(mask))
+            if count:
                 signal_analysis[signal_type] = {
-                    'count': len(trades),
-                    'win_rate': win_rate,
-                    'avg_pnl': avg_pnl
+                    'count': count,
+                    'win_rate': (np.count_nonzero(is_win & mask) / count) * 100,
+                    'avg_pnl': float(pnl[mask].sum()) / count
                 }
         
         # Format output
-        output = []
-        output.append("🎯 CONFLUENCE EFFECTIVENESS ANALYSIS")
-        output.append("=" * 50)
-        output.append(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output.append(f"Total Trades Analyzed: {len(closed_trades)}")
-        output.append("")
-        
-        output.append("📊 CONFLUENCE SCORE RANGES")
-        output.append("-" * 35)
+        output = [
+            "🎯 CONFLUENCE EFFECTIVENESS ANALYSIS",
+            _SEP50,
+            f"Analysis Date: {_now_str()}",
+            f"Total Trades Analyzed: {total_closed}",
+            ""
+        ]
+        
+        output.extend(("📊 CONFLUENCE SCORE RANGES", _SEP35))
         for range_name, analysis in range_analysis.items():
             if analysis['count'] > 0:
-                output.append(f"{range_name}:")
-                output.append(f"  Trades: {analysis['count']}")
-                output.append(f"  Win Rate: {analysis['win_rate']:.1f}%")
-                output.append(f"  Avg P&L: ${analysis['avg_pnl']:.2f}")
-                output.append("")
-        
-        output.append("🔍 SIGNAL TYPE EFFECTIVENESS")
-        output.append("-" * 35)
+                output.extend([
+                    f"{range_name}:",
+                    f"  Trades: {analysis['count']}",
+                    f"  Win Rate: {analysis['win_rate']:.1f}%",
+                    f"  Avg P&L: ${analysis['avg_pnl']:.2f}",
+                    ""
+                ])
+        
+        output.extend(("🔍 SIGNAL TYPE EFFECTIVENESS", _SEP35))
         for signal_type, analysis in signal_analysis.items():
             if analysis['count'] > 0:
-                output.append(f"{signal_type} Signals:")
-                output.append(f"  Trades: {analysis['count']}")
-                output.append(f"  Win Rate: {analysis['win_rate']:.1f}%")
-                output.append(f"  Avg P&L: ${analysis['avg_pnl']:.2f}")
-                output.append("")
+                output.extend([
+                    f"{signal_type} Signals:",
+                    f"  Trades: {analysis['count']}",
+                    f"  Win Rate: {analysis['win_rate']:.1f}%",
+                    f"  Avg P&L: ${analysis['avg_pnl']:.2f}",
+                    ""
+                ])
         
         # Recommendations for weight adjustments
         recommendations = []
-        if range_analysis.get('High (80-100%)', {}).get('win_rate', 0) > 70:
+        high_win_rate = range_analysis.get('High (80-100%)', {}).get('win_rate', 0)
+        if high_win_rate > 70:
             recommendations.append("✅ High confluence signals performing well - maintain current thresholds")
-        elif range_analysis.get('High (80-100%)', {}).get('win_rate', 0) < 60:
+        elif high_win_rate < 60:
             recommendations.append("⚠️ High confluence signals underperforming - review confluence calculation")
         
         best_signal = max(signal_analysis.items(), key=lambda x: x[1]['win_rate']) if signal_analysis else None
@@ -815,69 +1014,24 @@ Overall Rating: {rating}
             recommendations.append(f"📈 {best_signal[0]} signals performing best - consider increasing weight")
         
         if recommendations:
-            output.append("💡 OPTIMIZATION RECOMMENDATIONS")
-            output.append("-" * 35)
-            for rec in recommendations:
-                output.append(f"• {rec}")
+            output.extend(("💡 OPTIMIZATION RECOMMENDATIONS", _SEP35))
+            output.extend(f"• {rec}" for rec in recommendations)
         
         return "\n".join(output)
     
-    def _calculate_health_score(self, metrics: PerformanceMetrics) -> float:
+    def _calculate_health_score(self, metrics: Dict) -> float:
         """Calculate overall system health score"""
-        score = 0
-        
-        # Win rate (25 points)
-        if metrics.win_rate >= 70:
-            score += 25
-        elif metrics.win_rate >= 60:
-            score += 20
-        elif metrics.win_rate >= 50:
-            score += 15
-        elif metrics.win_rate >= 40:
-            score += 10
-        
-        # Profit factor (25 points)
-        if metrics.profit_factor >= 2.0:
-            score += 25
-        elif metrics.profit_factor >= 1.5:
-            score += 20
-        elif metrics.profit_factor >= 1.2:
-            score += 15
-        elif metrics.profit_factor >= 1.0:
-            score += 10
-        
-        # Drawdown (25 points)
-        if metrics.max_drawdown_percent <= 5:
-            score += 25
-        elif metrics.max_drawdown_percent <= 10:
-            score += 20
-        elif metrics.max_drawdown_percent <= 15:
-            score += 15
-        elif metrics.max_drawdown_percent <= 25:
-            score += 10
+        # Win rate, profit factor and drawdown (25 points each) via breakpoint lookups
+        score = (_WIN_RATE_SCORES[bisect_right(_WIN_RATE_EDGES, metrics['win_rate'])] +
+                 _PROFIT_FACTOR_SCORES[bisect_right(_PROFIT_FACTOR_EDGES, metrics['profit_factor'])] +
+                 _DRAWDOWN_SCORES[bisect_left(_DRAWDOWN_EDGES, metrics['max_drawdown_percent'])])
         
         # Risk metrics (25 points)
-        risk_score = 25
-        if metrics.max_consecutive_losses > 5:
-            risk_score -= 10
-        if metrics.sharpe_ratio < 0.5:
-            risk_score -= 10
-        if metrics.total_trades < 20:
-            risk_score -= 5
-        
-        score += max(0, risk_score)
+        risk_score = (25 - 10 * (metrics['max_consecutive_losses'] > 5)
+                      - 10 * (metrics['sharpe_ratio'] < 0.5)
+                      - 5 * (metrics['total_trades'] < 20))
         
-        return score
-    
-    def _default_alerts_config(self) -> Dict:
-        """Default alert configuration"""
-        return {
-            'max_drawdown': {'threshold': 15.0, 'enabled': True},
-            'consecutive_losses': {'threshold': 5, 'enabled': True},
-            'win_rate_drop': {'threshold': 40.0, 'enabled': True},
-            'profit_factor_drop': {'threshold': 1.2, 'enabled': True},
-            'daily_loss_limit': {'threshold': -500.0, 'enabled': True}
-        }
+        return score + max(0, risk_score)
     
     def _get_available_actions(self) -> str:
         """Get list of available actions"""
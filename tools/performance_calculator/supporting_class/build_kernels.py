@@ -0,0 +1,24 @@
+"""
+Ahead-of-time build of the equity-curve kernels into the perf_kernels extension module.
+
+Run once per environment (requires Numba and a C compiler):
+
+    python -m tools.performance_calculator.supporting_class.build_kernels
+
+performance_calculator imports the extension when present and otherwise JIT-compiles the same kernels.
+"""
+import os
+
+from numba.pycc import CC
+
+from tools.performance_calculator.supporting_class import equity_kernels
+
+cc = CC('perf_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('equity_curve', 'Tuple((i8, i8, f8, f8))(f8[:])')(equity_kernels.equity_curve)
+cc.export('max_consecutive', 'i8(f8[:], b1)')(equity_kernels.max_consecutive)
+
+
+if __name__ == '__main__':
+    cc.compile()
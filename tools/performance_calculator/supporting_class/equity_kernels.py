@@ -0,0 +1,56 @@
+"""
+Equity-curve kernels over a float64 pnl array.
+
+Written in the Numba-compatible subset of Python: performance_calculator JIT-compiles them,
+and build_kernels compiles them ahead of time into the perf_kernels extension.
+"""
+from typing import Tuple
+import numpy as np
+
+
+def max_consecutive(pnl: np.ndarray, winning: bool) -> int:
+    """Longest run of wins (pnl > 0) or losses (pnl <= 0)"""
+    # Branchless streak update: the counter is multiplied by 0 whenever the run breaks
+    matches = (pnl > 0) == winning
+    longest = 0
+    current = 0
+    for i in range(pnl.shape[0]):
+        current = (current + 1) * matches[i]
+        longest = max(longest, current)
+    return longest
+
+
+def equity_curve(pnl: np.ndarray) -> Tuple[int, int, float, float]:
+    """Max consecutive wins/losses and max drawdown (absolute, percent of peak) in one sweep of the pnl curve"""
+    max_wins = 0
+    max_losses = 0
+    current_wins = 0
+    current_losses = 0
+    cumulative_pnl = 0.0
+    peak_pnl = 0.0
+    max_dd_absolute = 0.0
+    max_dd_percent = 0.0
+    is_win = (pnl > 0).astype(np.int64)
+    for i in range(pnl.shape[0]):
+        value = pnl[i]
+        
+        # Win streaks count pnl > 0, loss streaks pnl <= 0; updated without branching on the sign
+        current_wins = (current_wins + 1) * is_win[i]
+        current_losses = (current_losses + 1) * (1 - is_win[i])
+        max_wins = max(max_wins, current_wins)
+        max_losses = max(max_losses, current_losses)
+        
+        # Drawdown from the running equity peak
+        cumulative_pnl += value
+        if cumulative_pnl > peak_pnl:
+            peak_pnl = cumulative_pnl
+        
+        drawdown = peak_pnl - cumulative_pnl
+        if drawdown > max_dd_absolute:
+            max_dd_absolute = drawdown
+        
+        if peak_pnl > 0:
+            dd_percent = (drawdown / peak_pnl) * 100
+            if dd_percent > max_dd_percent:
+                max_dd_percent = dd_percent
+    return max_wins, max_losses, max_dd_absolute, max_dd_percent
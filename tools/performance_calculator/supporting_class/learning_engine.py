@@ -1,9 +1,11 @@
-from typing import List, Dict, Any
+from collections import deque
+from typing import List, Dict, Any, Deque, Optional, Tuple
 from datetime import datetime
-import statistics
+import numpy as np
 
 from data_structures.pattern_performance import PatternPerformance
 from data_structures.trade_results import TradeResult
+from tools.performance_calculator.supporting_class.trade_columns import WYCKOFF_BIT, SMC_BIT, PATTERN_BIT, signal_bits
 
 # # Define PatternPerformance as a placeholder or import it from the correct module
 # class PatternPerformance:
@@ -20,6 +22,11 @@ from data_structures.trade_results import TradeResult
 #         self.smc_signals = smc_signals
 #         self.patterns_detected = patterns_detected
 
+# Confluence score bands: np.digitize code 0 = <70, 1 = 70-79, 2 = 80+; NaN or missing scores go to the unbanded row 3
+_SCORE_BAND_EDGES = np.array([70.0, 80.0])
+_UNBANDED = 3
+
+
 class LearningEngine:
     """Machine learning component for system optimization"""
     
@@ -31,27 +38,67 @@ class LearningEngine:
             'pattern_weight': 0.10
         }
         self.pattern_reliability_scores = {}
-        self.optimization_history = []
+        self.optimization_history: Deque[Dict[str, Any]] = deque(maxlen=256)  # Bounded; only the tail is read
+        
+        # Running trade counts and wins per (score band, signal bits) cell, fed by observe()
+        self._counts = np.zeros((4, 8), dtype=np.int64)
+        self._wins = np.zeros((4, 8), dtype=np.int64)
+    
+    def observe(self, trade: TradeResult) -> None:
+        """Fold a closed trade into the running effectiveness tables"""
+        score = trade.confluence_score
+        if score is None:
+            band = _UNBANDED  # Stored as NaN in TradeColumns
+        elif score >= 80:
+            band = 2
+        elif score >= 70:
+            band = 1
+        elif score < 70:
+            band = 0
+        else:
+            band = _UNBANDED  # NaN
+        
+        cell = (band, signal_bits(trade))
+        self._counts[cell] += 1
+        if trade.pnl and trade.pnl > 0:
+            self._wins[cell] += 1
+    
+    @staticmethod
+    def _build_tables(trades: List[TradeResult]) -> Tuple[np.ndarray, np.ndarray]:
+        """Count and win tables for an explicit list of trades"""
+        n = len(trades)
+        scores = np.fromiter((np.nan if t.confluence_score is None else t.confluence_score for t in trades),
+                             dtype=np.float64, count=n)
+        bands = np.digitize(scores, _SCORE_BAND_EDGES)
+        bands[np.isnan(scores)] = _UNBANDED
+        
+        cells = bands * 8 + np.fromiter(map(signal_bits, trades), dtype=np.intp, count=n)
+        is_win = np.fromiter(((t.pnl or 0) > 0 for t in trades), dtype=bool, count=n)
+        counts = np.bincount(cells, minlength=32).reshape(4, 8)
+        wins = np.bincount(cells[is_win], minlength=32).reshape(4, 8)
+        return counts, wins
     
-    def analyze_confluence_effectiveness(self, trades: List[TradeResult]) -> Dict[str, float]:
-        """Analyze which confluence factors are most effective"""
-        if len(trades) < 10:  # Need minimum trades for analysis
+    def analyze_confluence_effectiveness(self, trades: Optional[List[TradeResult]] = None) -> Dict[str, float]:
+        """Analyze which confluence factors are most effective
+        
+        Without trades, uses the running tables built by observe().
+        """
+        counts, wins = (self._counts, self._wins) if trades is None else self._build_tables(trades)
+        total_trades = int(counts.sum())
+        if total_trades < 10:  # Need minimum trades for analysis
             return self.confluence_weights
         
-        # Separate trades by confluence score ranges
-        high_conf_trades = [t for t in trades if t.confluence_score >= 80]
-        med_conf_trades = [t for t in trades if 70 <= t.confluence_score < 80]
-        low_conf_trades = [t for t in trades if t.confluence_score < 70]
-        
-        # Calculate success rates for each group
-        high_conf_success = self._calculate_success_rate(high_conf_trades)
-        med_conf_success = self._calculate_success_rate(med_conf_trades)
-        low_conf_success = self._calculate_success_rate(low_conf_trades)
+        # Success rates for each confluence score range
+        band_counts = counts.sum(axis=1).tolist()
+        band_wins = wins.sum(axis=1).tolist()
+        low_conf_success, med_conf_success, high_conf_success = (
+            self._calculate_success_rate(band_wins[band], band_counts[band]) for band in range(3)
+        )
         
         # Analyze signal type effectiveness
-        wyckoff_effectiveness = self._analyze_signal_effectiveness(trades, 'wyckoff_signals')
-        smc_effectiveness = self._analyze_signal_effectiveness(trades, 'smc_signals')
-        pattern_effectiveness = self._analyze_pattern_effectiveness(trades)
+        wyckoff_effectiveness = self._analyze_signal_effectiveness(counts, wins, WYCKOFF_BIT)
+        smc_effectiveness = self._analyze_signal_effectiveness(counts, wins, SMC_BIT)
+        pattern_effectiveness = self._analyze_signal_effectiveness(counts, wins, PATTERN_BIT)
         
         # Calculate new weights based on effectiveness
         total_effectiveness = (wyckoff_effectiveness + smc_effectiveness + 
@@ -77,37 +124,28 @@ class LearningEngine:
             'high_conf_success': high_conf_success,
             'med_conf_success': med_conf_success,
             'low_conf_success': low_conf_success,
-            'total_trades_analyzed': len(trades)
+            'total_trades_analyzed': total_trades
         })
         
         self.confluence_weights = new_weights
         return new_weights
     
-    def _calculate_success_rate(self, trades: List[TradeResult]) -> float:
+    @staticmethod
+    def _calculate_success_rate(successful_trades: int, total_trades: int) -> float:
         """Calculate success rate for a group of trades"""
-        if not trades:
+        if not total_trades:
             return 0
         
-        successful_trades = len([t for t in trades if t.pnl and t.pnl > 0])
-        return (successful_trades / len(trades)) * 100
+        return (successful_trades / total_trades) * 100
     
-    def _analyze_signal_effectiveness(self, trades: List[TradeResult], signal_field: str) -> float:
-        """Analyze effectiveness of specific signal types"""
-        signal_trades = [t for t in trades if getattr(t, signal_field)]
+    def _analyze_signal_effectiveness(self, counts: np.ndarray, wins: np.ndarray, signal_bit: int) -> float:
+        """Analyze effectiveness of one signal type from the cells whose bits include it"""
+        columns = [bits for bits in range(8) if bits & signal_bit]
+        signal_trades = int(counts[:, columns].sum())
         if not signal_trades:
             return 50  # Baseline score
         
-        success_rate = self._calculate_success_rate(signal_trades)
-        return success_rate
-    
-    def _analyze_pattern_effectiveness(self, trades: List[TradeResult]) -> float:
-        """Analyze effectiveness of pattern-based trades"""
-        pattern_trades = [t for t in trades if t.patterns_detected]
-        if not pattern_trades:
-            return 50  # Baseline score
-        
-        success_rate = self._calculate_success_rate(pattern_trades)
-        return success_rate
+        return self._calculate_success_rate(int(wins[:, columns].sum()), signal_trades)
     
     def update_pattern_reliability(self, pattern_performances: List[PatternPerformance]) -> None:
         """Update pattern reliability scores based on performance"""
@@ -128,16 +166,15 @@ class LearningEngine:
             'recommendations': []
         }
         
-        # Calculate weight changes
-        for key in latest['new_weights']:
-            old_val = latest['old_weights'][key]
-            new_val = latest['new_weights'][key]
-            change = ((new_val - old_val) / old_val) * 100 if old_val > 0 else 0
-            insights['weight_changes'][key] = {
-                'old': old_val,
-                'new': new_val,
-                'change_percent': change
-            }
+        # Calculate weight changes (old weights are aligned by key; their dict order can differ)
+        keys = list(latest['new_weights'])
+        old_vals = np.fromiter((latest['old_weights'][key] for key in keys), dtype=np.float64, count=len(keys))
+        new_vals = np.fromiter(latest['new_weights'].values(), dtype=np.float64, count=len(keys))
+        changes = np.where(old_vals > 0, (new_vals - old_vals) / np.where(old_vals > 0, old_vals, 1.0) * 100, 0.0)
+        insights['weight_changes'] = {
+            key: {'old': old_val, 'new': new_val, 'change_percent': change}
+            for key, old_val, new_val, change in zip(keys, old_vals.tolist(), new_vals.tolist(), changes.tolist())
+        }
         
         # Generate recommendations
         if latest['high_conf_success'] > 75:
@@ -148,9 +185,10 @@ class LearningEngine:
         
         # Analyze weight stability
         if len(self.optimization_history) > 3:
-            recent_optimizations = self.optimization_history[-3:]
-            wyckoff_weights = [opt['new_weights']['wyckoff_weight'] for opt in recent_optimizations]
-            wyckoff_stability = statistics.stdev(wyckoff_weights)
+            recent_optimizations = [self.optimization_history[i] for i in range(-3, 0)]
+            wyckoff_weights = np.fromiter((opt['new_weights']['wyckoff_weight'] for opt in recent_optimizations),
+                                          dtype=np.float64, count=len(recent_optimizations))
+            wyckoff_stability = float(wyckoff_weights.std(ddof=1))
             
             if wyckoff_stability < 0.05:
                 insights['recommendations'].append("Wyckoff weights stabilizing - good convergence")
@@ -1,17 +1,66 @@
-from collections import defaultdict
 import math
-import statistics
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from data_structures.performance_metrics import PerformanceMetrics
 from data_structures.trade_results import TradeResult
+from tools.performance_calculator.supporting_class import equity_kernels
+from tools.utilities.jit import njit
+
+# Annualisation constants for the risk-adjusted ratios (252 trading days, 2% annual risk-free rate)
+RF_DAILY = 0.02 / 252
+SQRT252 = math.sqrt(252)
+
+# Per-trade numeric record extracted for the vectorized metrics
+_TRADE_ROW_DTYPE = np.dtype([
+    ('pnl', np.float64), ('pnl_percent', np.float64), ('hold_time_hours', np.float64), ('risk_reward_ratio', np.float64)
+])
+
+
+try:
+    # Ahead-of-time compiled kernels, built with: python -m tools.performance_calculator.supporting_class.build_kernels
+    from tools.performance_calculator.supporting_class.perf_kernels import (
+        equity_curve as _equity_curve_kernel,
+        max_consecutive as _max_consecutive_kernel
+    )
+except ImportError:
+    # No prebuilt extension: JIT on first use (cached on disk), or plain Python without Numba
+    _equity_curve_kernel = njit(cache=True)(equity_kernels.equity_curve)
+    _max_consecutive_kernel = njit(cache=True)(equity_kernels.max_consecutive)
 
 
 class PerformanceCalculator:
     """Calculate various performance metrics"""
     
+    def __init__(self):
+        # (generation, metrics) of the last call that passed a trade-list generation
+        self._metrics_memo: Optional[Tuple[int, PerformanceMetrics]] = None
+    
+    def calculate_basic_metrics(self, trades: List[TradeResult],
+                                profit_factor_by_asset: Optional[Dict[str, float]] = None,
+                                generation: Optional[int] = None) -> PerformanceMetrics:
+        """Calculate basic performance metrics
+        
+        Callers that maintain running per-asset totals can pass profit_factor_by_asset to skip regrouping the trades.
+        Callers that own the trade list can pass a generation they bump on every change; the result is then reused
+        until a different generation is passed.
+        """
+        memo = self._metrics_memo
+        if generation is not None and memo is not None and memo[0] == generation:
+            return memo[1]
+        
+        metrics = PerformanceCalculator._compute_basic_metrics(trades, profit_factor_by_asset)
+        if generation is not None:
+            self._metrics_memo = (generation, metrics)
+        return metrics
+    
+    def invalidate_cache(self) -> None:
+        """Drop the memoized metrics"""
+        self._metrics_memo = None
+    
     @staticmethod
-    def calculate_basic_metrics(trades: List[TradeResult]) -> PerformanceMetrics:
-        """Calculate basic performance metrics"""
+    def _compute_basic_metrics(trades: List[TradeResult],
+                               profit_factor_by_asset: Optional[Dict[str, float]]) -> PerformanceMetrics:
+        """Uncached metrics calculation behind calculate_basic_metrics"""
         if not trades:
             return PerformanceMetrics(
                 total_trades=0, 
@@ -48,49 +97,49 @@ class PerformanceCalculator:
                 profit_factor_by_asset={}, performance_by_timeframe={}
             )
         
-        # Basic calculations
+        # Basic calculations on column arrays extracted once from the closed trades
+        pnl, pnl_percent, hold_time_hours, risk_reward = PerformanceCalculator._to_arrays(closed_trades)
+        win_mask = pnl > 0
+        loss_mask = pnl < 0
+        
         total_trades = len(closed_trades)
-        winning_trades = len([t for t in closed_trades if t.pnl is not None and t.pnl > 0])
-        losing_trades = len([t for t in closed_trades if t.pnl is not None and t.pnl < 0])
+        winning_trades = int(np.count_nonzero(win_mask))
+        losing_trades = int(np.count_nonzero(loss_mask))
         
         win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
         
-        total_pnl = sum([t.pnl for t in closed_trades if t.pnl is not None])
-        total_pnl_percent = sum([t.pnl_percent for t in closed_trades if t.pnl_percent])
+        total_pnl = float(pnl.sum())
+        total_pnl_percent = float(pnl_percent.sum())
         
-        wins = [t.pnl for t in closed_trades if t.pnl is not None and t.pnl > 0]
-        losses = [abs(t.pnl) for t in closed_trades if t.pnl is not None and t.pnl < 0]
+        # Gross totals via masked sums; losses are sign-flipped scalars rather than an abs() copy
+        gross_profit = float(np.sum(pnl, where=win_mask))
+        gross_loss = -float(np.sum(pnl, where=loss_mask))
         
-        avg_win = statistics.mean(wins) if wins else 0
-        avg_loss = statistics.mean(losses) if losses else 0
-        largest_win = max(wins) if wins else 0
-        largest_loss = max(losses) if losses else 0
+        avg_win = gross_profit / winning_trades if winning_trades else 0
+        avg_loss = gross_loss / losing_trades if losing_trades else 0
+        largest_win = float(pnl.max()) if winning_trades else 0
+        largest_loss = -float(pnl.min()) if losing_trades else 0
         
         # Profit factor
-        gross_profit = sum(wins)
-        gross_loss = sum(losses)
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
         
-        # Consecutive wins/losses
-        max_consecutive_wins = PerformanceCalculator._calculate_max_consecutive(closed_trades, True)
-        max_consecutive_losses = PerformanceCalculator._calculate_max_consecutive(closed_trades, False)
-        
-        # Drawdown
-        max_drawdown, max_drawdown_percent = PerformanceCalculator._calculate_drawdown(closed_trades)
+        # Consecutive wins/losses and drawdown share one sweep of the pnl curve
+        (max_consecutive_wins, max_consecutive_losses,
+         max_drawdown, max_drawdown_percent) = PerformanceCalculator._calculate_equity_curve_stats(pnl)
         
         # Risk-adjusted metrics
-        returns = [t.pnl_percent for t in closed_trades if t.pnl_percent]
+        returns = pnl_percent[pnl_percent != 0]
         sharpe_ratio = PerformanceCalculator._calculate_sharpe_ratio(returns)
         sortino_ratio = PerformanceCalculator._calculate_sortino_ratio(returns)
         calmar_ratio = (total_pnl_percent / max_drawdown_percent) if max_drawdown_percent > 0 else 0
         
         # Trade duration
-        durations = [t.hold_time_hours for t in closed_trades if t.hold_time_hours]
-        avg_trade_duration_hours = statistics.mean(durations) if durations else 0
+        durations = hold_time_hours[hold_time_hours != 0]
+        avg_trade_duration_hours = float(durations.mean()) if durations.size else 0
         
         # Risk-reward
-        risk_rewards = [t.risk_reward_ratio for t in closed_trades if t.risk_reward_ratio]
-        avg_risk_reward = statistics.mean(risk_rewards) if risk_rewards else 0
+        risk_rewards = risk_reward[risk_reward != 0]
+        avg_risk_reward = float(risk_rewards.mean()) if risk_rewards.size else 0
         
         # Expectancy
         expectancy = (win_rate/100 * avg_win) - ((100-win_rate)/100 * avg_loss)
@@ -99,10 +148,11 @@ class PerformanceCalculator:
         recovery_factor = total_pnl / max_drawdown if max_drawdown > 0 else 0
         
         # Performance by asset
-        profit_factor_by_asset = PerformanceCalculator._calculate_performance_by_asset(closed_trades)
+        if profit_factor_by_asset is None:
+            profit_factor_by_asset = PerformanceCalculator._calculate_performance_by_asset(closed_trades, pnl)
         
         # Performance by timeframe
-        performance_by_timeframe = PerformanceCalculator._calculate_performance_by_timeframe(closed_trades)
+        performance_by_timeframe = PerformanceCalculator._calculate_performance_by_timeframe(closed_trades, pnl)
         
         return PerformanceMetrics(
             total_trades=total_trades,
@@ -132,114 +182,188 @@ class PerformanceCalculator:
         )
     
     @staticmethod
-    def _calculate_max_consecutive(trades: List[TradeResult], winning: bool) -> int:
+    def _to_arrays(closed_trades: List[TradeResult]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Extract pnl, pnl_percent, hold_time_hours and risk_reward_ratio columns; missing optional values become 0"""
+        # One pass streams each trade straight into a typed record; no intermediate list of tuples
+        rows = np.fromiter(
+            ((t.pnl, t.pnl_percent or 0.0, t.hold_time_hours or 0.0, t.risk_reward_ratio or 0.0) for t in closed_trades),
+            dtype=_TRADE_ROW_DTYPE, count=len(closed_trades)
+        )
+        return rows['pnl'], rows['pnl_percent'], rows['hold_time_hours'], rows['risk_reward_ratio']
+    
+    @staticmethod
+    def calculate_trend_metrics(pnl: np.ndarray, split: int) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Calculate trend metrics for pnl[:split] and pnl[split:]; NaN entries (no pnl) are skipped"""
+        return (PerformanceCalculator._calculate_window_metrics(pnl[:split]),
+                PerformanceCalculator._calculate_window_metrics(pnl[split:]))
+    
+    @staticmethod
+    def _calculate_window_metrics(pnl: np.ndarray) -> Dict[str, float]:
+        """Win rate, profit factor and max consecutive losses for a window of the pnl array"""
+        pnl = pnl[~np.isnan(pnl)]
+        if not pnl.size:
+            return {'win_rate': 0, 'profit_factor': 0, 'max_consecutive_losses': 0}
+        
+        gross_profit = float(pnl[pnl > 0].sum())
+        gross_loss = float(-pnl[pnl < 0].sum())
+        
+        max_consecutive_losses = PerformanceCalculator._calculate_max_consecutive(pnl, False)
+        
+        return {
+            'win_rate': np.count_nonzero(pnl > 0) / pnl.size * 100,
+            'profit_factor': gross_profit / gross_loss if gross_loss > 0 else float('inf'),
+            'max_consecutive_losses': max_consecutive_losses
+        }
+    
+    @staticmethod
+    def _calculate_max_consecutive(pnl: np.ndarray, winning: bool) -> int:
         """Calculate maximum consecutive wins or losses"""
-        max_consecutive = 0
-        current_consecutive = 0
-        
-        for trade in trades:
-            if trade.pnl is not None and ((winning and trade.pnl > 0) or (not winning and trade.pnl <= 0)):
-                current_consecutive += 1
-                max_consecutive = max(max_consecutive, current_consecutive)
-            else:
-                current_consecutive = 0
-        
-        return max_consecutive
+        return int(_max_consecutive_kernel(np.ascontiguousarray(pnl, dtype=np.float64), winning))
     
     @staticmethod
-    def _calculate_drawdown(trades: List[TradeResult]) -> Tuple[float, float]:
-        """Calculate maximum drawdown in absolute and percentage terms"""
-        if not trades:
-            return 0, 0
-        
-        cumulative_pnl = 0
-        peak_pnl = 0
-        max_dd_absolute = 0
-        max_dd_percent = 0
-        
-        for trade in trades:
-            if trade.pnl is not None:
-                cumulative_pnl += trade.pnl
-                peak_pnl = max(peak_pnl, cumulative_pnl)
-                
-                drawdown = peak_pnl - cumulative_pnl
-                max_dd_absolute = max(max_dd_absolute, drawdown)
-                
-                if peak_pnl > 0:
-                    dd_percent = (drawdown / peak_pnl) * 100
-                    max_dd_percent = max(max_dd_percent, dd_percent)
-        
-        return max_dd_absolute, max_dd_percent
+    def _calculate_equity_curve_stats(pnl: np.ndarray) -> Tuple[int, int, float, float]:
+        """Calculate max consecutive wins, max consecutive losses and max drawdown (absolute, percent)"""
+        max_wins, max_losses, max_dd_absolute, max_dd_percent = _equity_curve_kernel(
+            np.ascontiguousarray(pnl, dtype=np.float64)
+        )
+        return int(max_wins), int(max_losses), float(max_dd_absolute), float(max_dd_percent)
     
     @staticmethod
-    def _calculate_sharpe_ratio(returns: List[float], risk_free_rate: float = 0.02) -> float:
+    def _calculate_sharpe_ratio(returns: np.ndarray) -> float:
         """Calculate Sharpe ratio"""
-        if not returns or len(returns) < 2:
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.size < 2:
             return 0
         
-        excess_returns = [r - risk_free_rate/252 for r in returns]  # Daily risk-free rate
-        mean_excess_return = statistics.mean(excess_returns)
-        std_excess_return = statistics.stdev(excess_returns)
+        excess_returns = returns - RF_DAILY
+        mean_excess_return = float(excess_returns.mean())
+        std_excess_return = float(excess_returns.std(ddof=1))
         
-        return (mean_excess_return / std_excess_return) * math.sqrt(252) if std_excess_return > 0 else 0
+        return (mean_excess_return / std_excess_return) * SQRT252 if std_excess_return > 0 else 0
     
     @staticmethod
-    def _calculate_sortino_ratio(returns: List[float], risk_free_rate: float = 0.02) -> float:
+    def _calculate_sortino_ratio(returns: np.ndarray) -> float:
         """Calculate Sortino ratio (only considers downside deviation)"""
-        if not returns or len(returns) < 2:
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.size < 2:
             return 0
         
-        excess_returns = [r - risk_free_rate/252 for r in returns]
-        mean_excess_return = statistics.mean(excess_returns)
+        excess_returns = returns - RF_DAILY
+        mean_excess_return = float(excess_returns.mean())
         
-        negative_returns = [r for r in excess_returns if r < 0]
-        if not negative_returns:
+        negative_returns = excess_returns[excess_returns < 0]
+        if not negative_returns.size:
             return float('inf') if mean_excess_return > 0 else 0
         
-        downside_deviation = math.sqrt(statistics.mean([r**2 for r in negative_returns]))
+        downside_deviation = float(np.sqrt((negative_returns * negative_returns).mean()))
         
-        return (mean_excess_return / downside_deviation) * math.sqrt(252) if downside_deviation > 0 else 0
+        return (mean_excess_return / downside_deviation) * SQRT252 if downside_deviation > 0 else 0
     
     @staticmethod
-    def _calculate_performance_by_asset(trades: List[TradeResult]) -> Dict[str, float]:
+    def _factorize(keys, count: int = -1) -> Tuple[np.ndarray, List]:
+        """Map keys to dense integer codes in first-seen order"""
+        index = {}
+        codes = np.fromiter((index.setdefault(key, len(index)) for key in keys), dtype=np.intp, count=count)
+        return codes, list(index)
+    
+    @staticmethod
+    def _calculate_performance_by_asset(trades: List[TradeResult], pnl: np.ndarray) -> Dict[str, float]:
         """Calculate profit factor by asset"""
-        asset_performance = defaultdict(lambda: {'wins': 0.0, 'losses': 0.0})
-        
-        for trade in trades:
-            if trade.pnl is not None and trade.pnl > 0:
-                asset_performance[trade.symbol]['wins'] += trade.pnl
-            elif trade.pnl is not None:
-                asset_performance[trade.symbol]['losses'] += abs(trade.pnl)
+        codes, assets = PerformanceCalculator._factorize((t.symbol for t in trades), len(trades))
+        gross_wins = np.bincount(codes, weights=np.where(pnl > 0, pnl, 0.0), minlength=len(assets))
+        gross_losses = np.bincount(codes, weights=np.where(pnl > 0, 0.0, -pnl), minlength=len(assets))
         
+        return PerformanceCalculator.profit_factors_from_totals(
+            dict(zip(assets, zip(gross_wins.tolist(), gross_losses.tolist())))
+        )
+    
+    @staticmethod
+    def accumulate_asset_totals(asset_totals: Dict[str, List[float]], trade: TradeResult) -> None:
+        """Add a closed trade's pnl to running [gross_win, gross_loss] totals keyed by symbol"""
+        totals = asset_totals.setdefault(trade.symbol, [0.0, 0.0])
+        if trade.pnl > 0:
+            totals[0] += trade.pnl
+        else:
+            totals[1] -= trade.pnl
+    
+    @staticmethod
+    def profit_factors_from_totals(asset_totals: Dict[str, List[float]]) -> Dict[str, float]:
+        """Convert [gross_win, gross_loss] totals into per-asset profit factors"""
         profit_factors = {}
-        for asset, perf in asset_performance.items():
-            if perf['losses'] > 0:
-                profit_factors[asset] = perf['wins'] / perf['losses']
+        for asset, (wins, losses) in asset_totals.items():
+            if losses > 0:
+                profit_factors[asset] = wins / losses
             else:
-                profit_factors[asset] = float('inf') if perf['wins'] > 0 else 0
+                profit_factors[asset] = float('inf') if wins > 0 else 0
         
         return profit_factors
     
     @staticmethod
-    def _calculate_performance_by_timeframe(trades: List[TradeResult]) -> Dict[str, Dict]:
-        """Calculate performance metrics by timeframe"""
-        tf_performance = defaultdict(list)
+    def new_running_metrics() -> Dict[str, float]:
+        """Empty running aggregates for accumulate_running_metrics"""
+        return {
+            'closed': 0, 'wins': 0, 'gross_profit': 0.0, 'gross_loss': 0.0, 'total_pnl': 0.0,
+            'cumulative_pnl': 0.0, 'peak_pnl': 0.0, 'max_drawdown_percent': 0.0,
+            'consecutive_losses': 0, 'max_consecutive_losses': 0,
+            'returns_count': 0, 'returns_mean': 0.0, 'returns_m2': 0.0
+        }
+    
+    @staticmethod
+    def accumulate_running_metrics(running: Dict[str, float], trade: TradeResult) -> None:
+        """Fold a closed trade's pnl into running aggregates, in the same order calculate_basic_metrics scans"""
+        pnl = trade.pnl
+        running['closed'] += 1
+        running['total_pnl'] += pnl
+        if pnl > 0:
+            running['wins'] += 1
+            running['gross_profit'] += pnl
+            running['consecutive_losses'] = 0
+        else:
+            if pnl < 0:
+                running['gross_loss'] -= pnl
+            running['consecutive_losses'] += 1
+            running['max_consecutive_losses'] = max(running['max_consecutive_losses'], running['consecutive_losses'])
+        
+        # Drawdown from the running equity peak
+        running['cumulative_pnl'] += pnl
+        running['peak_pnl'] = max(running['peak_pnl'], running['cumulative_pnl'])
+        if running['peak_pnl'] > 0:
+            dd_percent = (running['peak_pnl'] - running['cumulative_pnl']) / running['peak_pnl'] * 100
+            running['max_drawdown_percent'] = max(running['max_drawdown_percent'], dd_percent)
+        
+        # Welford mean/variance of the non-zero percentage returns used by the Sharpe ratio
+        if trade.pnl_percent:
+            running['returns_count'] += 1
+            delta = trade.pnl_percent - running['returns_mean']
+            running['returns_mean'] += delta / running['returns_count']
+            running['returns_m2'] += delta * (trade.pnl_percent - running['returns_mean'])
+    
+    @staticmethod
+    def sharpe_from_running(running: Dict[str, float]) -> float:
+        """Sharpe ratio from the running return moments; matches _calculate_sharpe_ratio"""
+        if running['returns_count'] < 2:
+            return 0
+        
+        std_return = math.sqrt(running['returns_m2'] / (running['returns_count'] - 1))
+        mean_excess_return = running['returns_mean'] - RF_DAILY
         
-        for trade in trades:
-            tf_performance[trade.timeframe].append(trade)
+        return (mean_excess_return / std_return) * SQRT252 if std_return > 0 else 0
+    
+    @staticmethod
+    def _calculate_performance_by_timeframe(trades: List[TradeResult], pnl: np.ndarray) -> Dict[str, Dict]:
+        """Calculate performance metrics by timeframe"""
+        codes, timeframes = PerformanceCalculator._factorize((t.timeframe for t in trades), len(trades))
+        counts = np.bincount(codes, minlength=len(timeframes))
+        win_counts = np.bincount(codes, weights=(pnl > 0), minlength=len(timeframes))
+        total_pnls = np.bincount(codes, weights=pnl, minlength=len(timeframes))
         
         result = {}
-        for tf, tf_trades in tf_performance.items():
-            if tf_trades:
-                wins = [t for t in tf_trades if t.pnl > 0]
-                total_pnl = sum([t.pnl for t in tf_trades])
-                win_rate = (len(wins) / len(tf_trades)) * 100
-                
-                result[tf] = {
-                    'total_trades': len(tf_trades),
-                    'win_rate': win_rate,
-                    'total_pnl': total_pnl,
-                    'avg_pnl': total_pnl / len(tf_trades)
-                }
+        for tf, count, win_count, total_pnl in zip(timeframes, counts.tolist(), win_counts.tolist(), total_pnls.tolist()):
+            result[tf] = {
+                'total_trades': count,
+                'win_rate': (win_count / count) * 100,
+                'total_pnl': total_pnl,
+                'avg_pnl': total_pnl / count
+            }
         
         return result
\ No newline at end of file
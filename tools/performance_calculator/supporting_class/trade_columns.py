@@ -0,0 +1,72 @@
+from typing import Dict
+import numpy as np
+
+from data_structures.trade_results import TradeResult
+
+# Signal-type bits packed into the sig_bits column
+WYCKOFF_BIT = 1
+SMC_BIT = 2
+PATTERN_BIT = 4
+
+
+def signal_bits(trade: TradeResult) -> int:
+    """OR of the signal-type bits a trade carried"""
+    return ((WYCKOFF_BIT if trade.wyckoff_signals else 0) |
+            (SMC_BIT if trade.smc_signals else 0) |
+            (PATTERN_BIT if trade.patterns_detected else 0))
+
+
+class TradeColumns:
+    """Column-oriented mirror of the trade database: one growable NumPy array per analysed field"""
+
+    # Missing pnl is NaN; missing pnl_percent, hold time and risk/reward are 0 (excluded like falsy values)
+    FIELDS = {
+        'pnl': np.float64,
+        'pnl_percent': np.float64,
+        'confluence_score': np.float64,
+        'hold_time_hours': np.float64,
+        'risk_reward_ratio': np.float64,
+        'exit_day': np.int64,  # date ordinal of exit_time, 0 when open
+        'is_closed': np.bool_,
+        'sig_bits': np.uint8  # WYCKOFF_BIT | SMC_BIT | PATTERN_BIT
+    }
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._closed_count = 0
+        self._data: Dict[str, np.ndarray] = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.FIELDS.items()}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def closed_count(self) -> int:
+        return self._closed_count
+
+    def append(self, trade: TradeResult) -> None:
+        """Add one trade's fields as a new row, doubling capacity when full"""
+        i = self._size
+        if i == len(self._data['pnl']):
+            self._data = {name: np.concatenate([column, np.zeros_like(column)]) for name, column in self._data.items()}
+
+        data = self._data
+        data['pnl'][i] = np.nan if trade.pnl is None else trade.pnl
+        data['pnl_percent'][i] = trade.pnl_percent or 0.0
+        data['confluence_score'][i] = trade.confluence_score
+        data['hold_time_hours'][i] = trade.hold_time_hours or 0.0
+        data['risk_reward_ratio'][i] = trade.risk_reward_ratio or 0.0
+        data['exit_day'][i] = trade.exit_time.toordinal() if trade.exit_time else 0
+        data['is_closed'][i] = trade.status == 'CLOSED'
+        data['sig_bits'][i] = signal_bits(trade)
+
+        self._size = i + 1
+        if trade.status == 'CLOSED':
+            self._closed_count += 1
+
+    def column(self, name: str) -> np.ndarray:
+        """View of one column over all trades"""
+        return self._data[name][:self._size]
+
+    def closed(self, name: str) -> np.ndarray:
+        """Copy of one column restricted to closed trades, in insertion order"""
+        return self.column(name)[self.column('is_closed')]
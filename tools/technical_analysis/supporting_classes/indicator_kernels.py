@@ -0,0 +1,205 @@
+"""
+Recurrence kernels for the technical indicators over float64 arrays.
+
+Written in the Numba-compatible subset of Python; technical_indicator JIT-compiles them.
+The factories close over their periods so each compiled kernel is specialized for them.
+"""
+import numpy as np
+
+
+def ema_kernel(period: int):
+    """EMA kernel specialized for one period: period, alpha and 1 - alpha are compile-time constants"""
+    alpha = 2.0 / (period + 1)
+    decay = 1.0 - alpha
+    
+    def ema_fill(values: np.ndarray, out: np.ndarray) -> None:
+        """Write the EMA of values into out: NaN warm-up, SMA seed at period-1, then the alpha recurrence"""
+        total = 0.0
+        for i in range(period - 1):
+            out[i] = np.nan
+            total += values[i]
+        prev = (total + values[period - 1]) / period
+        out[period - 1] = prev
+        for i in range(period, values.shape[0]):
+            prev = alpha * values[i] + decay * prev
+            out[i] = prev
+    
+    return ema_fill
+
+
+def rsi_kernel(period: int):
+    """RSI kernel specialized for one period: the seed window and Wilder weights are compile-time constants"""
+    
+    def rsi_fill(values: np.ndarray, out: np.ndarray) -> None:
+        """Write Wilder's RSI of values into out; the first period entries are NaN"""
+        gain_total = 0.0
+        loss_total = 0.0
+        out[0] = np.nan
+        for i in range(1, period + 1):
+            out[i] = np.nan
+            change = values[i] - values[i - 1]
+            gain_total += change if change > 0 else 0.0
+            loss_total += -change if change < 0 else 0.0
+        avg_gain = gain_total / period
+        avg_loss = loss_total / period
+        
+        for i in range(period, values.shape[0]):
+            if i > period:
+                change = values[i] - values[i - 1]
+                avg_gain = (avg_gain * (period - 1) + (change if change > 0 else 0.0)) / period
+                avg_loss = (avg_loss * (period - 1) + (-change if change < 0 else 0.0)) / period
+            out[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    return rsi_fill
+
+
+def macd_kernel(fast: int, slow: int, signal: int):
+    """Fused MACD kernel specialized for one (fast, slow, signal) triple"""
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_signal = 2.0 / (signal + 1)
+    
+    def macd_fill(values: np.ndarray, out_macd: np.ndarray, out_signal: np.ndarray, out_hist: np.ndarray) -> None:
+        """Write the MACD line, signal line and histogram in one sweep, keeping the three EMAs as scalars"""
+        ema_fast = 0.0
+        ema_slow = 0.0
+        ema_signal = 0.0
+        for i in range(values.shape[0]):
+            value = values[i]
+            
+            # Each EMA sums its warm-up window, seeds with the SMA at period-1, then recurs
+            if i < fast - 1:
+                ema_fast += value
+            elif i == fast - 1:
+                ema_fast = (ema_fast + value) / fast
+            else:
+                ema_fast = alpha_fast * value + (1.0 - alpha_fast) * ema_fast
+            if i < slow - 1:
+                ema_slow += value
+            elif i == slow - 1:
+                ema_slow = (ema_slow + value) / slow
+            else:
+                ema_slow = alpha_slow * value + (1.0 - alpha_slow) * ema_slow
+            
+            macd = ema_fast - ema_slow if i >= fast - 1 and i >= slow - 1 else np.nan
+            
+            # The signal EMA runs over the MACD line, NaN warm-up included
+            if i < signal - 1:
+                ema_signal += macd
+            elif i == signal - 1:
+                ema_signal = (ema_signal + macd) / signal
+            else:
+                ema_signal = alpha_signal * macd + (1.0 - alpha_signal) * ema_signal
+            
+            sig = ema_signal if i >= signal - 1 else np.nan
+            out_macd[i] = macd
+            out_signal[i] = sig
+            out_hist[i] = macd - sig
+    
+    return macd_fill
+
+
+def snapshot_kernel(rsi_period: int, fast: int, slow: int, signal: int, bb_period: int):
+    """Kernel computing only the latest RSI, MACD and Bollinger values, specialized for one set of periods"""
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_signal = 2.0 / (signal + 1)
+    
+    def snapshot_fill(values: np.ndarray, std_dev: float, out: np.ndarray) -> None:
+        """Write [rsi, macd, signal, histogram, upper, middle, lower] for the last value into out in one sweep"""
+        n = values.shape[0]
+        out[:] = np.nan
+        
+        # RSI: plain-average seed over the first rsi_period changes, then Wilder smoothing
+        if n >= rsi_period + 1:
+            gain_total = 0.0
+            loss_total = 0.0
+            for i in range(1, rsi_period + 1):
+                change = values[i] - values[i - 1]
+                gain_total += change if change > 0 else 0.0
+                loss_total += -change if change < 0 else 0.0
+            avg_gain = gain_total / rsi_period
+            avg_loss = loss_total / rsi_period
+            for i in range(rsi_period + 1, n):
+                change = values[i] - values[i - 1]
+                avg_gain = (avg_gain * (rsi_period - 1) + (change if change > 0 else 0.0)) / rsi_period
+                avg_loss = (avg_loss * (rsi_period - 1) + (-change if change < 0 else 0.0)) / rsi_period
+            out[0] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        
+        # MACD: the same three scalar EMAs as the fused MACD kernel, keeping only the final step
+        ema_fast = 0.0
+        ema_slow = 0.0
+        ema_signal = 0.0
+        for i in range(n):
+            value = values[i]
+            if i < fast - 1:
+                ema_fast += value
+            elif i == fast - 1:
+                ema_fast = (ema_fast + value) / fast
+            else:
+                ema_fast = alpha_fast * value + (1.0 - alpha_fast) * ema_fast
+            if i < slow - 1:
+                ema_slow += value
+            elif i == slow - 1:
+                ema_slow = (ema_slow + value) / slow
+            else:
+                ema_slow = alpha_slow * value + (1.0 - alpha_slow) * ema_slow
+            
+            macd = ema_fast - ema_slow if i >= fast - 1 and i >= slow - 1 else np.nan
+            if i < signal - 1:
+                ema_signal += macd
+            elif i == signal - 1:
+                ema_signal = (ema_signal + macd) / signal
+            else:
+                ema_signal = alpha_signal * macd + (1.0 - alpha_signal) * ema_signal
+            
+            if i == n - 1:
+                sig = ema_signal if i >= signal - 1 else np.nan
+                out[1] = macd
+                out[2] = sig
+                out[3] = macd - sig
+        
+        # Bollinger: two-pass mean and population variance of the last window only
+        if n >= bb_period:
+            total = 0.0
+            for i in range(n - bb_period, n):
+                total += values[i]
+            middle = total / bb_period
+            squares = 0.0
+            for i in range(n - bb_period, n):
+                squares += (values[i] - middle) * (values[i] - middle)
+            std = np.sqrt(squares / bb_period)
+            out[4] = middle + std_dev * std
+            out[5] = middle
+            out[6] = middle - std_dev * std
+    
+    return snapshot_fill
+
+
+def rolling_max_min(highs: np.ndarray, lows: np.ndarray, period: int, out_max: np.ndarray, out_min: np.ndarray) -> None:
+    """Write the trailing-window max of highs and min of lows, from index period-1 on, using monotonic index queues"""
+    n = highs.shape[0]
+    max_queue = np.empty(n, dtype=np.int64)
+    min_queue = np.empty(n, dtype=np.int64)
+    max_head = 0
+    max_tail = 0
+    min_head = 0
+    min_tail = 0
+    for i in range(n):
+        # Each index enters and leaves each queue at most once
+        while max_tail > max_head and highs[max_queue[max_tail - 1]] <= highs[i]:
+            max_tail -= 1
+        max_queue[max_tail] = i
+        max_tail += 1
+        while min_tail > min_head and lows[min_queue[min_tail - 1]] >= lows[i]:
+            min_tail -= 1
+        min_queue[min_tail] = i
+        min_tail += 1
+        
+        if max_queue[max_head] <= i - period:
+            max_head += 1
+        if min_queue[min_head] <= i - period:
+            min_head += 1
+        if i >= period - 1:
+            out_max[i] = highs[max_queue[max_head]]
+            out_min[i] = lows[min_queue[min_head]]
@@ -0,0 +1,181 @@
+"""
+Streaming counterparts of TechnicalIndicators.
+
+Each state object consumes one bar per update() call and returns the latest indicator value
+in O(1) amortized time, matching the last element of the batch calculation over the same bars.
+"""
+from collections import deque
+import math
+from typing import Deque, Dict, Iterable, Tuple
+
+
+class SMAState:
+    """Simple Moving Average over a running window sum"""
+    
+    def __init__(self, period: int):
+        self.period = period
+        self._window: Deque[float] = deque(maxlen=period)
+        self._sum = 0.0
+    
+    def update(self, value: float) -> float:
+        if len(self._window) == self.period:
+            self._sum -= self._window[0]
+        self._window.append(value)
+        self._sum += value
+        return self._sum / self.period if len(self._window) == self.period else math.nan
+
+
+class EMAState:
+    """Exponential Moving Average seeded with the SMA of the first period values"""
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self._count = 0
+        self._value = 0.0
+    
+    def update(self, value: float) -> float:
+        self._count += 1
+        if self._count < self.period:
+            self._value += value
+            return math.nan
+        if self._count == self.period:
+            self._value = (self._value + value) / self.period
+        else:
+            self._value = self.alpha * value + (1 - self.alpha) * self._value
+        return self._value
+
+
+class RSIState:
+    """Relative Strength Index holding Wilder's smoothed average gain and loss"""
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._previous = math.nan
+        self._changes = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+    
+    def update(self, value: float) -> float:
+        previous, self._previous = self._previous, value
+        if math.isnan(previous):
+            return math.nan
+        
+        change = value - previous
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        self._changes += 1
+        if self._changes <= self.period:
+            # Seed with the plain average of the first period changes
+            self._avg_gain += gain / self.period
+            self._avg_loss += loss / self.period
+            if self._changes < self.period:
+                return math.nan
+        else:
+            self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+        
+        if self._avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + self._avg_gain / self._avg_loss))
+
+
+class BBandsState:
+    """Bollinger Bands from running sums of the window values and their squares"""
+    
+    def __init__(self, period: int = 20, std_dev: float = 2.0, ddof: int = 0):
+        self.period = period
+        self.std_dev = std_dev
+        self.ddof = ddof
+        self._window: Deque[float] = deque(maxlen=period)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+    
+    def update(self, value: float) -> Dict[str, float]:
+        if len(self._window) == self.period:
+            oldest = self._window[0]
+            self._sum -= oldest
+            self._sum_sq -= oldest * oldest
+        self._window.append(value)
+        self._sum += value
+        self._sum_sq += value * value
+        if len(self._window) < self.period:
+            return {'upper': math.nan, 'middle': math.nan, 'lower': math.nan}
+        
+        middle = self._sum / self.period
+        variance = (self._sum_sq - self._sum * middle) / (self.period - self.ddof)
+        std = math.sqrt(max(variance, 0.0))
+        return {'upper': middle + self.std_dev * std, 'middle': middle, 'lower': middle - self.std_dev * std}
+
+
+class StochState:
+    """Stochastic Oscillator with monotonic deques for the rolling high and low"""
+    
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        self.k_period = k_period
+        self._index = 0
+        self._highs: Deque[Tuple[int, float]] = deque()
+        self._lows: Deque[Tuple[int, float]] = deque()
+        self._d = SMAState(d_period)
+    
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        i = self._index
+        self._index += 1
+        
+        # Each bar enters and leaves each deque at most once
+        while self._highs and self._highs[-1][1] <= high:
+            self._highs.pop()
+        self._highs.append((i, high))
+        while self._lows and self._lows[-1][1] >= low:
+            self._lows.pop()
+        self._lows.append((i, low))
+        if self._highs[0][0] <= i - self.k_period:
+            self._highs.popleft()
+        if self._lows[0][0] <= i - self.k_period:
+            self._lows.popleft()
+        
+        if i < self.k_period - 1:
+            return {'k': math.nan, 'd': math.nan}
+        
+        window_high = self._highs[0][1]
+        window_low = self._lows[0][1]
+        k = 50.0 if window_high == window_low else ((close - window_low) / (window_high - window_low)) * 100
+        
+        # %D averages only complete %K values, so it stays NaN for the first d_period - 1 of them
+        return {'k': k, 'd': self._d.update(k)}
+
+
+class MACDState:
+    """MACD from fast and slow EMA states, with the signal EMA fed the MACD line including its NaN warm-up"""
+    
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = EMAState(fast)
+        self._slow = EMAState(slow)
+        self._signal = EMAState(signal)
+    
+    def update(self, value: float) -> Dict[str, float]:
+        macd = self._fast.update(value) - self._slow.update(value)
+        signal = self._signal.update(macd)
+        return {'macd': macd, 'signal': signal, 'histogram': macd - signal}
+
+
+class IndicatorState:
+    """RSI, MACD and Bollinger Bands state for one symbol and timeframe, advanced only by newly arrived closes"""
+    
+    def __init__(self):
+        self.count = 0
+        self._rsi = RSIState(14)
+        self._macd = MACDState(12, 26, 9)
+        self._bbands = BBandsState(20, 2.0)
+        self._latest: Dict[str, float] = {}
+    
+    def extend(self, closes: Iterable[float]) -> Dict[str, float]:
+        """Ingest closes in order and return the latest value of every indicator"""
+        rsi, macd, bbands = self._rsi, self._macd, self._bbands
+        latest = self._latest
+        for value in closes:
+            latest['rsi'] = rsi.update(value)
+            latest.update(macd.update(value))
+            latest.update(bbands.update(value))
+            self.count += 1
+        return dict(latest)
@@ -1,102 +1,104 @@
-from typing import Dict, List
+from functools import lru_cache
+from typing import Callable, Dict, List
 import numpy as np
+from tools.technical_analysis.supporting_classes import indicator_kernels
+from tools.utilities.jit import njit
+
+# JIT-compiled on first use (cached on disk), or plain Python without Numba
+_rolling_max_min_kernel = njit(cache=True)(indicator_kernels.rolling_max_min)
+
+
+@lru_cache(maxsize=32)
+def _ema_kernel(period: int) -> Callable:
+    """Compiled EMA kernel for one period; call sites use a handful of fixed periods (12, 26, 9, 20)"""
+    return njit(cache=True)(indicator_kernels.ema_kernel(period))
+
+
+@lru_cache(maxsize=32)
+def _macd_kernel(fast: int, slow: int, signal: int) -> Callable:
+    """Compiled fused MACD kernel for one (fast, slow, signal) triple"""
+    return njit(cache=True)(indicator_kernels.macd_kernel(fast, slow, signal))
+
+
+@lru_cache(maxsize=32)
+def _snapshot_kernel(rsi_period: int, fast: int, slow: int, signal: int, bb_period: int) -> Callable:
+    """Compiled latest-values kernel for one set of periods"""
+    return njit(cache=True)(indicator_kernels.snapshot_kernel(rsi_period, fast, slow, signal, bb_period))
+
+
+@lru_cache(maxsize=32)
+def _rsi_kernel(period: int) -> Callable:
+    """Compiled RSI kernel for one period"""
+    return njit(cache=True)(indicator_kernels.rsi_kernel(period))
+
+
+def _scan_values(data: List[float]) -> np.ndarray:
+    """Input of the recurrence kernels: float32 arrays pass through untouched, anything else becomes float64"""
+    if isinstance(data, np.ndarray) and data.dtype == np.float32:
+        return data
+    return np.asarray(data, dtype=np.float64)
+
 
 class TechnicalIndicators:
     """Core technical indicators calculations"""
     
     @staticmethod
-    def sma(data: List[float], period: int) -> List[float]:
+    def sma(data: List[float], period: int) -> np.ndarray:
         """Simple Moving Average"""
-        if len(data) < period:
-            return [np.nan] * len(data)
-        
-        result = []
-        for i in range(len(data)):
-            if i < period - 1:
-                result.append(np.nan)
-            else:
-                result.append(np.mean(data[i-period+1:i+1]))
+        values = np.asarray(data, dtype=np.float64)
+        result = np.full(len(values), np.nan)
+        if len(values) < period:
+            return result
+        
+        # Window sums as differences of a running sum: O(1) per output instead of O(period)
+        missing = np.isnan(values)
+        window_sums = TechnicalIndicators._window_sums(np.where(missing, 0.0, values), period)
+        result[period-1:] = window_sums / period
+        if missing.any():
+            # A window containing NaN averages to NaN, as np.mean would
+            result[period-1:][TechnicalIndicators._window_sums(missing, period) > 0] = np.nan
         return result
     
     @staticmethod
-    def ema(data: List[float], period: int) -> List[float]:
+    def _window_sums(values: np.ndarray, period: int) -> np.ndarray:
+        """Sum of each full trailing window of length period"""
+        csum = np.cumsum(values)
+        window_sums = csum[period-1:].copy()
+        window_sums[1:] -= csum[:-period]
+        return window_sums
+    
+    @staticmethod
+    def ema(data: List[float], period: int) -> np.ndarray:
         """Exponential Moving Average"""
-        if len(data) < period:
-            return [np.nan] * len(data)
-        
-        alpha = 2.0 / (period + 1)
-        result = []
-        
-        # First value is SMA
-        first_sma = np.mean(data[:period])
-        result.extend([np.nan] * (period - 1))
-        result.append(first_sma)
-        
-        # Calculate EMA for remaining values
-        for i in range(period, len(data)):
-            ema_val = alpha * data[i] + (1 - alpha) * result[-1]
-            result.append(ema_val)
+        values = _scan_values(data)
+        if len(values) < period:
+            return np.full(len(values), np.nan)
         
+        # First value is the SMA of the first period, then the recurrence runs in the kernel
+        result = np.empty(len(values))
+        _ema_kernel(period)(values, result)
         return result
     
     @staticmethod
-    def rsi(data: List[float], period: int = 14) -> List[float]:
+    def rsi(data: List[float], period: int = 14) -> np.ndarray:
         """Relative Strength Index"""
-        if len(data) < period + 1:
-            return [np.nan] * len(data)
-        
-        changes = [data[i] - data[i-1] for i in range(1, len(data))]
-        gains = [max(0, change) for change in changes]
-        losses = [max(0, -change) for change in changes]
-        
-        avg_gain = np.mean(gains[:period])
-        avg_loss = np.mean(losses[:period])
-        
-        result = [np.nan] * (period + 1)
-        
-        if avg_loss == 0:
-            result.append(100)
-        else:
-            rs = avg_gain / avg_loss
-            result.append(float(100 - (100 / (1 + rs))))
-        
-        # Calculate RSI for remaining values
-        for i in range(period + 1, len(data)):
-            gain = max(0, data[i] - data[i-1])
-            loss = max(0, data[i-1] - data[i])
-            
-            avg_gain = (avg_gain * (period - 1) + gain) / period
-            avg_loss = (avg_loss * (period - 1) + loss) / period
-            
-            if avg_loss == 0:
-                result.append(100)
-            else:
-                rs = avg_gain / avg_loss
-                result.append(float(100 - (100 / (1 + rs))))
+        values = _scan_values(data)
+        if len(values) < period + 1:
+            return np.full(len(values), np.nan)
         
+        result = np.empty(len(values))
+        _rsi_kernel(period)(values, result)
         return result
     
     @staticmethod
-    def macd(data: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, List[float]]:
+    def macd(data: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
         """MACD (Moving Average Convergence Divergence)"""
-        ema_fast = TechnicalIndicators.ema(data, fast)
-        ema_slow = TechnicalIndicators.ema(data, slow)
-        
-        macd_line = []
-        for i in range(len(data)):
-            if np.isnan(ema_fast[i]) or np.isnan(ema_slow[i]):
-                macd_line.append(np.nan)
-            else:
-                macd_line.append(ema_fast[i] - ema_slow[i])
-        
-        signal_line = TechnicalIndicators.ema(macd_line, signal)
-        
-        histogram = []
-        for i in range(len(macd_line)):
-            if np.isnan(macd_line[i]) or np.isnan(signal_line[i]):
-                histogram.append(np.nan)
-            else:
-                histogram.append(macd_line[i] - signal_line[i])
+        # Fast EMA, slow EMA, MACD line and signal EMA advance together in one pass over the prices
+        values = _scan_values(data)
+        macd_line = np.empty(len(values))
+        signal_line = np.empty(len(values))
+        histogram = np.empty(len(values))
+        _macd_kernel(fast, slow, signal)(values, macd_line, signal_line, histogram)
         
         return {
             'macd': macd_line,
@@ -105,22 +107,48 @@ class TechnicalIndicators:
         }
     
     @staticmethod
-    def bollinger_bands(data: List[float], period: int = 20, std_dev: float = 2.0) -> Dict[str, List[float]]:
+    def snapshot(data: List[float], rsi_period: int = 14, fast: int = 12, slow: int = 26, signal: int = 9,
+                 bb_period: int = 20, std_dev: float = 2.0) -> Dict[str, float]:
+        """Latest RSI, MACD and Bollinger (ddof=0) values, without materializing the full indicator series"""
+        values = _scan_values(data)
+        out = np.empty(7)
+        _snapshot_kernel(rsi_period, fast, slow, signal, bb_period)(values, std_dev, out)
+        rsi, macd, signal_value, histogram, upper, middle, lower = out.tolist()
+        return {
+            'rsi': rsi,
+            'macd': macd,
+            'signal': signal_value,
+            'histogram': histogram,
+            'upper': upper,
+            'middle': middle,
+            'lower': lower
+        }
+    
+    @staticmethod
+    def bollinger_bands(data: List[float], period: int = 20, std_dev: float = 2.0, ddof: int = 0) -> Dict[str, np.ndarray]:
         """Bollinger Bands"""
         sma_values = TechnicalIndicators.sma(data, period)
-        
-        upper_band = []
-        lower_band = []
-        
-        for i in range(len(data)):
-            if i < period - 1 or np.isnan(sma_values[i]):
-                upper_band.append(np.nan)
-                lower_band.append(np.nan)
-            else:
-                window_data = data[i-period+1:i+1]
-                std = np.std(window_data, ddof=1)
-                upper_band.append(sma_values[i] + (std_dev * std))
-                lower_band.append(sma_values[i] - (std_dev * std))
+        upper_band = np.full(len(sma_values), np.nan)
+        lower_band = np.full(len(sma_values), np.nan)
+        if len(sma_values) < period:
+            return {
+                'upper': upper_band,
+                'middle': sma_values,
+                'lower': lower_band
+            }
+        
+        # Rolling variance from window sums of x and x^2; centring first keeps the subtraction well conditioned
+        values = np.asarray(data, dtype=np.float64)
+        centred = values - np.nanmean(values)
+        centred[np.isnan(centred)] = 0.0  # NaN windows stay NaN through the middle band
+        s1 = TechnicalIndicators._window_sums(centred, period)
+        s2 = TechnicalIndicators._window_sums(centred * centred, period)
+        variance = (s2 - s1 * s1 / period) / (period - ddof)
+        std = np.sqrt(np.maximum(variance, 0.0))
+        
+        middle = sma_values[period-1:]
+        upper_band[period-1:] = middle + std_dev * std
+        lower_band[period-1:] = middle - std_dev * std
         
         return {
             'upper': upper_band,
@@ -130,26 +158,24 @@ class TechnicalIndicators:
     
     @staticmethod
     def stochastic(highs: List[float], lows: List[float], closes: List[float], 
-                   k_period: int = 14, d_period: int = 3) -> Dict[str, List[float]]:
+                   k_period: int = 14, d_period: int = 3) -> Dict[str, np.ndarray]:
         """Stochastic Oscillator"""
-        k_values = []
-        
-        for i in range(len(closes)):
-            if i < k_period - 1:
-                k_values.append(np.nan)
-            else:
-                window_high = max(highs[i-k_period+1:i+1])
-                window_low = min(lows[i-k_period+1:i+1])
-                
-                if window_high == window_low:
-                    k_values.append(50)
-                else:
-                    k_val = ((closes[i] - window_low) / (window_high - window_low)) * 100
-                    k_values.append(k_val)
+        closes = _scan_values(closes)
+        window_high = np.full(len(closes), np.nan)
+        window_low = np.full(len(closes), np.nan)
+        if len(closes) >= k_period:
+            _rolling_max_min_kernel(_scan_values(highs), _scan_values(lows),
+                                    k_period, window_high, window_low)
+        
+        # A flat window reads 50; warm-up bars stay NaN
+        window_range = window_high - window_low
+        flat = window_range == 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k_values = np.where(flat, 50.0, (closes - window_low) / window_range * 100)
         
         d_values = TechnicalIndicators.sma(k_values, d_period)
         
         return {
             'k': k_values,
             'd': d_values
-        }
\ No newline at end of file
+        }
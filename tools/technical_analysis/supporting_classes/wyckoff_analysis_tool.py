@@ -1,9 +1,16 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 
 from data_structures.ohlc import OHLCData
+from data_structures.ohlc_series import OHLCSeries
 from data_structures.wyckoff_pattern import WyckoffPattern
+from data_structures.wyckoff_rolling_stats import WyckoffRollingStats
 import numpy as np
 import pandas as pd
+from tools.technical_analysis.supporting_classes import indicator_kernels, wyckoff_kernels
+from tools.utilities.jit import njit
+
+_rolling_max_min_kernel = njit(cache=True)(indicator_kernels.rolling_max_min)
+_level_test_counts_kernel = njit(cache=True, parallel=True)(wyckoff_kernels.level_test_counts)
 
 class WyckoffAnalyzer:
     """Advanced Wyckoff method analysis"""
@@ -16,214 +23,226 @@ class WyckoffAnalyzer:
             'markdown': self._detect_markdown_pattern
         }
     
-    def analyze_market_phase(self, data: List[OHLCData], volume_data: Optional[List[float]] = None) -> List[WyckoffPattern]:
-        """Identify current Wyckoff market phase"""
+    def analyze_market_phase(self, data: Union[List[OHLCData], pd.DataFrame], volume_data: Optional[List[float]] = None) -> List[WyckoffPattern]:
+        """Identify current Wyckoff market phase from candles or an OHLC DataFrame"""
         
         if len(data) < 50:
             return []
         
         phases = []
         
+        # Extract the price columns (a DataFrame's are used directly) and rolling statistics once; every detector reads the same arrays
+        series = OHLCSeries.from_frame(data) if isinstance(data, pd.DataFrame) else OHLCSeries.from_candles(data)
+        stats = self._rolling_stats(series)
+        
         # Analyze for each phase type
         for phase_type, detector in self.phase_patterns.items():
-            detected_phases = detector(data, volume_data)
+            detected_phases = detector(series, stats)
             phases.extend(detected_phases)
         
-        # Sort by confidence and recency
-        phases.sort(key=lambda x: (x.confidence, x.end_time or x.start_time), reverse=True)
+        # Sort by confidence and recency, both descending; lexsort is stable, so ties keep detection order
+        count = len(phases)
+        confidence = np.fromiter((p.confidence for p in phases), dtype=np.float64, count=count)
+        recency = np.fromiter(((p.end_time or p.start_time).timestamp() for p in phases), dtype=np.float64, count=count)
+        phases = [phases[i] for i in np.lexsort((-recency, -confidence))]
         
         return phases
     
-    def _detect_accumulation_pattern(self, data: List[OHLCData], volume_data: Optional[List[float]]) -> List[WyckoffPattern]:
+    @staticmethod
+    def _rolling_stats(series: OHLCSeries) -> WyckoffRollingStats:
+        """Window statistics for all four detectors, computed in vectorized passes over the series"""
+        n = len(series.close)
+        range_mean, range_std, range_max_high, range_min_low = WyckoffAnalyzer._centred_window_stats(series, 20)
+        first_half_mean, second_half_mean = WyckoffAnalyzer._half_window_means(series.close)
+        trend = slice(20, n - 10)
+        return WyckoffRollingStats(
+            range_mean=range_mean,
+            range_std=range_std,
+            range_max_high=range_max_high,
+            range_min_low=range_min_low,
+            first_half_mean=first_half_mean,
+            second_half_mean=second_half_mean,
+            higher_highs=WyckoffAnalyzer._step_counts(series.high, rising=True)[trend],
+            higher_lows=WyckoffAnalyzer._step_counts(series.low, rising=True)[trend],
+            lower_highs=WyckoffAnalyzer._step_counts(series.high, rising=False)[trend],
+            lower_lows=WyckoffAnalyzer._step_counts(series.low, rising=False)[trend]
+        )
+    
+    @staticmethod
+    def _centred_window_stats(series: OHLCSeries, half_width: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Close mean and std, max high and min low over data[i-half_width:i+half_width], indexed by centre i (NaN where incomplete)"""
+        n = len(series.close)
+        width = 2 * half_width
+        mean = np.full(n, np.nan)
+        std = np.full(n, np.nan)
+        max_high = np.full(n, np.nan)
+        min_low = np.full(n, np.nan)
+        if n < width:
+            return mean, std, max_high, min_low
+        
+        # Window sums of x and x^2 from running sums; centring on the series mean keeps the variance well conditioned
+        shift = series.close.mean()
+        centred = series.close - shift
+        c1 = np.cumsum(centred)
+        c2 = np.cumsum(centred * centred)
+        s1 = c1[width-1:].copy()
+        s1[1:] -= c1[:-width]
+        s2 = c2[width-1:].copy()
+        s2[1:] -= c2[:-width]
+        centre = slice(half_width, n - half_width + 1)
+        mean[centre] = shift + s1 / width
+        std[centre] = np.sqrt(np.maximum(s2 / width - (s1 / width) ** 2, 0.0))
+        
+        trailing_max = np.empty(n)
+        trailing_min = np.empty(n)
+        _rolling_max_min_kernel(series.high, series.low, width, trailing_max, trailing_min)
+        max_high[centre] = trailing_max[width-1:]
+        min_low[centre] = trailing_min[width-1:]
+        return mean, std, max_high, min_low
+    
+    @staticmethod
+    def _step_counts(values: np.ndarray, rising: bool) -> np.ndarray:
+        """Rising (or falling) steps among the 10 bars values[i-10:i], stored at index i-10"""
+        steps = np.diff(values) > 0 if rising else np.diff(values) < 0
+        return np.convolve(steps.astype(np.int64), np.ones(9, dtype=np.int64), mode='valid')
+    
+    @staticmethod
+    def _half_window_means(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Mean close of the first and second 15-bar halves of data[i-30:i], stored at index i-30"""
+        means = np.lib.stride_tricks.sliding_window_view(close, 15).mean(axis=1)
+        return means[:len(close)-30], means[15:len(close)-15]
+    
+    def _detect_accumulation_pattern(self, series: OHLCSeries, stats: WyckoffRollingStats) -> List[WyckoffPattern]:
         """Detect Wyckoff accumulation phase"""
         
-        phases = []
+        # Look for sideways price action: only tight-range windows (less than 2% volatility) are examined
+        centres = slice(20, len(series.close) - 20)
+        tight_range = stats.range_std[centres] / stats.range_mean[centres] < 0.02
         
-        # Look for sideways price action with specific characteristics
-        for i in range(20, len(data) - 20):
-            window = data[i-20:i+20]
-            
-            # Calculate price range and volatility
-            prices = [candle.close for candle in window]
-            price_range = max(prices) - min(prices)
-            avg_price = sum(prices) / len(prices)
-            volatility = np.std(prices)
-            
-            # Look for tight range (low volatility)
-            if volatility / avg_price < 0.02:  # Less than 2% volatility
-                
-                # Check for multiple tests of support
-                lows = [candle.low for candle in window]
-                support_level = min(lows)
-                support_tests = sum(1 for low in lows if abs(low - support_level) / support_level < 0.005)
-                
-                if support_tests >= 3:  # At least 3 tests
-                    
-                    # Look for spring pattern (break below then recovery)
-                    recent_data = data[i:i+10] if i+10 < len(data) else data[i:]
-                    spring_detected = False
-                    
-                    for candle in recent_data:
-                        if candle.low < support_level * 0.999:  # Break below support
-                            # Check for recovery
-                            recovery_candles = [c for c in recent_data if c.timestamp > candle.timestamp]
-                            if recovery_candles and recovery_candles[-1].close > support_level:
-                                spring_detected = True
-                                break
-                    
-                    confidence = 0.6 + (support_tests * 0.1) + (0.2 if spring_detected else 0)
-                    
-                    if confidence > 0.7:
-                        phases.append(WyckoffPattern(
-                            pattern_type='accumulation',
-                            phase='accumulation',
-                            start_time=window[0].timestamp,
-                            end_time=window[-1].timestamp,
-                            key_levels={'spring_pattern': 1.0} if spring_detected else {'multiple_support_tests': 1.0},
-                            confidence=confidence,
-                            description='Sideways price action with multiple support tests' + (' and spring pattern' if spring_detected else ''),
-                        ))
+        # Count tests of support (lows within 0.5% of the window low) for every candidate window in parallel
+        candidates = np.flatnonzero(tight_range) + 20
+        test_counts = _level_test_counts_kernel(series.low, stats.range_min_low, candidates, 20)
+        
+        # At least 3 tests
+        qualified = test_counts >= 3
+        candidates = candidates[qualified]
+        support_tests = test_counts[qualified]
+        support_level = stats.range_min_low[candidates]
+        
+        # Look for spring pattern (break below support in the next 9 bars, then the 10th closes back above)
+        recent_low = np.lib.stride_tricks.sliding_window_view(series.low, 9)[candidates].min(axis=1)
+        spring = (recent_low < support_level * 0.999) & (series.close[candidates + 9] > support_level)
+        confidence = 0.6 + (support_tests * 0.1) + np.where(spring, 0.2, 0.0)
+        
+        # Build pattern objects once, for the surviving windows only
+        phases = []
+        for i, conf, spring_detected in zip(candidates.tolist(), confidence.tolist(), spring.tolist()):
+            if conf > 0.7:
+                phases.append(WyckoffPattern(
+                    pattern_type='accumulation',
+                    phase='accumulation',
+                    start_time=series.timestamps[i-20],
+                    end_time=series.timestamps[i+19],
+                    key_levels={'spring_pattern': 1.0} if spring_detected else {'multiple_support_tests': 1.0},
+                    confidence=conf,
+                    description='Sideways price action with multiple support tests' + (' and spring pattern' if spring_detected else ''),
+                ))
         
         return phases
     
-    def _detect_distribution_pattern(self, data: List[OHLCData], volume_data: Optional[List[float]]) -> List[WyckoffPattern]:
+    def _detect_distribution_pattern(self, series: OHLCSeries, stats: WyckoffRollingStats) -> List[WyckoffPattern]:
         """Detect Wyckoff distribution phase"""
         
-        phases = []
+        # Look for sideways price action at highs: slightly higher volatility than accumulation is allowed
+        centres = slice(20, len(series.close) - 20)
+        tight_range = stats.range_std[centres] / stats.range_mean[centres] < 0.025
         
-        # Look for sideways price action at highs with specific characteristics
-        for i in range(20, len(data) - 20):
-            window = data[i-20:i+20]
-            
-            # Calculate price range and position
-            prices = [candle.close for candle in window]
-            highs = [candle.high for candle in window]
-            
-            price_range = max(prices) - min(prices)
-            avg_price = sum(prices) / len(prices)
-            volatility = np.std(prices)
-            
-            # Look for sideways action at relatively high prices
-            if volatility / avg_price < 0.025:  # Slightly higher volatility than accumulation
-                
-                # Check for multiple tests of resistance
-                resistance_level = max(highs)
-                resistance_tests = sum(1 for high in highs if abs(high - resistance_level) / resistance_level < 0.005)
-                
-                if resistance_tests >= 3:  # At least 3 tests
-                    
-                    # Look for upthrust pattern (break above then decline)
-                    recent_data = data[i:i+10] if i+10 < len(data) else data[i:]
-                    upthrust_detected = False
-                    
-                    for candle in recent_data:
-                        if candle.high > resistance_level * 1.001:  # Break above resistance
-                            # Check for decline
-                            decline_candles = [c for c in recent_data if c.timestamp > candle.timestamp]
-                            if decline_candles and decline_candles[-1].close < resistance_level:
-                                upthrust_detected = True
-                                break
-                    
-                    confidence = 0.6 + (resistance_tests * 0.1) + (0.2 if upthrust_detected else 0)
-                    
-                    if confidence > 0.7:
-                        phases.append(WyckoffPattern(
-                            pattern_type='distribution',
-                            phase='distribution',
-                            start_time=window[0].timestamp,
-                            end_time=window[-1].timestamp,
-                            key_levels={'upthrust_pattern': 1.0} if upthrust_detected else {'multiple_resistance_tests': 1.0},
-                            confidence=confidence,
-                            description='Sideways price action at highs with multiple resistance tests' + (' and upthrust pattern' if upthrust_detected else '')
-                        ))
+        # Count tests of resistance (highs within 0.5% of the window high) for every candidate window in parallel
+        candidates = np.flatnonzero(tight_range) + 20
+        test_counts = _level_test_counts_kernel(series.high, stats.range_max_high, candidates, 20)
+        
+        # At least 3 tests
+        qualified = test_counts >= 3
+        candidates = candidates[qualified]
+        resistance_tests = test_counts[qualified]
+        resistance_level = stats.range_max_high[candidates]
+        
+        # Look for upthrust pattern (break above resistance in the next 9 bars, then the 10th closes back below)
+        recent_high = np.lib.stride_tricks.sliding_window_view(series.high, 9)[candidates].max(axis=1)
+        upthrust = (recent_high > resistance_level * 1.001) & (series.close[candidates + 9] < resistance_level)
+        confidence = 0.6 + (resistance_tests * 0.1) + np.where(upthrust, 0.2, 0.0)
+        
+        # Build pattern objects once, for the surviving windows only
+        phases = []
+        for i, conf, upthrust_detected in zip(candidates.tolist(), confidence.tolist(), upthrust.tolist()):
+            if conf > 0.7:
+                phases.append(WyckoffPattern(
+                    pattern_type='distribution',
+                    phase='distribution',
+                    start_time=series.timestamps[i-20],
+                    end_time=series.timestamps[i+19],
+                    key_levels={'upthrust_pattern': 1.0} if upthrust_detected else {'multiple_resistance_tests': 1.0},
+                    confidence=conf,
+                    description='Sideways price action at highs with multiple resistance tests' + (' and upthrust pattern' if upthrust_detected else '')
+                ))
         
         return phases
     
-    def _detect_markup_pattern(self, data: List[OHLCData], volume_data: Optional[List[float]]) -> List[WyckoffPattern]:
+    def _detect_markup_pattern(self, series: OHLCSeries, stats: WyckoffRollingStats) -> List[WyckoffPattern]:
         """Detect Wyckoff markup phase"""
         
         phases = []
         
-        # Look for sustained uptrend with higher highs and higher lows
-        for i in range(30, len(data)):
-            window = data[i-30:i]
-            
-            prices = [candle.close for candle in window]
-            
-            # Check for uptrend characteristics
-            first_half = prices[:15]
-            second_half = prices[15:]
+        # Sustained uptrend: second half of the 30-bar window at least 2% above the first,
+        # with at least 6 higher highs and 6 higher lows over the last 10 bars
+        higher_highs = stats.higher_highs
+        higher_lows = stats.higher_lows
+        strong_uptrend = (stats.second_half_mean > stats.first_half_mean * 1.02) & (higher_highs >= 6) & (higher_lows >= 6)
+        
+        for k in np.flatnonzero(strong_uptrend):
+            i = k + 30
+            confidence = 0.7 + int(higher_highs[k] + higher_lows[k]) * 0.01
             
-            if np.mean(second_half) > np.mean(first_half) * 1.02:  # At least 2% gain
-                
-                # Look for higher highs and higher lows pattern
-                highs = [candle.high for candle in window]
-                lows = [candle.low for candle in window]
-                
-                recent_highs = highs[-10:]
-                recent_lows = lows[-10:]
-                
-                higher_highs = sum(1 for j in range(1, len(recent_highs)) if recent_highs[j] > recent_highs[j-1])
-                higher_lows = sum(1 for j in range(1, len(recent_lows)) if recent_lows[j] > recent_lows[j-1])
-                
-                if higher_highs >= 6 and higher_lows >= 6:  # Strong uptrend
-                    confidence = 0.7 + (higher_highs + higher_lows) * 0.01
-                    
-                    phases.append(WyckoffPattern(
-                        pattern_type='markup',
-                        start_time=window[0].timestamp,
-                        end_time=window[-1].timestamp,
-                        #price_range=(min(prices), max(prices)),
-                        #volume_characteristics={'trend_strength': higher_highs + higher_lows},
-                        key_levels={'sustained_uptrend': 1.0, 'higher_highs_lows': 1.0},
-                        confidence=min(confidence, 1.0),
-                        phase='MARKUP', #higher_highs + higher_lows,
-                        description='Sustained uptrend with higher highs and higher lows'
-                    ))
+            phases.append(WyckoffPattern(
+                pattern_type='markup',
+                start_time=series.timestamps[i-30],
+                end_time=series.timestamps[i-1],
+                #price_range=(min(prices), max(prices)),
+                #volume_characteristics={'trend_strength': higher_highs + higher_lows},
+                key_levels={'sustained_uptrend': 1.0, 'higher_highs_lows': 1.0},
+                confidence=min(confidence, 1.0),
+                phase='MARKUP', #higher_highs + higher_lows,
+                description='Sustained uptrend with higher highs and higher lows'
+            ))
         
         return phases
     
-    def _detect_markdown_pattern(self, data: List[OHLCData], volume_data: Optional[List[float]]) -> List[WyckoffPattern]:
+    def _detect_markdown_pattern(self, series: OHLCSeries, stats: WyckoffRollingStats) -> List[WyckoffPattern]:
         """Detect Wyckoff markdown phase"""
         
         phases = []
         
-        # Look for sustained downtrend with lower highs and lower lows
-        for i in range(30, len(data)):
-            window = data[i-30:i]
-            
-            prices = [candle.close for candle in window]
-            
-            # Check for downtrend characteristics
-            first_half = prices[:15]
-            second_half = prices[15:]
+        # Sustained downtrend: second half of the 30-bar window at least 2% below the first,
+        # with at least 6 lower highs and 6 lower lows over the last 10 bars
+        lower_highs = stats.lower_highs
+        lower_lows = stats.lower_lows
+        strong_downtrend = (stats.second_half_mean < stats.first_half_mean * 0.98) & (lower_highs >= 6) & (lower_lows >= 6)
+        
+        for k in np.flatnonzero(strong_downtrend):
+            i = k + 30
+            confidence = 0.7 + int(lower_highs[k] + lower_lows[k]) * 0.01
             
-            if np.mean(second_half) < np.mean(first_half) * 0.98:  # At least 2% decline
-                
-                # Look for lower highs and lower lows pattern
-                highs = [candle.high for candle in window]
-                lows = [candle.low for candle in window]
-                
-                recent_highs = highs[-10:]
-                recent_lows = lows[-10:]
-                
-                lower_highs = sum(1 for j in range(1, len(recent_highs)) if recent_highs[j] < recent_highs[j-1])
-                lower_lows = sum(1 for j in range(1, len(recent_lows)) if recent_lows[j] < recent_lows[j-1])
-                
-                if lower_highs >= 6 and lower_lows >= 6:  # Strong downtrend
-                    confidence = 0.7 + (lower_highs + lower_lows) * 0.01
-                    
-                    phases.append(WyckoffPattern(
-                        pattern_type='markdown',
-                        phase='markdown',
-                        start_time=window[0].timestamp,
-                        end_time=window[-1].timestamp,
-                        key_levels={
-                            'max_high': max(highs),
-                            'min_low': min(lows)
-                        },
-                        description='Sustained downtrend with lower highs and lower lows',
-                        confidence=min(confidence, 1.0)
-                    ))
-        
-        return phases
\ No newline at end of file
+            phases.append(WyckoffPattern(
+                pattern_type='markdown',
+                phase='markdown',
+                start_time=series.timestamps[i-30],
+                end_time=series.timestamps[i-1],
+                key_levels={
+                    'max_high': float(series.high[i-30:i].max()),
+                    'min_low': float(series.low[i-30:i].min())
+                },
+                description='Sustained downtrend with lower highs and lower lows',
+                confidence=min(confidence, 1.0)
+            ))
+        
+        return phases
@@ -0,0 +1,22 @@
+"""
+Per-window kernels for the Wyckoff range detectors.
+
+Written in the Numba-compatible subset of Python; wyckoff_analysis_tool JIT-compiles them
+with parallel=True so windows are processed across cores (plain loops without Numba).
+"""
+import numpy as np
+from tools.utilities.jit import prange
+
+
+def level_test_counts(values: np.ndarray, levels: np.ndarray, centres: np.ndarray, half_width: int) -> np.ndarray:
+    """For each centre i, how many values[i-half_width:i+half_width] lie within 0.5% of levels[i]"""
+    counts = np.zeros(centres.shape[0], dtype=np.int64)
+    for k in prange(centres.shape[0]):
+        i = centres[k]
+        level = levels[i]
+        tests = 0
+        for j in range(i - half_width, i + half_width):
+            if abs(values[j] - level) / level < 0.005:
+                tests += 1
+        counts[k] = tests
+    return counts
@@ -1,7 +1,17 @@
+import atexit
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+import hashlib
+import heapq
+import io
+import multiprocessing
+import os
+from operator import attrgetter
 from pathlib import Path
 import sys
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional, Tuple
 from crewai.tools import BaseTool
 
 # SOLUTION: Add project root to Python path
@@ -13,7 +23,12 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
     
 from data_structures.ohlc import OHLCData
+from data_structures.ohlc_series import OHLCSeries
+from data_structures.smc_pattern import BULLISH, FVG, LIQUIDITY_SWEEP, ORDER_BLOCK
+from data_structures.trading_signal import BUY, SELL, TradingSignal
+from data_structures.wyckoff_pattern import ACCUMULATION, DISTRIBUTION, SPRING
 from tools.analyzers.smc_analyzer import SMCAnalyzer
+from tools.technical_analysis.supporting_classes.indicator_state import IndicatorState
 from tools.technical_analysis.supporting_classes.technical_indicator import TechnicalIndicators
 #from tools.wyckoff_analysis_tool import WyckoffAnalyzer
 from analyzers.wyckoff_analyzer import WyckoffAnalyzer
@@ -22,29 +37,64 @@ import numpy as np
 
 #from tools.technical_analysis.supporting_classes.wyckoff_analysis_tool import WyckoffAnalyzer
 
+# Formatted reports of recent runs, keyed by a digest of the candles plus the analysis type and scan dtype
+_RESULT_CACHE_SIZE = 128
+
+# Section rules of the formatted report
+_RULE_WIDE = "=" * 60 + "\n"
+_RULE = "-" * 30 + "\n"
+
+# SMC pattern types that produce signals, indexed by type id
+_SMC_TYPE_IDS = {ORDER_BLOCK: 0, FVG: 1, LIQUIDITY_SWEEP: 2}
+_SMC_SOURCES = ('SMC_ORDER_BLOCK', 'SMC_FVG', 'SMC_LIQUIDITY_SWEEP')
+_SMC_STRENGTH_SCALE = np.array([1.0, 0.9, 1.0])
+_SMC_REASON_PREFIXES = (('Bearish order block: ', 'Bullish order block: '), ('Bearish FVG: ', 'Bullish FVG: '), ('', ''))
+
+
+def _last_valid(value: float) -> Optional[float]:
+    """An indicator's latest value, or None while it is still NaN (tested without a NumPy call)"""
+    return None if value != value else value
+
+
+def _series_digest(series: OHLCSeries) -> bytes:
+    """Digest of every bar's timestamp and OHLCV column values"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.fromiter((t.timestamp() for t in series.timestamps), dtype=np.float64, count=len(series.timestamps)))
+    for column in (series.open, series.high, series.low, series.close, series.volume):
+        digest.update(column)
+    return digest.digest()
+
+
 class TechnicalAnalysisTool(BaseTool):
     """Main Technical Analysis Tool for CrewAI integration"""
     
     name: str = "technical_analysis"
     description: str = "Comprehensive technical analysis with Wyckoff and SMC pattern recognition"
+    # Precision of the indicator and pattern scans; 'float32' halves their memory traffic, while
+    # reported signal prices always come from the candles themselves
+    scan_dtype: str = "float64"
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)        
         object.__setattr__(self, '_smc_analyzer', SMCAnalyzer())
         object.__setattr__(self, '_indicators', TechnicalIndicators())
         object.__setattr__(self, '_wyckoff_analyzer', WyckoffAnalyzer())
+        object.__setattr__(self, '_result_cache', OrderedDict())
+        object.__setattr__(self, '_indicator_states', {})
+        object.__setattr__(self, '_batch_executor', None)  # worker pool for run_batch, started on first use
     
+    # Set in __init__ via object.__setattr__, so they are read straight from the instance dict
     @property
     def indicators(self) -> TechnicalIndicators:
-        return object.__getattribute__(self, '_indicators') if hasattr(self, '_indicators') else TechnicalIndicators()
+        return self.__dict__['_indicators']
     
     @property
     def wyckoff_analyzer(self) -> WyckoffAnalyzer:
-        return object.__getattribute__(self, '_wyckoff_analyzer') if hasattr(self, '_wyckoff_analyzer') else WyckoffAnalyzer()
+        return self.__dict__['_wyckoff_analyzer']
     
     @property
     def smc_analyzer(self) -> SMCAnalyzer:
-        return object.__getattribute__(self, '_smc_analyzer') if hasattr(self, '_smc_analyzer') else SMCAnalyzer()
+        return self.__dict__['_smc_analyzer']
     
     def _run(self, ohlc_data: List[OHLCData], analysis_type: str = "comprehensive") -> str:
         """
@@ -58,26 +108,34 @@ class TechnicalAnalysisTool(BaseTool):
             if not ohlc_data or len(ohlc_data) < 10:
                 return "Insufficient data for technical analysis"
             
+            # Price columns extracted once and shared by the indicator kernels and every detector
+            series = OHLCSeries.from_candles(ohlc_data, dtype=np.dtype(self.scan_dtype))
+            closes = series.close
+            
+            # Agents often re-invoke the tool on an unchanged candle set; reuse the cached results, stamped afresh.
+            # The latest close is keyed at full precision since the report prints it and float32 columns round it
+            first, last = ohlc_data[0], ohlc_data[-1]
+            cache_key = (first.symbol, first.timeframe, len(ohlc_data), _series_digest(series), last.close,
+                         analysis_type, self.scan_dtype)
+            result_cache = self._result_cache
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                result_cache.move_to_end(cache_key)
+                return self._format_analysis_output({**cached, 'analysis_time_ns': time.time_ns()})
+            
             results = {
                 'symbol': ohlc_data[0].symbol,
                 'timeframe': ohlc_data[0].timeframe,
-                'analysis_time': datetime.now().isoformat(),
+                'analysis_time_ns': time.time_ns(),  # rendered only by the formatter
                 'data_points': len(ohlc_data)
             }
             
-            closes = [candle.close for candle in ohlc_data]
-            highs = [candle.high for candle in ohlc_data]
-            lows = [candle.low for candle in ohlc_data]
-            
             if analysis_type in ['indicators', 'comprehensive']:
-                # Calculate technical indicators
-                rsi_values = self.indicators.rsi(closes)
-                macd_data = self.indicators.macd(closes)
-                bb_data = self.indicators.bollinger_bands(closes)
-                stoch_data = self.indicators.stochastic(highs, lows, closes)
-                
-                current_rsi = rsi_values[-1] if not np.isnan(rsi_values[-1]) else None
-                current_macd = macd_data['macd'][-1] if not np.isnan(macd_data['macd'][-1]) else None
+                # Latest indicator values, streamed from per-symbol state when these candles extend the last run
+                current = self._current_indicators(ohlc_data, closes)
+                current_rsi = _last_valid(current['rsi'])
+                upper, lower = current['upper'], current['lower']
+                close = ohlc_data[-1].close
                 
                 results['indicators'] = {
                     'rsi': {
@@ -85,51 +143,25 @@ class TechnicalAnalysisTool(BaseTool):
                         'signal': 'OVERSOLD' if current_rsi and current_rsi < 30 else 'OVERBOUGHT' if current_rsi and current_rsi > 70 else 'NEUTRAL'
                     },
                     'macd': {
-                        'macd': current_macd,
-                        'signal': macd_data['signal'][-1] if not np.isnan(macd_data['signal'][-1]) else None,
-                        'histogram': macd_data['histogram'][-1] if not np.isnan(macd_data['histogram'][-1]) else None
+                        'macd': _last_valid(current['macd']),
+                        'signal': _last_valid(current['signal']),
+                        'histogram': _last_valid(current['histogram'])
                     },
                     'bollinger_bands': {
-                        'upper': bb_data['upper'][-1] if not np.isnan(bb_data['upper'][-1]) else None,
-                        'middle': bb_data['middle'][-1] if not np.isnan(bb_data['middle'][-1]) else None,
-                        'lower': bb_data['lower'][-1] if not np.isnan(bb_data['lower'][-1]) else None,
-                        'position': 'ABOVE_UPPER' if closes[-1] > bb_data['upper'][-1] else 'BELOW_LOWER' if closes[-1] < bb_data['lower'][-1] else 'WITHIN_BANDS'
+                        'upper': _last_valid(upper),
+                        'middle': _last_valid(current['middle']),
+                        'lower': _last_valid(lower),
+                        # NaN bands compare False both ways, so warm-up reads as within the bands
+                        'position': 'ABOVE_UPPER' if close > upper else 'BELOW_LOWER' if close < lower else 'WITHIN_BANDS'
                     }
                 }
             
             if analysis_type in ['wyckoff', 'comprehensive']:
                 # Wyckoff analysis
-                accumulation = self.wyckoff_analyzer.detect_accumulation_phase(ohlc_data)
-                distribution = self.wyckoff_analyzer.detect_distribution_phase(ohlc_data)
-                spring = self.wyckoff_analyzer.detect_spring(ohlc_data)
+                detected = self.wyckoff_analyzer.detect_all(ohlc_data, series)
                 
-                wyckoff_patterns = []
-                if accumulation:
-                    wyckoff_patterns.append({
-                        'type': accumulation.pattern_type,
-                        'phase': accumulation.phase,
-                        'confidence': accumulation.confidence,
-                        'description': accumulation.description,
-                        'key_levels': accumulation.key_levels
-                    })
-                
-                if distribution:
-                    wyckoff_patterns.append({
-                        'type': distribution.pattern_type,
-                        'phase': distribution.phase,
-                        'confidence': distribution.confidence,
-                        'description': distribution.description,
-                        'key_levels': distribution.key_levels
-                    })
-                
-                if spring:
-                    wyckoff_patterns.append({
-                        'type': spring.pattern_type,
-                        'phase': spring.phase,
-                        'confidence': spring.confidence,
-                        'description': spring.description,
-                        'key_levels': spring.key_levels
-                    })
+                # The detector results are slotted dataclasses, kept as-is for signals and formatting
+                wyckoff_patterns = [pattern for pattern in detected.values() if pattern]
                 
                 results['wyckoff'] = {
                     'patterns_detected': len(wyckoff_patterns),
@@ -138,47 +170,18 @@ class TechnicalAnalysisTool(BaseTool):
             
             if analysis_type in ['smc', 'comprehensive']:
                 # SMC analysis
-                order_blocks = self.smc_analyzer.detect_order_blocks(ohlc_data)
-                fvgs = self.smc_analyzer.detect_fair_value_gaps(ohlc_data)
-                liquidity_sweeps = self.smc_analyzer.detect_liquidity_sweeps(ohlc_data)
-                
-                smc_patterns = []
-                
-                for ob in order_blocks:
-                    smc_patterns.append({
-                        'type': ob.pattern_type,
-                        'direction': ob.direction,
-                        'confidence': ob.confidence,
-                        'price_level': ob.price_level,
-                        'zone_high': ob.zone_high,
-                        'zone_low': ob.zone_low,
-                        'description': ob.description
-                    })
+                smc_analyzer = self.smc_analyzer
+                order_blocks = smc_analyzer.detect_order_blocks(ohlc_data, series)
+                fvgs = smc_analyzer.detect_fair_value_gaps(ohlc_data, series)
+                liquidity_sweeps = smc_analyzer.detect_liquidity_sweeps(ohlc_data, series)
                 
-                for fvg in fvgs:
-                    smc_patterns.append({
-                        'type': fvg.pattern_type,
-                        'direction': fvg.direction,
-                        'confidence': fvg.confidence,
-                        'price_level': fvg.price_level,
-                        'zone_high': fvg.zone_high,
-                        'zone_low': fvg.zone_low,
-                        'description': fvg.description
-                    })
-                
-                for sweep in liquidity_sweeps:
-                    smc_patterns.append({
-                        'type': sweep.pattern_type,
-                        'direction': sweep.direction,
-                        'confidence': sweep.confidence,
-                        'price_level': sweep.price_level,
-                        'description': sweep.description
-                    })
+                smc_patterns = order_blocks + fvgs + liquidity_sweeps
                 
                 results['smc'] = {
-                    'order_blocks': len([p for p in smc_patterns if p['type'] == 'ORDER_BLOCK']),
-                    'fair_value_gaps': len([p for p in smc_patterns if p['type'] == 'FVG']),
-                    'liquidity_sweeps': len([p for p in smc_patterns if p['type'] == 'LIQUIDITY_SWEEP']),
+                    # Each detector returns patterns of its own type only, so its list length is the count
+                    'order_blocks': len(order_blocks),
+                    'fair_value_gaps': len(fvgs),
+                    'liquidity_sweeps': len(liquidity_sweeps),
                     'patterns': smc_patterns
                 }
             
@@ -186,13 +189,57 @@ class TechnicalAnalysisTool(BaseTool):
             signals = self._generate_signals(results, ohlc_data)
             results['signals'] = signals
             
+            result_cache[cache_key] = results
+            if len(result_cache) > _RESULT_CACHE_SIZE:
+                result_cache.popitem(last=False)
+            
             # Format output
             return self._format_analysis_output(results)
             
         except Exception as e:
             return f"Error in technical analysis: {str(e)}"
     
-    def _generate_signals(self, analysis_results: Dict, ohlc_data: List[OHLCData]) -> List[Dict]:
+    def run_batch(self, batch: List[List[OHLCData]], analysis_type: str = "comprehensive") -> List[str]:
+        """Run the analysis for several symbols across worker processes; reports come back in batch order"""
+        executor = self._batch_executor
+        if executor is None:
+            # Workers come from a fork server: forking this process after Numba has started its parallel threads is unsafe.
+            # As with the spawn default on macOS and Windows, calling scripts need an `if __name__ == "__main__"` guard
+            executor = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('forkserver'))
+            atexit.register(executor.shutdown)
+            object.__setattr__(self, '_batch_executor', executor)
+        
+        futures = [executor.submit(_run_symbol, (ohlc_data, analysis_type, self.scan_dtype)) for ohlc_data in batch]
+        return [future.result() for future in futures]
+    
+    def close(self) -> None:
+        """Shut down the run_batch worker pool; a later run_batch starts a new one"""
+        executor = self._batch_executor
+        if executor is not None:
+            object.__setattr__(self, '_batch_executor', None)
+            atexit.unregister(executor.shutdown)
+            executor.shutdown()
+    
+    def _current_indicators(self, ohlc_data: List[OHLCData], closes: np.ndarray) -> Dict[str, float]:
+        """Latest RSI, MACD and Bollinger values for the last candle"""
+        first, last = ohlc_data[0], ohlc_data[-1]
+        key = (first.symbol, first.timeframe)
+        entry = self._indicator_states.get(key)
+        fingerprint = (first.timestamp, len(ohlc_data), last.timestamp, last.close)
+        if entry is not None:
+            first_timestamp, seen, last_timestamp, last_close = entry[0]
+            anchor = ohlc_data[seen - 1] if seen <= len(ohlc_data) else None
+            if (anchor is not None and first.timestamp == first_timestamp and
+                    anchor.timestamp == last_timestamp and anchor.close == last_close):
+                # Same history plus new candles: only the closes the state has not ingested yet are processed
+                self._indicator_states[key] = (fingerprint, entry[1])
+                return entry[1].extend(closes[entry[1].count:].tolist())
+        
+        # Cold start: one fused pass over the whole history; the state ingests these closes on the first extension
+        self._indicator_states[key] = (fingerprint, IndicatorState())
+        return self.indicators.snapshot(closes)
+    
+    def _generate_signals(self, analysis_results: Dict, ohlc_data: List[OHLCData]) -> List[TradingSignal]:
         """Generate trading signals based on technical analysis"""
         signals = []
         current_price = ohlc_data[-1].close
@@ -201,207 +248,192 @@ class TechnicalAnalysisTool(BaseTool):
         if 'indicators' in analysis_results and analysis_results['indicators']['rsi']['value']:
             rsi_value = analysis_results['indicators']['rsi']['value']
             if rsi_value < 30:
-                signals.append({
-                    'type': 'BUY',
-                    'source': 'RSI',
-                    'strength': 70,
-                    'price': current_price,
-                    'reason': f'RSI oversold at {rsi_value:.1f}'
-                })
+                signals.append(TradingSignal(
+                    signal_type=BUY,
+                    source='RSI',
+                    strength=70,
+                    price=current_price,
+                    reason=f'RSI oversold at {rsi_value:.1f}'
+                ))
             elif rsi_value > 70:
-                signals.append({
-                    'type': 'SELL',
-                    'source': 'RSI',
-                    'strength': 70,
-                    'price': current_price,
-                    'reason': f'RSI overbought at {rsi_value:.1f}'
-                })
+                signals.append(TradingSignal(
+                    signal_type=SELL,
+                    source='RSI',
+                    strength=70,
+                    price=current_price,
+                    reason=f'RSI overbought at {rsi_value:.1f}'
+                ))
         
         # Wyckoff signals
         if 'wyckoff' in analysis_results:
             for pattern in analysis_results['wyckoff']['patterns']:
-                if pattern['type'] == 'SPRING' and pattern['confidence'] > 70:
-                    signals.append({
-                        'type': 'BUY',
-                        'source': 'WYCKOFF_SPRING',
-                        'strength': pattern['confidence'],
-                        'price': pattern['key_levels'].get('entry_level', current_price),
-                        'reason': f"Wyckoff spring detected: {pattern['description']}"
-                    })
-                elif pattern['type'] == 'ACCUMULATION' and pattern['confidence'] > 75:
-                    signals.append({
-                        'type': 'BUY',
-                        'source': 'WYCKOFF_ACCUMULATION',
-                        'strength': pattern['confidence'] * 0.8,  # Slightly lower strength
-                        'price': current_price,
-                        'reason': f"Accumulation phase: {pattern['description']}"
-                    })
-                elif pattern['type'] == 'DISTRIBUTION' and pattern['confidence'] > 75:
-                    signals.append({
-                        'type': 'SELL',
-                        'source': 'WYCKOFF_DISTRIBUTION',
-                        'strength': pattern['confidence'] * 0.8,
-                        'price': current_price,
-                        'reason': f"Distribution phase: {pattern['description']}"
-                    })
+                if pattern.pattern_type == SPRING and pattern.confidence > 70:
+                    signals.append(TradingSignal(
+                        signal_type=BUY,
+                        source='WYCKOFF_SPRING',
+                        strength=pattern.confidence,
+                        price=pattern.key_levels.get('entry_level', current_price),
+                        reason=f"Wyckoff spring detected: {pattern.description}"
+                    ))
+                elif pattern.pattern_type == ACCUMULATION and pattern.confidence > 75:
+                    signals.append(TradingSignal(
+                        signal_type=BUY,
+                        source='WYCKOFF_ACCUMULATION',
+                        strength=pattern.confidence * 0.8,  # Slightly lower strength
+                        price=current_price,
+                        reason=f"Accumulation phase: {pattern.description}"
+                    ))
+                elif pattern.pattern_type == DISTRIBUTION and pattern.confidence > 75:
+                    signals.append(TradingSignal(
+                        signal_type=SELL,
+                        source='WYCKOFF_DISTRIBUTION',
+                        strength=pattern.confidence * 0.8,
+                        price=current_price,
+                        reason=f"Distribution phase: {pattern.description}"
+                    ))
         
-        # SMC signals
-        if 'smc' in analysis_results:
-            for pattern in analysis_results['smc']['patterns']:
-                if pattern['confidence'] > 70:
-                    if pattern['type'] == 'ORDER_BLOCK':
-                        if pattern['direction'] == 'BULLISH':
-                            signals.append({
-                                'type': 'BUY',
-                                'source': 'SMC_ORDER_BLOCK',
-                                'strength': pattern['confidence'],
-                                'price': pattern['zone_low'],
-                                'reason': f"Bullish order block: {pattern['description']}"
-                            })
-                        else:
-                            signals.append({
-                                'type': 'SELL',
-                                'source': 'SMC_ORDER_BLOCK',
-                                'strength': pattern['confidence'],
-                                'price': pattern['zone_high'],
-                                'reason': f"Bearish order block: {pattern['description']}"
-                            })
-                    
-                    elif pattern['type'] == 'FVG':
-                        if pattern['direction'] == 'BULLISH':
-                            signals.append({
-                                'type': 'BUY',
-                                'source': 'SMC_FVG',
-                                'strength': pattern['confidence'] * 0.9,
-                                'price': pattern['zone_low'],
-                                'reason': f"Bullish FVG: {pattern['description']}"
-                            })
-                        else:
-                            signals.append({
-                                'type': 'SELL',
-                                'source': 'SMC_FVG',
-                                'strength': pattern['confidence'] * 0.9,
-                                'price': pattern['zone_high'],
-                                'reason': f"Bearish FVG: {pattern['description']}"
-                            })
-                    
-                    elif pattern['type'] == 'LIQUIDITY_SWEEP':
-                        signals.append({
-                            'type': 'BUY' if pattern['direction'] == 'BULLISH' else 'SELL',
-                            'source': 'SMC_LIQUIDITY_SWEEP',
-                            'strength': pattern['confidence'],
-                            'price': current_price,
-                            'reason': pattern['description']
-                        })
+        # SMC signals: filter, score and price the patterns column-wise, then materialize only the survivors
+        # Low-confidence patterns (e.g. unconfirmed order blocks at 70) are dropped before any column is built
+        patterns = [p for p in analysis_results['smc']['patterns'] if p.confidence > 70] if 'smc' in analysis_results else []
+        if patterns:
+            count = len(patterns)
+            confidence = np.fromiter((p.confidence for p in patterns), dtype=np.float64, count=count)
+            type_ids = np.fromiter((_SMC_TYPE_IDS.get(p.pattern_type, -1) for p in patterns), dtype=np.int8, count=count)
+            bullish = np.fromiter((p.direction == BULLISH for p in patterns), dtype=np.bool_, count=count)
+            zone_low = np.fromiter((p.zone_low for p in patterns), dtype=np.float64, count=count)
+            zone_high = np.fromiter((p.zone_high for p in patterns), dtype=np.float64, count=count)
+            
+            selected = np.flatnonzero(type_ids >= 0)
+            strength = confidence * _SMC_STRENGTH_SCALE[type_ids]
+            # Bullish zones are entered at their low, bearish ones at their high; sweeps trade at market
+            price = np.where(type_ids == _SMC_TYPE_IDS[LIQUIDITY_SWEEP], current_price,
+                             np.where(bullish, zone_low, zone_high))
+            
+            for i, type_id, is_bullish, signal_strength, signal_price in zip(
+                    selected.tolist(), type_ids[selected].tolist(), bullish[selected].tolist(),
+                    strength[selected].tolist(), price[selected].tolist()):
+                signals.append(TradingSignal(
+                    signal_type=BUY if is_bullish else SELL,
+                    source=_SMC_SOURCES[type_id],
+                    strength=signal_strength,
+                    price=signal_price,
+                    reason=_SMC_REASON_PREFIXES[type_id][is_bullish] + patterns[i].description
+                ))
         
-        # Sort signals by strength
-        signals.sort(key=lambda x: x['strength'], reverse=True)
+        # Sort signals by strength; the stable sort keeps detection order among equal strengths
+        if signals:
+            order = np.argsort(-np.array([signal.strength for signal in signals], dtype=np.float64), kind='stable')
+            signals = [signals[i] for i in order.tolist()]
         
         return signals
     
     def _format_analysis_output(self, results: Dict) -> str:
         """Format analysis results for output"""
-        output = []
-        output.append(f"📊 TECHNICAL ANALYSIS - {results['symbol']} ({results['timeframe']})")
-        output.append("=" * 60)
-        output.append(f"Analysis Time: {results['analysis_time']}")
-        output.append(f"Data Points: {results['data_points']}")
-        output.append("")
+        buf = io.StringIO()
+        w = buf.write
+        w(f"📊 TECHNICAL ANALYSIS - {results['symbol']} ({results['timeframe']})\n")
+        w(_RULE_WIDE)
+        w(f"Analysis Time: {datetime.fromtimestamp(results['analysis_time_ns'] / 1e9).isoformat()}\n")
+        w(f"Data Points: {results['data_points']}\n\n")
         
         # Technical Indicators
         if 'indicators' in results:
-            output.append("📈 TECHNICAL INDICATORS")
-            output.append("-" * 30)
+            w("📈 TECHNICAL INDICATORS\n")
+            w(_RULE)
             
             rsi_data = results['indicators']['rsi']
             if rsi_data['value']:
-                output.append(f"RSI (14): {rsi_data['value']:.2f} - {rsi_data['signal']}")
+                w(f"RSI (14): {rsi_data['value']:.2f} - {rsi_data['signal']}\n")
             
             macd_data = results['indicators']['macd']
             if macd_data['macd']:
-                output.append(f"MACD: {macd_data['macd']:.4f}")
-                output.append(f"Signal: {macd_data['signal']:.4f}")
-                output.append(f"Histogram: {macd_data['histogram']:.4f}")
+                w(f"MACD: {macd_data['macd']:.4f}\n"
+                  f"Signal: {macd_data['signal']:.4f}\n"
+                  f"Histogram: {macd_data['histogram']:.4f}\n")
             
             bb_data = results['indicators']['bollinger_bands']
             if bb_data['upper']:
-                output.append(f"Bollinger Bands:")
-                output.append(f"  Upper: {bb_data['upper']:.4f}")
-                output.append(f"  Middle: {bb_data['middle']:.4f}")
-                output.append(f"  Lower: {bb_data['lower']:.4f}")
-                output.append(f"  Position: {bb_data['position']}")
+                w(f"Bollinger Bands:\n"
+                  f"  Upper: {bb_data['upper']:.4f}\n"
+                  f"  Middle: {bb_data['middle']:.4f}\n"
+                  f"  Lower: {bb_data['lower']:.4f}\n"
+                  f"  Position: {bb_data['position']}\n")
             
-            output.append("")
+            w("\n")
         
         # Wyckoff Analysis
         if 'wyckoff' in results:
-            output.append("🏛️ WYCKOFF ANALYSIS")
-            output.append("-" * 30)
-            output.append(f"Patterns Detected: {results['wyckoff']['patterns_detected']}")
+            w("🏛️ WYCKOFF ANALYSIS\n")
+            w(_RULE)
+            w(f"Patterns Detected: {results['wyckoff']['patterns_detected']}\n")
             
             for pattern in results['wyckoff']['patterns']:
-                output.append(f"• {pattern['type']} - {pattern['phase']}")
-                output.append(f"  Confidence: {pattern['confidence']:.1f}%")
-                output.append(f"  Description: {pattern['description']}")
+                w(f"• {pattern.pattern_type} - {pattern.phase}\n"
+                  f"  Confidence: {pattern.confidence:.1f}%\n"
+                  f"  Description: {pattern.description}\n")
                 
-                if 'key_levels' in pattern:
-                    output.append("  Key Levels:")
-                    for level_name, level_value in pattern['key_levels'].items():
-                        if isinstance(level_value, (int, float)):
-                            output.append(f"    {level_name}: {level_value:.4f}")
-                output.append("")
+                w("  Key Levels:\n")
+                for level_name, level_value in pattern.key_levels.items():
+                    if isinstance(level_value, (int, float)):
+                        w(f"    {level_name}: {level_value:.4f}\n")
+                w("\n")
         
         # SMC Analysis
         if 'smc' in results:
-            output.append("💰 SMART MONEY CONCEPTS")
-            output.append("-" * 30)
-            output.append(f"Order Blocks: {results['smc']['order_blocks']}")
-            output.append(f"Fair Value Gaps: {results['smc']['fair_value_gaps']}")
-            output.append(f"Liquidity Sweeps: {results['smc']['liquidity_sweeps']}")
-            output.append("")
+            w("💰 SMART MONEY CONCEPTS\n")
+            w(_RULE)
+            w(f"Order Blocks: {results['smc']['order_blocks']}\n"
+              f"Fair Value Gaps: {results['smc']['fair_value_gaps']}\n"
+              f"Liquidity Sweeps: {results['smc']['liquidity_sweeps']}\n\n")
             
-            # Show top patterns by confidence
-            top_patterns = sorted(results['smc']['patterns'], 
-                                key=lambda x: x['confidence'], reverse=True)[:5]
+            # Show top patterns by confidence; a bounded heap instead of sorting every pattern
+            top_patterns = heapq.nlargest(5, results['smc']['patterns'], key=attrgetter('confidence'))
             
             if top_patterns:
-                output.append("Top SMC Patterns:")
+                w("Top SMC Patterns:\n")
                 for pattern in top_patterns:
-                    output.append(f"• {pattern['type']} ({pattern['direction']})")
-                    output.append(f"  Confidence: {pattern['confidence']:.1f}%")
-                    output.append(f"  Price Level: {pattern['price_level']:.4f}")
-                    output.append(f"  Description: {pattern['description']}")
-                    output.append("")
+                    w(f"• {pattern.pattern_type} ({pattern.direction})\n"
+                      f"  Confidence: {pattern.confidence:.1f}%\n"
+                      f"  Price Level: {pattern.price_level:.4f}\n"
+                      f"  Description: {pattern.description}\n\n")
         
         # Trading Signals
         if 'signals' in results:
-            output.append("🎯 TRADING SIGNALS")
-            output.append("-" * 30)
+            w("🎯 TRADING SIGNALS\n")
+            w(_RULE)
             
             if not results['signals']:
-                output.append("No significant trading signals detected.")
+                w("No significant trading signals detected.\n")
             else:
-                output.append(f"Total Signals: {len(results['signals'])}")
-                output.append("")
-                
-                # Group signals by type
-                buy_signals = [s for s in results['signals'] if s['type'] == 'BUY']
-                sell_signals = [s for s in results['signals'] if s['type'] == 'SELL']
+                w(f"Total Signals: {len(results['signals'])}\n\n")
                 
-                if buy_signals:
-                    output.append("🟢 BUY SIGNALS:")
-                    for signal in buy_signals[:3]:  # Top 3
-                        output.append(f"• {signal['source']} (Strength: {signal['strength']:.1f}%)")
-                        output.append(f"  Price: {signal['price']:.4f}")
-                        output.append(f"  Reason: {signal['reason']}")
-                        output.append("")
-                
-                if sell_signals:
-                    output.append("🔴 SELL SIGNALS:")
-                    for signal in sell_signals[:3]:  # Top 3
-                        output.append(f"• {signal['source']} (Strength: {signal['strength']:.1f}%)")
-                        output.append(f"  Price: {signal['price']:.4f}")
-                        output.append(f"  Reason: {signal['reason']}")
-                        output.append("")
+                # Signals arrive strongest first; list the top 3 of each side
+                for side, heading in ((BUY, "🟢 BUY SIGNALS:\n"), (SELL, "🔴 SELL SIGNALS:\n")):
+                    shown = 0
+                    for signal in results['signals']:
+                        if signal.signal_type != side:
+                            continue
+                        if shown == 0:
+                            w(heading)
+                        w(f"• {signal.source} (Strength: {signal.strength:.1f}%)\n"
+                          f"  Price: {signal.price:.4f}\n"
+                          f"  Reason: {signal.reason}\n\n")
+                        shown += 1
+                        if shown == 3:
+                            break
         
-        return "\n".join(output)
\ No newline at end of file
+        # Every line was written with its newline; the report itself does not end with one
+        return buf.getvalue()[:-1]
+
+
+# Tool instances of a run_batch worker process, one per scan dtype, created on first use and reused for the process lifetime
+_worker_tools: Dict[str, TechnicalAnalysisTool] = {}
+
+
+def _run_symbol(payload: Tuple[List[OHLCData], str, str]) -> str:
+    """Analyse one symbol's candles inside a worker process"""
+    ohlc_data, analysis_type, scan_dtype = payload
+    tool = _worker_tools.get(scan_dtype)
+    if tool is None:
+        tool = _worker_tools[scan_dtype] = TechnicalAnalysisTool(scan_dtype=scan_dtype)
+    return tool._run(ohlc_data, analysis_type)
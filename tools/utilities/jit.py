@@ -0,0 +1,19 @@
+"""
+Optional Numba JIT support.
+
+Numba is not a hard dependency: when it is not installed, ``njit`` returns the
+plain Python function and ``prange`` is ``range``, so kernels still run (slowly).
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit supporting both @njit and @njit(...)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -1,10 +1,9 @@
 
+from concurrent.futures import ThreadPoolExecutor
 from crewai import Agent, Task, Crew, Process
 from crewai.tools import BaseTool
 from typing import Dict, List, Any
-import pandas as pd
 from datetime import datetime, timedelta
-import json
 
 from agents import create_market_structure_agent, create_wyckoff_agent, create_smc_agent, create_entry_precision_agent, create_confluence_scoring_agent, create_risk_management_agent, create_session_filter_agent, create_performance_analytics_agent, create_backtesting_agent
 
@@ -13,7 +12,6 @@ from agents import create_market_structure_agent, create_wyckoff_agent, create_s
 
 class TradingSystemController:
     def __init__(self):
-        crew = Crew()
         self.crew, self.agents = create_trading_crew()
         self.trade_count = 0
         self.performance_data = []
@@ -47,11 +45,13 @@ class TradingSystemController:
         perf_task = create_performance_analysis_task()
         backtest_task = create_backtesting_validation_task()
         
-        # Performance analysis
-        perf_result = perf_task.execute()
-        
-        # Backtesting validation of proposed changes
-        backtest_result = backtest_task.execute()
+        # Performance analysis and backtesting validation are independent until the merge below,
+        # so their LLM round-trips overlap
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            perf_future = executor.submit(perf_task.execute)
+            backtest_future = executor.submit(backtest_task.execute)
+            perf_result = perf_future.result()
+            backtest_result = backtest_future.result()
         
         # Update system parameters if validated
         if backtest_result.get('approved_changes'):
@@ -67,45 +67,47 @@ class TradingSystemController:
             **self.system_parameters
         )
         
-    def create_trading_crew():
-        """Create the complete trading crew with all agents and tasks"""
+
+
+def create_trading_crew():
+    """Create the complete trading crew with all agents and tasks"""
+
+    # Create all agents
+    agents = {
+        'market_structure': create_market_structure_agent(),
+        'wyckoff': create_wyckoff_agent(),
+        'smc': create_smc_agent(),
+        'entry_timing': create_entry_precision_agent(),
+        'confluence': create_confluence_scoring_agent(),
+        'risk_mgmt': create_risk_management_agent(),
+        'session_filter': create_session_filter_agent(),
+        'performance': create_performance_analytics_agent(),
+        'backtesting': create_backtesting_agent(),
+        'data_coord': create_data_orchestrator_agent()
+    }
     
-        # Create all agents
-        agents = {
-            'market_structure': create_market_structure_agent(),
-            'wyckoff': create_wyckoff_agent(),
-            'smc': create_smc_agent(),
-            'entry_timing': create_entry_precision_agent(),
-            'confluence': create_confluence_scoring_agent(),
-            'risk_mgmt': create_risk_management_agent(),
-            'session_filter': create_session_filter_agent(),
-            'performance': create_performance_analytics_agent(),
-            'backtesting': create_backtesting_agent(),
-            'data_coord': create_data_orchestrator_agent()
-        }
-        
-        # Create all tasks
-        tasks = [
-            create_data_coordination_task(),      # Always first
-            create_market_structure_task(),       # HTF analysis
-            create_wyckoff_analysis_task(),       # Wyckoff patterns
-            create_smc_analysis_task(),           # SMC patterns  
-            create_entry_timing_task(),           # Precise entries
-            create_confluence_scoring_task(),     # Score & rank
-            create_risk_assessment_task(),        # Risk management
-            create_session_filtering_task(),      # Final filtering
-            # Performance and backtesting run separately every 5 trades
-        ]
-        
-        # Create the crew
-        trading_crew = Crew(
-            agents=list(agents.values()),
-            tasks=tasks,
-            process=Process.sequential,
-            memory=True,
-            cache=True,
-            max_rpm=100,
-            share_crew=False
-        )
-        
-        return trading_crew, agents
\ No newline at end of file
+    # Create all tasks
+    tasks = [
+        create_data_coordination_task(),      # Always first
+        create_market_structure_task(),       # HTF analysis
+        create_wyckoff_analysis_task(),       # Wyckoff patterns
+        create_smc_analysis_task(),           # SMC patterns  
+        create_entry_timing_task(),           # Precise entries
+        create_confluence_scoring_task(),     # Score & rank
+        create_risk_assessment_task(),        # Risk management
+        create_session_filtering_task(),      # Final filtering
+        # Performance and backtesting run separately every 5 trades
+    ]
+    
+    # Create the crew
+    trading_crew = Crew(
+        agents=list(agents.values()),
+        tasks=tasks,
+        process=Process.sequential,
+        memory=True,
+        cache=True,
+        max_rpm=100,
+        share_crew=False
+    )
+    
+    return trading_crew, agents
\ No newline at end of file
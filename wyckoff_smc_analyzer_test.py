@@ -1,74 +1,124 @@
-from datetime import datetime
-from typing import Dict, List, Optional
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+import hashlib
+import threading
+import time
 #from .data_structures.confluence_signal import ConfluenceSignal
 from data_structures.confluence_signal import ConfluenceSignal
-from tools.analyzers.advanced_smc_analyzer import AdvancedSMCAnalyzer
-from tools.analyzers.advanced_wyckoff_analyzer import AdvancedWyckoffAnalyzer
-from tools.confluence_analyzer import ConfluenceAnalyzer
+from data_structures.ohlc import OHLCData
+from data_structures.ohlc_series import OHLCSeries
+from tools.utilities.jit import njit
 import numpy as np
 
+# Most recent analyses kept per trading system
+_ANALYSIS_CACHE_SIZE = 256
+
+# Confluence scores from each threshold up reach the next tier's confidence and position size (% risk)
+_CONFIDENCE_THRESHOLDS = (70, 80)
+_CONFIDENCE_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+_POSITION_SIZES = (1.0, 1.5, 2.0)
+
+# Shared read-only recommendation for the no-signal case
+_WAIT_RECOMMENDATION = MappingProxyType({
+    'action': 'WAIT',
+    'confidence': 'LOW',
+    'reason': 'Insufficient confluence for trade entry'
+})
+
 class WyckoffSMCTradingSystem:
     """Complete Wyckoff/SMC trading system with confluence analysis"""
     
     def __init__(self):
+        # Imported here so loading this module does not pull in the analyzers until a system is built
+        from tools.analyzers.advanced_smc_analyzer import AdvancedSMCAnalyzer
+        from tools.analyzers.advanced_wyckoff_analyzer import AdvancedWyckoffAnalyzer
+        from tools.confluence_analyzer import ConfluenceAnalyzer
+        
         self.confluence_analyzer = ConfluenceAnalyzer()
         self.wyckoff_analyzer = AdvancedWyckoffAnalyzer()
         self.smc_analyzer = AdvancedSMCAnalyzer()
+        self._analysis_cache = OrderedDict()  # LRU of analyses keyed by _fingerprint, shared by all threads
+        self._cache_lock = threading.Lock()
     
-    def analyze_trading_opportunity(self, ohlc_data: List, technical_indicators: Optional[Dict] = None) -> Dict:
-        """Complete trading opportunity analysis"""
+    def analyze_trading_opportunity(self, ohlc_data: List[OHLCData], technical_indicators: Optional[Dict] = None) -> Mapping:
+        """Complete trading opportunity analysis, as a read-only view (copy it to modify)"""
+        
+        # Repeated calls on an unchanged window reuse the previous analysis; only the timestamp is fresh
+        cache_key = self._fingerprint(ohlc_data, technical_indicators)
+        with self._cache_lock:
+            analysis = self._analysis_cache.get(cache_key)
+            if analysis is not None:
+                self._analysis_cache.move_to_end(cache_key)
+        if analysis is not None:
+            return MappingProxyType({**analysis, 'analysis_timestamp_ns': time.time_ns()})
+        
+        # Extract the price columns once; every analyzer reads them instead of the candle objects
+        series = OHLCSeries.from_candles(ohlc_data)
         
         # Get confluence signal
         confluence_signal = self.confluence_analyzer.analyze_confluence(
-            ohlc_data, technical_indicators if technical_indicators is not None else {}
+            ohlc_data, technical_indicators if technical_indicators is not None else {}, series=series
         )
         
         # Get detailed analysis
-        wyckoff_schematic = self.wyckoff_analyzer.detect_wyckoff_schematic(ohlc_data)
-        composite_operator = self.wyckoff_analyzer.detect_composite_operator_activity(ohlc_data)
-        market_structure = self.smc_analyzer.detect_market_structure_shift(ohlc_data)
-        order_flow = self.smc_analyzer.detect_institutional_order_flow(ohlc_data)
+        wyckoff_schematic = self.wyckoff_analyzer.detect_wyckoff_schematic(ohlc_data, series=series)
+        composite_operator = self.wyckoff_analyzer.detect_composite_operator_activity(ohlc_data, series=series)
+        market_structure = self.smc_analyzer.detect_market_structure_shift(ohlc_data, series=series)
+        order_flow = self.smc_analyzer.detect_institutional_order_flow(ohlc_data, series=series)
         
-        return {
+        # Sections are shared with the cache, so they are handed out read-only
+        analysis = {
             'confluence_signal': confluence_signal,
-            'wyckoff_analysis': {
+            'wyckoff_analysis': MappingProxyType({
                 'schematic': wyckoff_schematic,
                 'composite_operator': composite_operator
-            },
-            'smc_analysis': {
+            }),
+            'smc_analysis': MappingProxyType({
                 'market_structure': market_structure,
                 'order_flow': order_flow
-            },
-            'trading_recommendation': self._generate_trading_recommendation(confluence_signal),
-            'analysis_timestamp': datetime.now().isoformat()
+            }),
+            'trading_recommendation': self._generate_trading_recommendation(confluence_signal)
         }
+        with self._cache_lock:
+            self._analysis_cache[cache_key] = analysis
+            if len(self._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        
+        return MappingProxyType({**analysis, 'analysis_timestamp_ns': time.time_ns()})  # see _iso for the ISO string
     
-    def _generate_trading_recommendation(self, confluence_signal: ConfluenceSignal) -> Dict:
+    @staticmethod
+    def _iso(ns: int) -> str:
+        """ISO-8601 local time of an analysis_timestamp_ns value"""
+        return datetime.fromtimestamp(ns / 1e9).isoformat()
+    
+    @staticmethod
+    def _fingerprint(ohlc_data: List[OHLCData], technical_indicators: Optional[Dict]) -> tuple:
+        """Cache key: window length, a digest of every bar's timestamp and OHLCV values, and the indicator values"""
+        rows = np.array(
+            [(c.timestamp.timestamp(), c.open, c.high, c.low, c.close, c.volume) for c in ohlc_data], dtype=np.float64
+        )
+        return (
+            len(ohlc_data),
+            hashlib.blake2b(rows.tobytes(), digest_size=16).digest(),
+            tuple(sorted((key, repr(value)) for key, value in (technical_indicators or {}).items()))
+        )
+    
+    def _generate_trading_recommendation(self, confluence_signal: ConfluenceSignal) -> Mapping:
         """Generate trading recommendation based on confluence"""
         if not confluence_signal or confluence_signal.signal_type == "NEUTRAL":
-            return {
-                'action': 'WAIT',
-                'confidence': 'LOW',
-                'reason': 'Insufficient confluence for trade entry'
-            }
+            return _WAIT_RECOMMENDATION
         
-        # Determine confidence level
-        if confluence_signal.confluence_score >= 80:
-            confidence = 'HIGH'
-        elif confluence_signal.confluence_score >= 70:
-            confidence = 'MEDIUM'
-        else:
-            confidence = 'LOW'
+        # Determine confidence level and position sizing (as percentage of account) from the tier reached
+        tier = bisect_right(_CONFIDENCE_THRESHOLDS, confluence_signal.confluence_score)
+        confidence = _CONFIDENCE_LEVELS[tier]
+        position_size = _POSITION_SIZES[tier]
         
-        # Generate position sizing recommendation (as percentage of account)
-        if confidence == 'HIGH':
-            position_size = 2.0  # 2% risk
-        elif confidence == 'MEDIUM':
-            position_size = 1.5  # 1.5% risk
-        else:
-            position_size = 1.0  # 1% risk
-        
-        return {
+        # Read-only, as the analysis cache hands the same recommendation to every caller
+        return MappingProxyType({
             'action': confluence_signal.signal_type,
             'confidence': confidence,
             'position_size_percent': position_size,
@@ -78,47 +128,67 @@ class WyckoffSMCTradingSystem:
             'risk_reward_ratio': confluence_signal.risk_reward_ratio,
             'confluence_score': confluence_signal.confluence_score,
             'reasoning': confluence_signal.reasoning
-        }
+        })
 
-# Test function
-def test_wyckoff_smc_analyzer():
-    """Test the Wyckoff/SMC analyzer"""
-    print("🧪 TESTING WYCKOFF/SMC ANALYZER")
-    print("=" * 50)
-    
-    # Create sample data with some patterns
-    sample_data = []
+def _accumulation_bars(n: int, rng: np.random.Generator):
+    """Opens, highs, lows, closes and volumes of an n-bar decline (selling climax), consolidation, then spring and markup"""
+    opens = np.empty(n)
+    highs = np.empty(n)
+    lows = np.empty(n)
+    closes = np.empty(n)
+    volumes = np.empty(n)
+    markdown_end = n // 3
+    markup_start = 2 * n // 3
     base_price = 1.2000
-    
-    # Create accumulation pattern
-    for i in range(150):
-        if i < 50:  # Initial decline (selling climax)
-            price_change = np.random.normal(-0.001, 0.0005)
-            volume_multiplier = 2.0 if i > 40 else 1.0
-        elif i < 100:  # Consolidation phase
-            price_change = np.random.normal(0, 0.0002)
+    for i in range(n):
+        if i < markdown_end:  # Initial decline, doubled volume over its last 9 bars
+            price_change = rng.normal(-0.001, 0.0005)
+            volume_multiplier = 2.0 if i > markdown_end - 10 else 1.0
+        elif i < markup_start:  # Consolidation phase
+            price_change = rng.normal(0, 0.0002)
             volume_multiplier = 0.5
         else:  # Spring and markup
-            price_change = np.random.normal(0.0005, 0.0003)
+            price_change = rng.normal(0.0005, 0.0003)
             volume_multiplier = 1.5
         
         new_price = base_price * (1 + price_change)
-        high = new_price * (1 + abs(np.random.normal(0, 0.0002)))
-        low = new_price * (1 - abs(np.random.normal(0, 0.0002)))
-        volume = abs(np.random.normal(1000, 200)) * volume_multiplier
-        
-        sample_data.append(type('OHLCData', (), {
-            'symbol': "EURUSD",
-            'timeframe': "1H", 
-            'timestamp': datetime.now(),
-            'open': base_price,
-            'high': high,
-            'low': low,
-            'close': new_price,
-            'volume': volume
-        })())
-        
+        opens[i] = base_price
+        # Half-normal wicks: |N(0, 1)| scaled, rather than a zero-mean normal() call per wick
+        highs[i] = new_price * (1 + abs(rng.standard_normal()) * 0.0002)
+        lows[i] = new_price * (1 - abs(rng.standard_normal()) * 0.0002)
+        closes[i] = new_price
+        volumes[i] = abs(rng.normal(1000, 200)) * volume_multiplier
         base_price = new_price
+    return opens, highs, lows, closes, volumes
+
+# Compiled on first use (cached on disk), so larger fuzzing runs stay cheap; plain Python without Numba
+_synthesize_ohlc = njit(cache=True, fastmath=True)(_accumulation_bars)
+
+@lru_cache(maxsize=1)
+def get_default_system() -> WyckoffSMCTradingSystem:
+    """Trading system shared by every caller in the process, so backtest workers reuse one set of analyzers.
+    
+    Safe to call from several threads; callers must not modify its analyzers or attributes.
+    """
+    return WyckoffSMCTradingSystem()
+
+# Test function
+def test_wyckoff_smc_analyzer():
+    """Test the Wyckoff/SMC analyzer"""
+    print("🧪 TESTING WYCKOFF/SMC ANALYZER")
+    print("=" * 50)
+    
+    # Create sample data with an accumulation pattern; seeded and stamped hourly from a fixed start,
+    # so repeated runs analyze identical bars
+    rng = np.random.default_rng(12345)
+    opens, highs, lows, closes, volumes = _synthesize_ohlc(150, rng)
+    start = datetime(2024, 1, 1)
+    sample_data = [
+        OHLCData(symbol="EURUSD", timeframe="1H", timestamp=start + timedelta(hours=i),
+                 open=open_, high=high, low=low, close=close, volume=volume)
+        for i, (open_, high, low, close, volume) in enumerate(zip(opens.tolist(), highs.tolist(), lows.tolist(),
+                                                                  closes.tolist(), volumes.tolist()))
+    ]
     
     # Test the complete system
     try:
@@ -141,13 +211,13 @@ def test_wyckoff_smc_analyzer():
         
         # Test confluence summary
         if analysis['confluence_signal']:
-            confluence_analyzer = ConfluenceAnalyzer()
-            summary = confluence_analyzer.get_confluence_summary(analysis['confluence_signal'])
+            confluence_analyzer = trading_system.confluence_analyzer
+            summary = confluence_analyzer.get_confluence_summary(analysis['confluence_signal'], max_len=500)
             print("\n" + "="*50)
             print("CONFLUENCE SUMMARY:")
             print("="*50)
-            print(summary[:500] + "..." if len(summary) > 500 else summary)
-        
+            print(summary)
+    
     except Exception as e:
         print(f"❌ Test failed: {e}")
         import traceback